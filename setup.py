@@ -50,12 +50,8 @@ setup(
         "numpy",
         "click",
         "tqdm",
-        "pybraries",
         "requirements-parser",
-        "pypistats",
-        "requests",
         "addict",
-        "beautifulsoup4",
         "PyYAML",
         "python-dateutil",
         "httpx",
@@ -63,6 +59,8 @@ setup(
     # deprecated: dependency_links=dependency_links,
     extras_require={
         # extras can be installed via: pip install package[dev]
+        # Use HTTP/2 for all requests that support it
+        "http2": ["httpx[http2]"],
         "dev": [
             "setuptools",
             "wheel",
@@ -76,7 +74,6 @@ setup(
             "pydocstyle",
             "isort",
             "lazydocs",
-            "types-requests",
         ],
     },
     include_package_data=True,
@@ -2,6 +2,7 @@
 
 import logging
 import sys
+from typing import Optional, Tuple
 
 import click
 
@@ -32,17 +33,77 @@ def cli() -> None:
     "-g",
     required=False,
     type=click.STRING,
-    help="Github API Token (from: https://github.com/settings/tokens)",
+    multiple=True,
+    help="Github API Token (from: https://github.com/settings/tokens). Can be provided multiple times to distribute requests across tokens.",
+)
+@click.option(
+    "--record",
+    required=False,
+    type=click.Path(file_okay=False),
+    help="Record all requests and responses of the integrations to this folder.",
+)
+@click.option(
+    "--replay",
+    required=False,
+    type=click.Path(exists=True, file_okay=False),
+    help="Replay the responses recorded in this folder instead of requesting the real services.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    default=False,
+    help="Continue an interrupted run and reuse the projects that are already collected.",
+)
+@click.option(
+    "--time-budget",
+    required=False,
+    type=click.IntRange(min=1),
+    help="Maximum time (in seconds) for collecting the projects. Remaining projects are carried over from the latest history file.",
 )
 @click.argument("path", type=click.Path(exists=True))
-def generate(path: str, libraries_key: str, github_key: str) -> None:
+def generate(
+    path: str,
+    libraries_key: str,
+    github_key: Tuple[str, ...],
+    record: Optional[str],
+    replay: Optional[str],
+    resume: bool,
+    time_budget: Optional[int],
+) -> None:
     """Generates a best-of markdown page from a yaml file."""
     from best_of import generator
 
-    generator.generate_markdown(path, libraries_key, github_key)
+    if record and replay:
+        raise click.UsageError("--record and --replay cannot be used together.")
+
+    generator.generate_markdown(
+        path,
+        libraries_key,
+        list(github_key),
+        record_folder=record,
+        replay_folder=replay,
+        resume=resume,
+        time_budget=time_budget,
+    )
+
+
+@click.command("render")
+@click.option(
+    "--history-file",
+    required=False,
+    type=click.Path(exists=True, dir_okay=False),
+    help="History file with the collected projects. Defaults to the latest file in the projects history folder.",
+)
+@click.argument("path", type=click.Path(exists=True))
+def render(path: str, history_file: Optional[str]) -> None:
+    """Renders a best-of markdown page from the collected history without requests."""
+    from best_of import generator
+
+    generator.render_markdown(path, history_file)
 
 
 cli.add_command(generate)
+cli.add_command(render)
 
 
 if __name__ == "__main__":
@@ -1,13 +1,18 @@
+import logging
 from collections import OrderedDict
 
 from addict import Dict
 
+log = logging.getLogger(__name__)
+
 DEFAULT_OTHERS_CATEGORY_ID = "others"
 MIN_PROJECT_DESC_LENGTH = 10
 RECENT_ACTIVITY_DAYS = 90
 UP_ARROW_IMAGE = "https://git.io/JtehR"
 LATEST_CHANGES_FILE = "latest-changes.md"
 ENV_LIBRARIES_API_KEY = "LIBRARIES_API_KEY"
+# Metrics that can be reused in the incremental collection (metrics_refresh_days)
+REFRESHABLE_METRICS = ["github_dependent_project_count", "contributor_count"]
 
 
 def prepare_configuration(cfg: dict) -> Dict:
@@ -85,6 +90,84 @@ def prepare_configuration(cfg: dict) -> Dict:
     if "output_generator" not in config:
         config.output_generator = "markdown-list"
 
+    if "run_report" not in config:
+        config.run_report = True
+
+    if "max_workers" not in config:
+        config.max_workers = 1
+
+    if "max_integration_workers" not in config:
+        config.max_integration_workers = 4
+
+    if "max_connections_per_host" not in config:
+        config.max_connections_per_host = 4
+
+    if "incremental_collection" not in config:
+        config.incremental_collection = False
+
+    if "metrics_refresh_days" not in config:
+        config.metrics_refresh_days = {
+            "github_dependent_project_count": 7,
+            "contributor_count": 7,
+        }
+
+    unsupported_metrics = [
+        metric
+        for metric in config.metrics_refresh_days or {}
+        if metric not in REFRESHABLE_METRICS
+    ]
+    if unsupported_metrics:
+        log.warning(
+            "Unsupported metrics in metrics_refresh_days are ignored: "
+            + ", ".join(unsupported_metrics)
+            + ". Supported metrics: "
+            + ", ".join(REFRESHABLE_METRICS)
+        )
+        for metric in unsupported_metrics:
+            del config.metrics_refresh_days[metric]
+
+    if "http_timeout" not in config:
+        config.http_timeout = 30
+
+    if "http_connect_timeout" not in config:
+        config.http_connect_timeout = 10
+
+    if "circuit_breaker_threshold" not in config:
+        config.circuit_breaker_threshold = 5
+
+    if "circuit_breaker_cooldown" not in config:
+        config.circuit_breaker_cooldown = 60
+
+    if "http_max_retries" not in config:
+        config.http_max_retries = 3
+
+    if "http_cache_folder" not in config:
+        config.http_cache_folder = None
+
+    if "http_cache_max_size" not in config:
+        config.http_cache_max_size = 500
+
+    if "conda_channel_index" not in config:
+        config.conda_channel_index = []
+
+    if "http_record_folder" not in config:
+        config.http_record_folder = None
+
+    if "http_replay_folder" not in config:
+        config.http_replay_folder = None
+
+    if "http_replay_latency" not in config:
+        config.http_replay_latency = 0
+
+    if "http_replay_error_rate" not in config:
+        config.http_replay_error_rate = 0
+
+    if "checkpoint_file" not in config:
+        config.checkpoint_file = None
+
+    if "time_budget" not in config:
+        config.time_budget = None
+
     if "allowed_licenses" not in config:
         config.allowed_licenses = []
         from best_of.license import LICENSES
@@ -1,9 +1,8 @@
-import glob
 import logging
 import os
 from collections import OrderedDict
 from datetime import datetime
-from typing import Tuple
+from typing import List, Optional, Tuple, Union
 
 import pandas as pd
 import yaml
@@ -13,6 +12,9 @@ from best_of import default_config, utils
 
 log = logging.getLogger(__name__)
 
+# Journal of the collected projects, used to resume interrupted runs
+CHECKPOINT_FILE_NAME = ".best-of-checkpoint.jsonl"
+
 
 def parse_projects_yaml(
     projects_yaml_path: str,
@@ -76,8 +78,63 @@ def load_extension_script(extension_script_path: str) -> None:
         )
 
 
+def prepare_projects(
+    projects: list,
+    categories: OrderedDict,
+    config: Dict,
+    history_file: Optional[str] = None,
+) -> list:
+    """Adds the trending information and groups and categorizes the projects.
+
+    Args:
+        projects (list): Collected projects.
+        categories (OrderedDict): Configured categories.
+        config (Dict): Best-of configuration.
+        history_file (str, optional): History file used to calculate the trends.
+
+    Returns:
+        list: The grouped projects.
+    """
+    from best_of import projects_collection
+
+    if history_file:
+        (
+            added_projects,
+            trending_projects,
+        ) = projects_collection.get_projects_changes(projects, history_file)
+
+        projects_collection.apply_projects_changes(
+            projects, added_projects, trending_projects, configuration=config
+        )
+
+    projects = projects_collection.group_projects(projects)
+    projects_collection.categorize_projects(projects, categories)
+    return projects
+
+
+def write_output(
+    categories: OrderedDict, projects: list, config: Dict, labels: list
+) -> bool:
+    """Writes the output via the configured generator, returns `False` if it fails."""
+    from best_of.generators import get_generator
+
+    output_generator = get_generator(config.output_generator)
+    if not output_generator:
+        log.error("No output generator registered for " + config.output_generator)
+        return False
+
+    output_generator.write_output(categories, projects, config, labels)
+    return True
+
+
 def generate_markdown(
-    projects_yaml_path: str, libraries_api_key: str = None, github_api_key: str = None
+    projects_yaml_path: str,
+    libraries_api_key: str = None,
+    github_api_key: Union[str, List[str]] = None,
+    record_folder: str = None,
+    replay_folder: str = None,
+    resume: bool = False,
+    time_budget: Optional[int] = None,
 ) -> None:
     try:
         # Set libraries api key
@@ -90,6 +147,9 @@ def generate_markdown(
             )
 
         if github_api_key:
+            if not isinstance(github_api_key, str):
+                # Requests are distributed across multiple tokens
+                github_api_key = ",".join(github_api_key)
             os.environ["GITHUB_API_KEY"] = github_api_key
         else:
             log.warning(
@@ -98,6 +158,20 @@ def generate_markdown(
 
         config, projects, categories, labels = parse_projects_yaml(projects_yaml_path)
 
+        if record_folder:
+            config.http_record_folder = record_folder
+        if replay_folder:
+            config.http_replay_folder = replay_folder
+
+        if time_budget:
+            config.time_budget = time_budget
+
+        if not config.checkpoint_file:
+            config.checkpoint_file = os.path.join(
+                os.path.dirname(os.path.abspath(projects_yaml_path)),
+                CHECKPOINT_FILE_NAME,
+            )
+
         if config.extension_script:
             load_extension_script(config.extension_script)
 
@@ -105,30 +179,17 @@ def generate_markdown(
         from best_of import projects_collection
 
         projects = projects_collection.collect_projects_info(
-            projects, categories, config
+            projects, categories, config, resume=resume
         )
 
+        history_file = None
         if config.projects_history_folder:
             # generate trending information from most recent
-
-            history_files = glob.glob(
-                os.path.join(config.projects_history_folder, "*_projects.csv")
+            history_file = projects_collection.get_latest_history_file(
+                config.projects_history_folder
             )
 
-            if history_files:
-                (
-                    added_projects,
-                    trending_projects,
-                ) = projects_collection.get_projects_changes(
-                    projects, sorted(history_files, reverse=True)[0]
-                )
-
-                projects_collection.apply_projects_changes(
-                    projects, added_projects, trending_projects, configuration=config
-                )
-
-        projects = projects_collection.group_projects(projects)
-        projects_collection.categorize_projects(projects, categories)
+        projects = prepare_projects(projects, categories, config, history_file)
 
         if config.projects_history_folder:
             # Save projects collection to history folder
@@ -147,15 +208,75 @@ def generate_markdown(
                 prepared_projects.append(cloned_project.to_dict())
             pd.DataFrame(prepared_projects).to_csv(projects_history_file, sep=",")
 
-        from best_of.generators import get_generator
+            if config.run_report:
+                # Timing and request metrics of the collection
+                from best_of import instrumentation
+
+                instrumentation.write_report(
+                    config.projects_history_folder,
+                    datetime.today().strftime("%Y-%m-%d"),
+                )
 
-        output_generator = get_generator(config.output_generator)
-        if not output_generator:
-            log.error("No output generator registered for " + config.output_generator)
+        if not write_output(categories, projects, config, labels):
             utils.exit_process(1)
             return
 
-        output_generator.write_output(categories, projects, config, labels)
+        if os.path.isfile(config.checkpoint_file):
+            # The journal is only needed to resume an interrupted run
+            os.remove(config.checkpoint_file)
     except Exception as ex:
         log.error("Failed to generate markdown.", exc_info=ex)
+        log.info("Projects that are already collected can be reused via --resume.")
+        utils.exit_process(1)
+
+
+def render_markdown(projects_yaml_path: str, history_file: str = None) -> None:
+    """Renders the output from a history file instead of collecting the projects.
+
+    Args:
+        projects_yaml_path (str): Path to the projects yaml.
+        history_file (str, optional): History file with the collected projects.
+            Defaults to the latest history file in `projects_history_folder`.
+    """
+    try:
+        config, projects, categories, labels = parse_projects_yaml(projects_yaml_path)
+
+        if config.extension_script:
+            load_extension_script(config.extension_script)
+
+        from best_of import projects_collection
+
+        if not history_file and config.projects_history_folder:
+            history_file = projects_collection.get_latest_history_file(
+                config.projects_history_folder
+            )
+
+        if not history_file:
+            log.error(
+                "No history file found. Please run the generate command first "
+                "or configure the projects_history_folder."
+            )
+            utils.exit_process(1)
+            return
+
+        log.info("Rendering projects from history file: " + history_file)
+        # Date-based filters are applied as of the collection of the history file
+        config.reference_date = projects_collection.get_history_file_date(history_file)
+        projects = projects_collection.restore_projects_info(
+            projects, categories, config, history_file
+        )
+
+        previous_history_file = None
+        if config.projects_history_folder:
+            # Trends are calculated like in the run that created the history file
+            previous_history_file = projects_collection.get_latest_history_file(
+                config.projects_history_folder, before=history_file
+            )
+
+        projects = prepare_projects(projects, categories, config, previous_history_file)
+
+        if not write_output(categories, projects, config, labels):
+            utils.exit_process(1)
+    except Exception as ex:
+        log.error("Failed to render markdown.", exc_info=ex)
         utils.exit_process(1)
@@ -38,15 +38,19 @@ def generate_metrics_info(project: Dict, configuration: Dict) -> str:
     status_md = ""
     project_total_month = None
     if project.created_at:
-        project_total_month = utils.diff_month(datetime.now(), project.created_at)
+        project_total_month = utils.diff_month(
+            utils.get_reference_date(configuration), project.created_at
+        )
 
     project_inactive_month = None
     if project.last_commit_pushed_at:
         project_inactive_month = utils.diff_month(
-            datetime.now(), project.last_commit_pushed_at
+            utils.get_reference_date(configuration), project.last_commit_pushed_at
         )
     elif project.updated_at:
-        project_inactive_month = utils.diff_month(datetime.now(), project.updated_at)
+        project_inactive_month = utils.diff_month(
+            utils.get_reference_date(configuration), project.updated_at
+        )
 
     if (
         project_inactive_month
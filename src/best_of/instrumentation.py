@@ -0,0 +1,190 @@
+import csv
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+METRICS = ["wall_time", "requests", "bytes", "retries", "sleep_time", "cache_hits"]
+
+# Integration that is used for requests outside of a measured scope
+UNMEASURED_INTEGRATION = "other"
+
+# Help texts of the exported Prometheus metrics
+PROMETHEUS_METRICS = {
+    "wall_time": ("seconds", "Wall time spent in the integration."),
+    "requests": ("total", "Number of HTTP requests sent by the integration."),
+    "bytes": ("bytes", "Number of bytes downloaded by the integration."),
+    "retries": ("total", "Number of retried HTTP requests."),
+    "sleep_time": ("seconds", "Time spent waiting for rate limits and retries."),
+    "cache_hits": ("total", "Number of requests answered from the HTTP cache."),
+}
+
+# (project, integration) of the currently measured scope of every thread
+_local = threading.local()
+_metrics: dict = {}
+_metrics_lock = threading.Lock()
+
+
+def reset() -> None:
+    """Removes all recorded metrics, e.g. before a new run."""
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def _add(scope: Tuple[str, str], **values: Any) -> None:
+    with _metrics_lock:
+        metrics = _metrics.setdefault(scope, {metric: 0 for metric in METRICS})
+        for metric, value in values.items():
+            metrics[metric] += value
+
+
+def _get_scope() -> Optional[Tuple[str, str]]:
+    return getattr(_local, "scope", None)
+
+
+def record(**values: Any) -> None:
+    """Adds values (e.g. `requests=1`) to the metrics of the current scope.
+
+    Args:
+        **values: Values by metric name, see `METRICS`.
+    """
+    _add(_get_scope() or ("", UNMEASURED_INTEGRATION), **values)
+
+
+@contextmanager
+def measure(integration: str, project: Optional[str] = None) -> Iterator[None]:
+    """Measures the wall time and all requests of an integration.
+
+    Scopes can be nested, requests are recorded for the innermost scope. The wall
+    time of a scope includes the time of all nested scopes.
+
+    Args:
+        integration (str): Name of the integration (e.g. `pypi`).
+        project (str, optional): Name of the project. Defaults to the project of the
+            enclosing scope, or the whole run if there is none.
+    """
+    parent_scope = _get_scope()
+    if project is None:
+        project = parent_scope[0] if parent_scope else ""
+
+    scope = (project, integration)
+    if scope == parent_scope:
+        # Already measured by the enclosing scope
+        yield
+        return
+
+    _local.scope = scope
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        _local.scope = parent_scope
+        _add(scope, wall_time=time.perf_counter() - start_time)
+
+
+def measured(integration: str) -> Callable:
+    """Decorator that measures every call of a function, see `measure`.
+
+    Args:
+        integration (str): Name of the integration (e.g. `github-graphql`).
+    """
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def measured_function(*args: Any, **kwargs: Any) -> Any:
+            with measure(integration):
+                return function(*args, **kwargs)
+
+        return measured_function
+
+    return decorator
+
+
+def bind_scope(function: Callable) -> Callable:
+    """Binds a function to the current scope, e.g. before it is run in a worker thread.
+
+    Scopes are kept per thread, so requests of worker threads (e.g. of a
+    `ThreadPoolExecutor`) would not be recorded for the scope that started them.
+
+    Args:
+        function (Callable): Function that is called in the current scope.
+    """
+    scope = _get_scope()
+
+    @functools.wraps(function)
+    def scoped_function(*args: Any, **kwargs: Any) -> Any:
+        previous_scope = _get_scope()
+        _local.scope = scope
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _local.scope = previous_scope
+
+    return scoped_function
+
+
+def get_report() -> List[dict]:
+    """Returns the recorded metrics, one entry per project and integration."""
+    with _metrics_lock:
+        return [
+            {"project": project, "integration": integration, **metrics}
+            for (project, integration), metrics in sorted(_metrics.items())
+        ]
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(report: List[dict]) -> str:
+    """Converts a report to the Prometheus text format (aggregated per integration)."""
+    totals: dict = {}
+    for entry in report:
+        integration_totals = totals.setdefault(
+            entry["integration"], {metric: 0 for metric in METRICS}
+        )
+        for metric in METRICS:
+            integration_totals[metric] += entry[metric]
+
+    lines = []
+    for metric, (unit, help_text) in PROMETHEUS_METRICS.items():
+        name = f"best_of_integration_{metric}_{unit}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for integration, integration_totals in sorted(totals.items()):
+            lines.append(
+                f'{name}{{integration="{_escape_label(integration)}"}} '
+                + str(round(integration_totals[metric], 3))
+            )
+    return "\n".join(lines) + "\n"
+
+
+def write_report(report_folder: str, file_prefix: str) -> None:
+    """Writes the recorded metrics as JSON, CSV and Prometheus text file.
+
+    Args:
+        report_folder (str): Folder of the report files (e.g. the history folder).
+        file_prefix (str): Prefix of the file names (e.g. the current date).
+    """
+    report = get_report()
+    report_path = os.path.join(report_folder, file_prefix + "_run-report")
+    try:
+        os.makedirs(report_folder, exist_ok=True)
+        with open(report_path + ".json", "w") as f:
+            json.dump(report, f, indent=2)
+
+        with open(report_path + ".csv", "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["project", "integration"] + METRICS)
+            writer.writeheader()
+            writer.writerows(report)
+
+        with open(report_path + ".prom", "w") as f:
+            f.write(to_prometheus(report))
+    except Exception as ex:
+        log.warning("Failed to write run report: " + report_path, exc_info=ex)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Any, List
 
 from addict import Dict
 
@@ -19,6 +20,42 @@ class BaseIntegration(ABC):
         """
         pass
 
+    def fetch_project_info(self, project_info: Dict) -> Any:
+        """Fetches the information that is required to update the project metadata.
+
+        The information of all integrations is fetched concurrently and applied via
+        `apply_project_info` in the order of the integrations. Therefore, this method
+        must not modify the project metadata. By default, nothing is fetched in
+        advance and all requests are sent by `update_project_info`.
+
+        Args:
+            project_info (Dict): Collected project metadata.
+
+        Returns:
+            Any: The fetched information.
+        """
+        return None
+
+    def apply_project_info(self, project_info: Dict, fetched_info: Any) -> None:
+        """Updates the project metadata with the information from `fetch_project_info`.
+
+        Args:
+            project_info (Dict): Collected project metadata.
+            fetched_info (Any): The information returned by `fetch_project_info`.
+        """
+        self.update_project_info(project_info)
+
+    def prefetch_projects_info(self, projects: List[Dict], configuration: Dict) -> None:
+        """Fetches information for multiple projects in advance (e.g. in bulk).
+
+        Called once before `update_project_info` is called for every project.
+
+        Args:
+            projects (List[Dict]): Metadata of all projects.
+            configuration (Dict): Best-of configuration.
+        """
+        pass
+
     @abstractmethod
     def generate_md_details(self, project: Dict, configuration: Dict) -> str:
         """Generates markdown details for the given project.
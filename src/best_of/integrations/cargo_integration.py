@@ -1,12 +1,12 @@
 import logging
+from typing import Optional
 from urllib.parse import quote
 
-import requests
 from addict import Dict
 
 from best_of import utils
 from best_of.default_config import MIN_PROJECT_DESC_LENGTH
-from best_of.integrations import libio_integration
+from best_of.integrations import http_client, libio_integration
 from best_of.integrations.base_integration import BaseIntegration
 
 log = logging.getLogger(__name__)
@@ -18,18 +18,21 @@ class CargoIntegration(BaseIntegration):
         return "cargo"
 
     def update_project_info(self, project_info: Dict) -> None:
-        if not project_info.cargo_id:
-            return
+        self.apply_project_info(project_info, self.fetch_project_info(project_info))
 
-        if not project_info.cargo_url:
-            project_info.cargo_url = "https://crates.io/crates/" + project_info.cargo_id
+    def fetch_project_info(self, project_info: Dict) -> Optional[Dict]:
+        if not project_info.cargo_id:
+            return None
 
+        fetched_info = Dict()
         if libio_integration.is_activated():
-            libio_integration.update_package_via_libio("cargo", project_info)
+            fetched_info.package_info = libio_integration.request_package_via_libio(
+                "cargo", project_info.cargo_id
+            )
 
         # Get monthly downloads
         try:
-            request = requests.get(
+            request = http_client.get(
                 "https://crates.io/api/v1/crates/"
                 + quote(project_info.cargo_id, safe="")
             )
@@ -42,14 +45,43 @@ class CargoIntegration(BaseIntegration):
                     + str(request.status_code)
                     + ")"
                 )
-                return
-            cargo_packaged_details = Dict(request.json())
-            if not cargo_packaged_details or not cargo_packaged_details.crate:
-                log.info(
-                    "Unable to get package info via cargo api: " + project_info.cargo_id
-                )
-                return
+                return fetched_info
+            fetched_info.cargo_packaged_details = Dict(request.json())
+        except Exception as ex:
+            log.info(
+                "Failed to request package via cargo api: " + project_info.cargo_id,
+                exc_info=ex,
+            )
+        return fetched_info
+
+    def apply_project_info(
+        self, project_info: Dict, fetched_info: Optional[Dict]
+    ) -> None:
+        if not project_info.cargo_id:
+            return
 
+        if not project_info.cargo_url:
+            project_info.cargo_url = "https://crates.io/crates/" + project_info.cargo_id
+
+        if not fetched_info:
+            return
+
+        if fetched_info.package_info:
+            libio_integration.update_package_via_libio(
+                "cargo", project_info, fetched_info.package_info
+            )
+
+        if "cargo_packaged_details" not in fetched_info:
+            return
+
+        cargo_packaged_details = fetched_info.cargo_packaged_details
+        if not cargo_packaged_details or not cargo_packaged_details.crate:
+            log.info(
+                "Unable to get package info via cargo api: " + project_info.cargo_id
+            )
+            return
+
+        try:
             if cargo_packaged_details.crate.recent_downloads:
                 # recent downloads == downloads of last 90 days
                 project_info.cargo_monthly_downloads = (
@@ -76,7 +108,7 @@ class CargoIntegration(BaseIntegration):
 
         except Exception as ex:
             log.info(
-                "Failed to request package via cargo api: " + project_info.cargo_id,
+                "Failed to process package via cargo api: " + project_info.cargo_id,
                 exc_info=ex,
             )
             return
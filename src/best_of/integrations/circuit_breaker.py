@@ -0,0 +1,83 @@
+import logging
+import threading
+import time
+
+import httpx
+
+log = logging.getLogger(__name__)
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN = 60
+
+_failure_threshold = DEFAULT_FAILURE_THRESHOLD
+_cooldown: float = DEFAULT_COOLDOWN
+_circuits: dict = {}
+_circuits_lock = threading.Lock()
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised for requests to a host whose circuit breaker is open."""
+
+
+class Circuit:
+    """Failure state of a single host.
+
+    Attributes:
+        failures (int): Number of consecutive failed requests.
+        open_until (float): Monotonic time until which requests are short-circuited.
+    """
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.open_until = 0.0
+
+
+def configure(failure_threshold: int, cooldown: float) -> None:
+    """Configures the circuit breakers of all hosts.
+
+    Args:
+        failure_threshold (int): Number of consecutive failures after which the
+            requests to a host are short-circuited. If `0`, the breakers are disabled.
+        cooldown (float): Time (in seconds) requests are short-circuited before the
+            host is tried again.
+    """
+    global _failure_threshold, _cooldown
+
+    with _circuits_lock:
+        _failure_threshold = max(0, int(failure_threshold))
+        _cooldown = float(cooldown)
+        _circuits.clear()
+
+
+def is_open(host: str) -> bool:
+    """Returns `True` if requests to the host should not be sent right now."""
+    with _circuits_lock:
+        circuit = _circuits.get(host)
+        return bool(circuit and circuit.open_until > time.monotonic())
+
+
+def record_success(host: str) -> None:
+    with _circuits_lock:
+        _circuits.pop(host, None)
+
+
+def record_failure(host: str) -> None:
+    """Records a failed request (network error or server error) to the host.
+
+    After the cooldown, requests are sent again. Since the failures are only reset
+    by a successful request, the next failure opens the circuit for another
+    cooldown period.
+    """
+    if not _failure_threshold:
+        return
+
+    with _circuits_lock:
+        circuit = _circuits.setdefault(host, Circuit())
+        circuit.failures += 1
+        if circuit.failures >= _failure_threshold:
+            if circuit.open_until <= time.monotonic():
+                log.warning(
+                    f"{host} failed {circuit.failures} times in a row. "
+                    f"Requests are skipped for {_cooldown:.0f} seconds."
+                )
+            circuit.open_until = time.monotonic() + _cooldown
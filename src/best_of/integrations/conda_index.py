@@ -0,0 +1,145 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import List, Optional
+
+from addict import Dict
+
+from best_of import instrumentation
+from best_of.integrations import http_client
+from best_of.integrations.http_cache import DAY
+
+log = logging.getLogger(__name__)
+
+# Indexed channels are downloaded again if the local index is older than a day
+CHANNEL_INDEX_MAX_AGE = DAY
+# Package metadata that is kept in the local index
+INDEXED_FIELDS = ["summary", "home", "license", "version", "timestamp"]
+
+_indexed_channels: List[str] = []
+_index_folder: Optional[str] = None
+_channel_indices: dict = {}
+_channel_indices_lock = threading.Lock()
+
+
+def configure(channels: Optional[List[str]], index_folder: Optional[str]) -> None:
+    """Configures the conda channels that are indexed locally.
+
+    Args:
+        channels (List[str], optional): Names of the indexed channels (e.g. `conda-forge`).
+        index_folder (str, optional): Folder used to store the channel indices. If `None`,
+            the indices are only kept in memory.
+    """
+    global _indexed_channels, _index_folder
+
+    with _channel_indices_lock:
+        _indexed_channels = [channel.lower() for channel in channels or []]
+        _index_folder = index_folder
+        _channel_indices.clear()
+
+
+def _get_index_path(channel: str) -> Optional[str]:
+    if not _index_folder:
+        return None
+    return os.path.join(_index_folder, channel + "-index.json")
+
+
+def _download_channel_index(channel: str) -> dict:
+    # The channel data contains the latest metadata of all packages in the channel
+    with http_client.stream(
+        "GET", f"https://conda.anaconda.org/{channel}/channeldata.json"
+    ) as response:
+        response.raise_for_status()
+        channel_data = json.loads(response.read())
+
+    return {
+        package_name.lower(): {
+            field: package_data.get(field)
+            for field in INDEXED_FIELDS
+            if package_data.get(field) is not None
+        }
+        for package_name, package_data in channel_data.get("packages", {}).items()
+    }
+
+
+@instrumentation.measured("conda")
+def _load_channel_index(channel: str) -> Optional[dict]:
+    index_path = _get_index_path(channel)
+    if (
+        index_path
+        and os.path.isfile(index_path)
+        and time.time() - os.path.getmtime(index_path) < CHANNEL_INDEX_MAX_AGE
+    ):
+        try:
+            with open(index_path, "r") as f:
+                return json.load(f)
+        except Exception as ex:
+            log.info("Failed to load conda channel index: " + index_path, exc_info=ex)
+
+    log.info(f"Downloading index of the conda channel {channel}.")
+    try:
+        channel_index = _download_channel_index(channel)
+    except Exception as ex:
+        log.info(
+            f"Failed to download the index of conda channel {channel}", exc_info=ex
+        )
+        return None
+
+    if index_path:
+        try:
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            temp_path = index_path + "." + str(threading.get_ident()) + ".tmp"
+            with open(temp_path, "w") as f:
+                json.dump(channel_index, f)
+            os.replace(temp_path, index_path)
+        except Exception as ex:
+            log.info("Failed to store conda channel index: " + index_path, exc_info=ex)
+    return channel_index
+
+
+def get_channel_index(channel: str) -> Optional[dict]:
+    """Returns the local index of a channel, or `None` if the channel is not indexed."""
+    channel = channel.lower()
+    if channel not in _indexed_channels:
+        return None
+
+    # The lock is held during the download, so that every channel is only loaded once
+    with _channel_indices_lock:
+        if channel not in _channel_indices:
+            _channel_indices[channel] = _load_channel_index(channel)
+        return _channel_indices[channel]
+
+
+def split_conda_id(conda_id: str) -> tuple:
+    """Splits a conda id into channel and package name (default channel: anaconda)."""
+    if "/" in conda_id:
+        channel, package_name = conda_id.split("/", 1)
+        return channel, package_name
+    return "anaconda", conda_id
+
+
+def package_exists(conda_id: str) -> Optional[bool]:
+    """Checks via the local channel index if a conda package exists.
+
+    Args:
+        conda_id (str): Conda id of the package (`<channel>/<package>` or `<package>`).
+
+    Returns:
+        Optional[bool]: If the package exists, or `None` if the channel is not indexed.
+    """
+    channel, package_name = split_conda_id(conda_id)
+    channel_index = get_channel_index(channel)
+    if channel_index is None:
+        return None
+    return package_name.lower() in channel_index
+
+
+def get_package_metadata(conda_id: str) -> Optional[Dict]:
+    """Returns the basic metadata of a conda package from the local channel index."""
+    channel, package_name = split_conda_id(conda_id)
+    channel_index = get_channel_index(channel)
+    if not channel_index or package_name.lower() not in channel_index:
+        return None
+    return Dict(channel_index[package_name.lower()])
@@ -1,13 +1,13 @@
 import logging
 from datetime import datetime
+from typing import Optional, Tuple
 
-import requests
 from addict import Dict
 from dateutil.parser import parse
 
 from best_of import utils
 from best_of.default_config import MIN_PROJECT_DESC_LENGTH
-from best_of.integrations import libio_integration
+from best_of.integrations import conda_index, http_client, libio_integration
 from best_of.integrations.base_integration import BaseIntegration
 
 log = logging.getLogger(__name__)
@@ -19,6 +19,27 @@ class CondaIntegration(BaseIntegration):
         return "conda"
 
     def update_project_info(self, project_info: Dict) -> None:
+        self.apply_project_info(project_info, self.fetch_project_info(project_info))
+
+    def fetch_project_info(self, project_info: Dict) -> Optional[Dict]:
+        if not project_info.conda_id:
+            return None
+
+        fetched_info = Dict()
+        if libio_integration.is_activated() and "/" not in project_info.conda_id:
+            # libraries.io can currently only parse conda packages from default channel (anaconda)
+            fetched_info.package_info = libio_integration.request_package_via_libio(
+                "conda", project_info.conda_id
+            )
+        (
+            fetched_info.conda_info,
+            fetched_info.conda_missing,
+        ) = self.request_conda_package(project_info.conda_id)
+        return fetched_info
+
+    def apply_project_info(
+        self, project_info: Dict, fetched_info: Optional[Dict]
+    ) -> None:
         if not project_info.conda_id:
             return
 
@@ -32,11 +53,15 @@ class CondaIntegration(BaseIntegration):
                     "https://anaconda.org/anaconda/" + project_info.conda_id
                 )
 
-        if libio_integration.is_activated() and "/" not in project_info.conda_id:
-            # libraries.io can currently only parse conda packages from default channel (anaconda)
-            libio_integration.update_package_via_libio("conda", project_info)
+        if not fetched_info:
+            return
 
-        self.update_via_conda_api(project_info)
+        if fetched_info.package_info:
+            libio_integration.update_package_via_libio(
+                "conda", project_info, fetched_info.package_info
+            )
+
+        self.update_via_conda_api(project_info, fetched_info.conda_info)
 
     def generate_md_details(self, project: Dict, configuration: Dict) -> str:
         conda_id = project.conda_id
@@ -98,26 +123,76 @@ class CondaIntegration(BaseIntegration):
             conda_channel=conda_channel, conda_package=conda_package
         )
 
-    def update_via_conda_api(self, project_info: Dict) -> None:
+    def update_via_channel_index(self, project_info: Dict) -> None:
+        package_metadata = conda_index.get_package_metadata(project_info.conda_id)
+        if not package_metadata:
+            return
+
+        if (
+            package_metadata.timestamp
+            and not project_info.conda_latest_release_published_at
+        ):
+            timestamp = float(package_metadata.timestamp)
+            if timestamp > 1e11:
+                # Some channels store the timestamp in milliseconds
+                timestamp /= 1000
+            project_info.conda_latest_release_published_at = datetime.fromtimestamp(
+                timestamp
+            )
+
+        if (
+            not project_info.description
+            or len(project_info.description) < MIN_PROJECT_DESC_LENGTH
+        ) and package_metadata.summary:
+            project_info.description = package_metadata.summary
+
+    def request_conda_package(self, conda_id: str) -> Tuple[Optional[Dict], bool]:
+        """Requests the metadata of a conda package.
+
+        Returns:
+            Tuple[Optional[Dict], bool]: The package metadata (or `None`) and if the
+                package is known to be missing (not only failed to be requested).
+        """
+        if conda_index.package_exists(conda_id) is False:
+            # Only packages that exist in the local channel index are requested
+            log.info("Unable to find package in conda channel index: " + conda_id)
+            return None, True
+
         try:
-            conda_package = project_info.conda_id
+            conda_package = conda_id
             if "/" not in conda_package:
                 # Add anaconda as default channel, if channel not provided
-                conda_package = "anaconda/" + project_info.conda_id
+                conda_package = "anaconda/" + conda_id
 
-            request = requests.get("https://api.anaconda.org/package/" + conda_package)
+            request = http_client.get(
+                "https://api.anaconda.org/package/" + conda_package
+            )
             request.text
             if request.status_code != 200:
                 log.info(
                     "Unable to find package via conda api: "
-                    + project_info.conda_id
+                    + conda_id
                     + " ("
                     + str(request.status_code)
                     + ")"
                 )
-                return
-            conda_info = Dict(request.json())
+                return None, request.status_code == 404
+            return Dict(request.json()), False
+        except Exception as ex:
+            log.info(
+                "Failed to request package via conda api: " + conda_id, exc_info=ex
+            )
+            return None, False
+
+    def update_via_conda_api(
+        self, project_info: Dict, conda_info: Optional[Dict]
+    ) -> None:
+        if not conda_info:
+            # Use the local channel index if the package could not be requested
+            self.update_via_channel_index(project_info)
+            return
 
+        try:
             created_at = None
             if conda_info.created_at:
                 try:
@@ -189,7 +264,8 @@ class CondaIntegration(BaseIntegration):
 
         except Exception as ex:
             log.info(
-                "Failed to request package via conda api: " + project_info.conda_id,
+                "Failed to process package via conda api: " + project_info.conda_id,
                 exc_info=ex,
             )
+            self.update_via_channel_index(project_info)
             return
@@ -1,11 +1,12 @@
 import logging
 from datetime import datetime
+from typing import Optional
 
-import requests
 from addict import Dict
 from dateutil.parser import parse
 
 from best_of import utils
+from best_of.integrations import http_client
 from best_of.integrations.base_integration import BaseIntegration
 
 log = logging.getLogger(__name__)
@@ -17,16 +18,11 @@ class DockerhubIntegration(BaseIntegration):
         return "dockerhub"
 
     def update_project_info(self, project_info: Dict) -> None:
-        if not project_info.dockerhub_id:
-            return
+        self.apply_project_info(project_info, self.fetch_project_info(project_info))
 
-        if not project_info.dockerhub_url:
-            dockerhub_url_id = project_info.dockerhub_id
-            if "/" not in dockerhub_url_id:
-                # if official image, it needs a _/ appended to the id to be requested via url
-                dockerhub_url_id = "_/" + dockerhub_url_id
-
-            project_info.dockerhub_url = "https://hub.docker.com/r/" + dockerhub_url_id
+    def fetch_project_info(self, project_info: Dict) -> Optional[Dict]:
+        if not project_info.dockerhub_id:
+            return None
 
         try:
             dockerhub_url_id = project_info.dockerhub_id
@@ -34,7 +30,7 @@ class DockerhubIntegration(BaseIntegration):
                 # if official image, it needs a library/ appended to the id to be requested via url
                 dockerhub_url_id = "library/" + dockerhub_url_id
 
-            request = requests.get(
+            request = http_client.get(
                 "https://hub.docker.com/v2/repositories/" + dockerhub_url_id
             )
             if request.status_code != 200:
@@ -45,14 +41,31 @@ class DockerhubIntegration(BaseIntegration):
                     + str(request.status_code)
                     + ")"
                 )
-                return
-            dockerhub_info = Dict(request.json())
+                return None
+            return Dict(request.json())
         except Exception as ex:
             log.info(
                 "Failed to request docker image via dockerhub api: "
                 + project_info.dockerhub_id,
                 exc_info=ex,
             )
+            return None
+
+    def apply_project_info(
+        self, project_info: Dict, dockerhub_info: Optional[Dict]
+    ) -> None:
+        if not project_info.dockerhub_id:
+            return
+
+        if not project_info.dockerhub_url:
+            dockerhub_url_id = project_info.dockerhub_id
+            if "/" not in dockerhub_url_id:
+                # if official image, it needs a _/ appended to the id to be requested via url
+                dockerhub_url_id = "_/" + dockerhub_url_id
+
+            project_info.dockerhub_url = "https://hub.docker.com/r/" + dockerhub_url_id
+
+        if dockerhub_info is None:
             return
 
         if not dockerhub_info.name:
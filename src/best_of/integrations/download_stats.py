@@ -0,0 +1,175 @@
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from best_of import instrumentation
+from best_of.integrations import http_client
+from best_of.integrations.http_cache import DAY
+
+log = logging.getLogger(__name__)
+
+ENV_PEPY_API_KEY = "PEPY_API_KEY"
+
+# Download statistics are only updated once per day
+DOWNLOAD_STATS_CACHE_TTL = DAY
+
+
+class DownloadStatsProvider(ABC):
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Returns the name of the provider."""
+        return NotImplemented
+
+    def is_available(self) -> bool:
+        """Returns `True`, if the provider can be used (e.g. an API key is set)."""
+        return True
+
+    @abstractmethod
+    def get_monthly_downloads(self, package: str) -> Optional[int]:
+        """Requests the number of downloads of a PyPI package within the last month.
+
+        Args:
+            package (str): Name of the PyPI package.
+
+        Returns:
+            Optional[int]: The monthly downloads, or `None` if the package or its
+                statistics could not be found.
+        """
+        return NotImplemented
+
+
+class PypistatsProvider(DownloadStatsProvider):
+    """Download statistics from https://pypistats.org."""
+
+    @property
+    def name(self) -> str:
+        return "pypistats"
+
+    def get_monthly_downloads(self, package: str) -> Optional[int]:
+        # Requests are paced by the rate limiter to 30 per minute:
+        # https://github.com/crflynn/pypistats.org/issues/28#issuecomment-598417650
+        response = http_client.get(
+            f"https://pypistats.org/api/packages/{package.lower()}/recent?period=month"
+        )
+        if response.status_code != 200:
+            log.info(
+                f"Unable to request statistics from pypistats: {package} ({response.status_code})"
+            )
+            return None
+        return int(response.json()["data"]["last_month"])
+
+
+class PepyProvider(DownloadStatsProvider):
+    """Download statistics from https://pepy.tech, requires the `PEPY_API_KEY`."""
+
+    @property
+    def name(self) -> str:
+        return "pepy"
+
+    def is_available(self) -> bool:
+        return bool(os.getenv(ENV_PEPY_API_KEY))
+
+    def get_monthly_downloads(self, package: str) -> Optional[int]:
+        response = http_client.get(
+            f"https://api.pepy.tech/api/v2/projects/{package}",
+            headers={"X-Api-Key": os.getenv(ENV_PEPY_API_KEY, "")},
+        )
+        if response.status_code != 200:
+            log.info(
+                f"Unable to request statistics from pepy: {package} ({response.status_code})"
+            )
+            return None
+
+        # Daily downloads per version of the latest months
+        start_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+        return sum(
+            sum(version_downloads.values())
+            for date, version_downloads in response.json().get("downloads", {}).items()
+            if date >= start_date
+        )
+
+
+# Providers are used in the given order until one returns statistics
+DOWNLOAD_STATS_PROVIDERS: List[DownloadStatsProvider] = [
+    PypistatsProvider(),
+    PepyProvider(),
+]
+
+# Statistics requested in this run by package name
+_monthly_downloads: dict = {}
+_monthly_downloads_lock = threading.Lock()
+
+
+@instrumentation.measured("pypi")
+def _request_monthly_downloads(package: str) -> Optional[int]:
+    for provider in DOWNLOAD_STATS_PROVIDERS:
+        if not provider.is_available():
+            continue
+        try:
+            monthly_downloads = provider.get_monthly_downloads(package)
+        except Exception as ex:
+            log.warning(
+                f"Unable to request statistics from {provider.name} (unexpected exception): "
+                + package,
+                exc_info=ex,
+            )
+            continue
+        if monthly_downloads is not None:
+            return monthly_downloads
+    return None
+
+
+def get_monthly_downloads(package: str) -> Optional[int]:
+    """Returns the monthly downloads of a PyPI package.
+
+    The statistics are requested once per run (also for missing packages) and
+    cached for a day if the HTTP cache is configured.
+
+    Args:
+        package (str): Name of the PyPI package.
+
+    Returns:
+        Optional[int]: The monthly downloads, or `None` if not available.
+    """
+    key = package.lower()
+    with _monthly_downloads_lock:
+        if key in _monthly_downloads:
+            return _monthly_downloads[key]
+
+    cached_stats = http_client.get_cached_value(
+        "pypi-downloads:" + key, DOWNLOAD_STATS_CACHE_TTL, host="pypistats.org"
+    )
+    if cached_stats is not None:
+        monthly_downloads = int(cached_stats)
+    else:
+        monthly_downloads = _request_monthly_downloads(package)
+        if monthly_downloads is not None:
+            http_client.set_cached_value("pypi-downloads:" + key, monthly_downloads)
+
+    with _monthly_downloads_lock:
+        _monthly_downloads[key] = monthly_downloads
+    return monthly_downloads
+
+
+def prefetch_monthly_downloads(packages: Iterable[str], max_workers: int) -> None:
+    """Requests the monthly downloads of multiple PyPI packages concurrently.
+
+    The requests stay within the rate limits of the providers, the results are
+    returned by `get_monthly_downloads`.
+
+    Args:
+        packages (Iterable[str]): Names of the PyPI packages.
+        max_workers (int): Maximum number of concurrent requests.
+    """
+    packages = list(dict.fromkeys(package for package in packages if package))
+    if not packages:
+        return
+
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as executor:
+        # Consume the results to propagate unexpected exceptions
+        list(executor.map(instrumentation.bind_scope(get_monthly_downloads), packages))
@@ -1,48 +1,135 @@
+import hashlib
 import logging
 import os
 import re
-import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterable, List, Optional, Tuple
 
-import requests
 from addict import Dict
-from bs4 import BeautifulSoup
 from dateutil.parser import parse
 
-from best_of import default_config, utils
+from best_of import default_config, instrumentation, utils
 from best_of.default_config import MIN_PROJECT_DESC_LENGTH
-from best_of.integrations import libio_integration
+from best_of.integrations import http_client, libio_integration, rate_limit
 
 log = logging.getLogger(__name__)
 
+GITHUB_GRAPHQL_API = "https://api.github.com/graphql"
+# GraphQL requests count against a separate rate limit than the REST api
+GITHUB_GRAPHQL_SERVICE = "api.github.com/graphql"
+GITHUB_REST_SERVICE = "api.github.com"
 
+
+def get_github_api_tokens() -> List[str]:
+    """Returns the GitHub API tokens from the `GITHUB_API_KEY` environment variable.
+
+    Multiple tokens can be provided as comma-separated list.
+    """
+    return [
+        token.strip()
+        for token in os.getenv("GITHUB_API_KEY", "").split(",")
+        if token.strip()
+    ]
+
+
+def get_token_service(service: str, github_api_token: str) -> str:
+    """Returns the name of the rate limit of a single token for the given service."""
+    # Every token has its own quota, only a hash is used to not expose the token
+    token_hash = hashlib.sha1(github_api_token.encode("utf-8")).hexdigest()[:8]
+    return service + ":" + token_hash
+
+
+def select_github_api_token(service: str = GITHUB_GRAPHQL_SERVICE) -> Optional[str]:
+    """Selects the GitHub API token with the most remaining quota.
+
+    Exhausted tokens are skipped until their quota is reset.
+
+    Args:
+        service (str, optional): Rate limit that is used for the request.
+            Defaults to the GraphQL api.
+
+    Returns:
+        Optional[str]: The selected token, or `None` if no token is configured.
+    """
+    github_api_tokens = get_github_api_tokens()
+    if not github_api_tokens:
+        return None
+
+    token_services = {
+        get_token_service(service, github_api_token): github_api_token
+        for github_api_token in github_api_tokens
+    }
+    return token_services[rate_limit.select_service(list(token_services))]
+
+
+def is_token_rate_limited(service: str, github_api_token: str) -> bool:
+    return rate_limit.is_blocked(get_token_service(service, github_api_token))
+
+
+# Dependents counts change slowly, they are reused for a week if cached
+DEPENDENTS_CACHE_TTL = 7 * 24 * 60 * 60
+DEPENDENTS_COUNT_PATTERN = re.compile(
+    r"(?<![0-9,])([0-9][0-9,]*)\s+(Repositories|Packages)\b"
+)
+# Overlap between text chunks to also find counts at the chunk boundaries
+DEPENDENTS_CHUNK_OVERLAP = 1024
+
+
+def extract_dependents_counts(text_chunks: Iterable[str]) -> Dict:
+    """Extracts the repository and package dependents counts from the dependents page.
+
+    The page is scanned chunk by chunk and the scan stops as soon as both counts
+    are found, so the rest of the page does not need to be downloaded.
+
+    Args:
+        text_chunks (Iterable[str]): Chunks of the `/network/dependents` HTML page.
+
+    Returns:
+        Dict: The found counts by dependent type (`Repositories`, `Packages`).
+    """
+    counts = Dict()
+    buffer = ""
+    for chunk in text_chunks:
+        buffer += chunk
+        for count_match in DEPENDENTS_COUNT_PATTERN.finditer(buffer):
+            dependent_type = count_match.group(2)
+            if dependent_type not in counts:
+                counts[dependent_type] = int(count_match.group(1).replace(",", ""))
+        if len(counts) == 2:
+            break
+        buffer = buffer[-DEPENDENTS_CHUNK_OVERLAP:]
+    return counts
+
+
+@instrumentation.measured("github-dependents")
 def get_repo_deps_via_github(github_id: str) -> int:
+    cache_key = "github-dependents:" + github_id.lower()
+    cached_repo_deps = http_client.get_cached_value(
+        cache_key, DEPENDENTS_CACHE_TTL, host="github.com"
+    )
+    if cached_repo_deps is not None:
+        return int(cached_repo_deps)
+
     try:
-        request = requests.get(
-            "https://github.com/" + github_id + "/network/dependents"
-        )
-        if request.status_code != 200:
-            log.info(
-                "Unable to find repo dependents via GitHub api: "
-                + github_id
-                + " ("
-                + str(request.status_code)
-                + ")"
-            )
-            return 0
-        repo_deps = 0
-        soup = BeautifulSoup(request.text, "html.parser")
-        repo_deps_str = soup.find(string=re.compile(r"[0-9,]+\s+Repositories"))
-        if repo_deps_str:
-            count_search = re.search("([0-9,]+)", repo_deps_str, re.IGNORECASE)
-            if count_search:
-                repo_deps += int(count_search.group(1).replace(",", ""))
-        pkg_deps_str = soup.find(string=re.compile(r"[0-9,]+\s+Packages"))
-        if pkg_deps_str:
-            count_search = re.search("([0-9,]+)", pkg_deps_str, re.IGNORECASE)
-            if count_search:
-                repo_deps += int(count_search.group(1).replace(",", ""))
+        with http_client.stream(
+            "GET", "https://github.com/" + github_id + "/network/dependents"
+        ) as response:
+            if response.status_code != 200:
+                log.info(
+                    "Unable to find repo dependents via GitHub api: "
+                    + github_id
+                    + " ("
+                    + str(response.status_code)
+                    + ")"
+                )
+                return 0
+            counts = extract_dependents_counts(response.iter_text())
+
+        repo_deps = sum(counts.values())
+        if counts:
+            http_client.set_cached_value(cache_key, repo_deps)
         return repo_deps
     except Exception as ex:
         log.info(
@@ -51,6 +138,21 @@ def get_repo_deps_via_github(github_id: str) -> int:
         return 0
 
 
+# Contributor counts that were fetched in advance via concurrent requests
+_prefetched_contributor_counts: dict = {}
+
+
+def get_memoized_contributor_count(github_id: str) -> Optional[int]:
+    """Returns the contributor count that was collected in a previous run."""
+    contributor_count = http_client.get_cached_value(
+        "github-contributors:" + github_id.lower(), float("inf")
+    )
+    if contributor_count is not None:
+        log.info("Using contributor count from a previous run: " + github_id)
+    return contributor_count
+
+
+@instrumentation.measured("github-contributors")
 def get_contributors_via_github_api(
     github_id: str, github_api_token: str
 ) -> Optional[int]:
@@ -58,12 +160,27 @@ def get_contributors_via_github_api(
         return None
 
     try:
-        request = requests.get(
+        # Unchanged contributors are revalidated via conditional requests by the
+        # http client, which do not count against the rate limit
+        request = http_client.get(
             "https://api.github.com/repos/"
             + github_id
             + "/contributors?page=1&per_page=1&anon=True",
             headers={"Authorization": "token " + github_api_token},
+            rate_limit_service=get_token_service(GITHUB_REST_SERVICE, github_api_token),
+            retry_rate_limited=False,
         )
+        if request.status_code == 202 or request.status_code >= 500:
+            # GitHub is still computing the contributors or is not available
+            log.info(
+                "GitHub contributors are not available yet: "
+                + github_id
+                + " ("
+                + str(request.status_code)
+                + ")"
+            )
+            return get_memoized_contributor_count(github_id)
+
         if request.status_code != 200:
             log.info(
                 "Unable to find repo contributors via GitHub api: "
@@ -82,6 +199,9 @@ def get_contributors_via_github_api(
         contributor_count = 0
         for found_group in re.findall(r"\?page=([0-9]+)", link_header, re.IGNORECASE):
             contributor_count = max(contributor_count, int(found_group))
+        http_client.set_cached_value(
+            "github-contributors:" + github_id.lower(), contributor_count
+        )
         return contributor_count
     except Exception as ex:
         log.info(
@@ -89,9 +209,186 @@ def get_contributors_via_github_api(
             exc_info=ex,
         )
 
-        return None
+        return get_memoized_contributor_count(github_id)
+
+
+def request_contributor_count(github_id: str) -> Optional[int]:
+    """Requests the contributor count of a repo, rate limited tokens are replaced."""
+    contributor_count = None
+    for _ in range(len(get_github_api_tokens())):
+        github_api_token = select_github_api_token(GITHUB_REST_SERVICE)
+        contributor_count = get_contributors_via_github_api(github_id, github_api_token)
+        if contributor_count is not None or not is_token_rate_limited(
+            GITHUB_REST_SERVICE, github_api_token
+        ):
+            break
+    return contributor_count
+
+
+def prefetch_contributor_counts(github_ids: List[str], max_workers: int) -> None:
+    """Requests the contributor counts of multiple repos concurrently.
+
+    The prefetched counts are used by `update_via_github_api` instead of
+    requesting every repo during the collection of the project.
+
+    Args:
+        github_ids (List[str]): GitHub ids (`owner/repo`) of the repositories.
+        max_workers (int): Maximum number of concurrent requests.
+    """
+    _prefetched_contributor_counts.clear()
+
+    if not get_github_api_tokens():
+        return
+
+    github_ids = list(
+        OrderedDict.fromkeys(
+            github_id for github_id in github_ids if github_id and "/" in github_id
+        )
+    )
+    if not github_ids:
+        return
+
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as executor:
+        for github_id, contributor_count in zip(
+            github_ids,
+            executor.map(
+                instrumentation.bind_scope(request_contributor_count), github_ids
+            ),
+        ):
+            _prefetched_contributor_counts[github_id] = contributor_count
+
+
+# GraphQL query
+# https://github.com/badgen/badgen.net/blob/master/endpoints/github.ts#L214
+REPOSITORY_FIELDS_FRAGMENT = """
+fragment repositoryFields on Repository {
+  name
+  nameWithOwner
+  description
+  url
+  homepageUrl
+  createdAt
+  updatedAt
+  pushedAt
+  diskUsage
+  primaryLanguage {
+    name
+  }
+  licenseInfo {
+    spdxId
+  }
+  stargazers {
+    totalCount
+  }
+  pullRequests {
+    totalCount
+  }
+  forks {
+    totalCount
+  }
+  watchers {
+    totalCount
+  }
+  masterCommit: defaultBranchRef {
+      target {
+        ... on Commit {
+          committedDate
+          recent_activity: history(since: $since_recent_activity) {
+              totalCount
+          }
+          history {
+              totalCount
+          }
+        }
+      }
+  }
+  repositoryTopics(first: 100) {
+    nodes {
+      topic {
+        name
+      }
+    }
+  }
+  openIssues: issues(states: OPEN) {
+    totalCount
+  }
+  closedIssues: issues(states: CLOSED) {
+    totalCount
+  }
+}
+"""
+
+# The releases are expensive (nested assets). If the value cache is enabled, only
+# the release count and latest release are probed, and the releases are only
+# requested if they changed.
+RELEASE_PROBE_FRAGMENT = """
+fragment releaseProbeFields on Repository {
+  releaseProbe: releases(first: 1, orderBy: {field:CREATED_AT, direction:DESC}) {
+    totalCount
+    nodes {
+      createdAt
+    }
+  }
+}
+"""
+
+RELEASE_FIELDS_FRAGMENT = """
+fragment releaseFields on Repository {
+  releases(first: 100, orderBy: {field:CREATED_AT, direction:DESC}) {
+    nodes {
+      createdAt
+      publishedAt
+      tagName
+      isDraft
+      isPrerelease
+      releaseAssets(first: 100) {
+        nodes {
+          downloadCount
+        }
+      }
+    }
+  }
+}
+"""
+
+# Releases are reused as long as their count and latest release are unchanged. Only
+# the download counts of their assets are refreshed, once a month.
+GITHUB_RELEASES_CACHE_TTL = 30 * 24 * 60 * 60
+# Number of repositories requested with a single releases query
+GITHUB_RELEASES_BATCH_SIZE = 10
+
+# Initial and maximum number of repositories requested with a single GraphQL query
+GITHUB_BATCH_INITIAL_SIZE = 10
+GITHUB_BATCH_MAX_SIZE = 40
+# Targeted GraphQL cost (in rate limit points) of a single batched query
+GITHUB_BATCH_TARGET_COST = 40
+
+# Repository metadata that was fetched in advance via batched queries
+_prefetched_github_info: dict = {}
+
+
+def get_release_fragment() -> Tuple[str, str]:
+    """Returns the name and definition of the release fragment of repository queries."""
+    if http_client.is_value_cache_enabled():
+        return "releaseProbeFields", RELEASE_PROBE_FRAGMENT
+    # Without cache, probing the releases would require an additional query
+    return "releaseFields", RELEASE_FIELDS_FRAGMENT
+
+
+def update_graphql_quota(response_data: dict, github_api_token: str) -> None:
+    """Updates the GraphQL rate limit based on the `rateLimit` info of a response."""
+    if not response_data:
+        return
+    quota = Dict(response_data).rateLimit
+    if quota and quota.remaining is not None:
+        rate_limit.update_quota(
+            get_token_service(GITHUB_GRAPHQL_SERVICE, github_api_token),
+            quota.remaining,
+            quota.resetAt,
+        )
 
 
+@instrumentation.measured("github-graphql")
 def request_metadata_from_github_api(
     github_api_token: str, github_id: str, recent_activity_date: datetime
 ) -> Optional[Dict]:
@@ -113,81 +410,25 @@ def request_metadata_from_github_api(
     # isSecurityPolicyEnabled
     # hasIssuesEnabled
 
-    # GraphQL query
-    # https://github.com/badgen/badgen.net/blob/master/endpoints/github.ts#L214
-    query = """
+    release_fragment_name, release_fragment = get_release_fragment()
+    query = (
+        """
 query($owner: String!, $repo: String!, $since_recent_activity: GitTimestamp!) {
   repository(owner: $owner, name: $repo) {
-    name
-    nameWithOwner
-    description
-    url
-    homepageUrl
-    createdAt
-    updatedAt
-    pushedAt
-    diskUsage
-    primaryLanguage {
-      name
-    }
-    licenseInfo {
-      spdxId
-    }
-    stargazers {
-      totalCount
-    }
-    pullRequests {
-      totalCount
-    }
-    forks {
-      totalCount
-    }
-    watchers {
-      totalCount
-    }
-    masterCommit: defaultBranchRef {
-        target {
-          ... on Commit {
-            committedDate
-            recent_activity: history(since: $since_recent_activity) {
-                totalCount
-            }
-            history {
-                totalCount
-            }
-          }
-        }
-    }
-    repositoryTopics(first: 100) {
-      nodes {
-        topic {
-          name
-        }
-      }
-    }
-    openIssues: issues(states: OPEN) {
-      totalCount
-    }
-    closedIssues: issues(states: CLOSED) {
-      totalCount
-    }
-    releases(first: 100, orderBy: {field:CREATED_AT, direction:DESC}) {
-      nodes {
-        createdAt
-        publishedAt
-        tagName
-        isDraft
-        isPrerelease
-        releaseAssets(first: 100) {
-          nodes {
-            downloadCount
-          }
-        }
-      }
-    }
+    ...repositoryFields
+    ..."""
+        + release_fragment_name
+        + """
+  }
+  rateLimit {
+    remaining
+    resetAt
   }
 }
 """
+        + REPOSITORY_FIELDS_FRAGMENT
+        + release_fragment
+    )
     headers = {"Authorization": "token " + github_api_token}
     variables = {
         "owner": owner,
@@ -196,10 +437,15 @@ query($owner: String!, $repo: String!, $since_recent_activity: GitTimestamp!) {
     }
 
     try:
-        response = requests.post(
-            "https://api.github.com/graphql",
+        response = http_client.post(
+            GITHUB_GRAPHQL_API,
             json={"query": query, "variables": variables},
             headers=headers,
+            rate_limit_service=get_token_service(
+                GITHUB_GRAPHQL_SERVICE, github_api_token
+            ),
+            # Rate limited requests are retried with another token by the caller
+            retry_rate_limited=False,
         )
 
         if response.status_code != 200:
@@ -217,6 +463,7 @@ query($owner: String!, $repo: String!, $since_recent_activity: GitTimestamp!) {
             log.info("Request returned unexpected data: " + str(response_data))
             return None
 
+        update_graphql_quota(response_data["data"], github_api_token)
         return Dict(response_data["data"]["repository"])
     except Exception as ex:
         log.info(
@@ -226,7 +473,321 @@ query($owner: String!, $repo: String!, $since_recent_activity: GitTimestamp!) {
         return None
 
 
-def update_via_github_api(project_info: Dict) -> None:
+@instrumentation.measured("github-graphql")
+def request_metadata_batch_from_github_api(
+    github_api_token: str, github_ids: List[str], recent_activity_date: datetime
+) -> Optional[Tuple[dict, int]]:
+    """Requests the metadata of multiple repositories with a single GraphQL query.
+
+    Every repository is requested via an aliased `repository` field.
+
+    Args:
+        github_api_token (str): GitHub API token.
+        github_ids (List[str]): GitHub ids (`owner/repo`) of the repositories.
+        recent_activity_date (datetime): Start date to count the recent commits.
+
+    Returns:
+        Optional[Tuple[dict, int]]: The fetched metadata by GitHub id and the cost of
+            the query (in rate limit points), or `None` if the request failed.
+            Repositories that do not exist are included with `None` as metadata,
+            repositories that could not be resolved for other reasons are missing.
+    """
+    variable_definitions = ["$since_recent_activity: GitTimestamp!"]
+    repository_fields = []
+    variables = {"since_recent_activity": recent_activity_date.isoformat()}
+    release_fragment_name, release_fragment = get_release_fragment()
+
+    for i, github_id in enumerate(github_ids):
+        variable_definitions.append(f"$owner{i}: String!, $repo{i}: String!")
+        repository_fields.append(
+            f"  repo{i}: repository(owner: $owner{i}, name: $repo{i}) {{\n"
+            "    ...repositoryFields\n"
+            f"    ...{release_fragment_name}\n"
+            "  }\n"
+        )
+        variables[f"owner{i}"] = github_id.split("/")[0]
+        variables[f"repo{i}"] = github_id.split("/")[1]
+
+    query = (
+        "query("
+        + ", ".join(variable_definitions)
+        + ") {\n"
+        + "".join(repository_fields)
+        + "  rateLimit {\n    cost\n    remaining\n    resetAt\n  }\n}\n"
+        + REPOSITORY_FIELDS_FRAGMENT
+        + release_fragment
+    )
+    headers = {"Authorization": "token " + github_api_token}
+
+    try:
+        response = http_client.post(
+            GITHUB_GRAPHQL_API,
+            json={"query": query, "variables": variables},
+            headers=headers,
+            rate_limit_service=get_token_service(
+                GITHUB_GRAPHQL_SERVICE, github_api_token
+            ),
+            # Rate limited requests are retried with another token by the caller
+            retry_rate_limited=False,
+        )
+
+        if response.status_code != 200:
+            log.info(
+                f"Unable to request {len(github_ids)} GitHub repos via GitHub api ({response.status_code})"
+            )
+            return None
+        response_data = Dict(response.json())
+
+        if not response_data.data:
+            log.info("Request returned unexpected data: " + str(response_data))
+            return None
+
+        # Only repos that do not exist are returned as empty, other errors are retried
+        missing_repos = set()
+        for error in response_data.errors or []:
+            if error.type == "NOT_FOUND" and error.path:
+                missing_repos.add(error.path[0])
+
+        github_infos = {}
+        for i, github_id in enumerate(github_ids):
+            github_info = response_data.data[f"repo{i}"]
+            if github_info:
+                github_infos[github_id] = Dict(github_info)
+            elif f"repo{i}" in missing_repos:
+                github_infos[github_id] = None
+
+        update_graphql_quota(response_data.data, github_api_token)
+        return github_infos, int(response_data.data.rateLimit.cost or 0)
+    except Exception as ex:
+        log.info(
+            f"Failed to request {len(github_ids)} GitHub repos via GitHub api",
+            exc_info=ex,
+        )
+        return None
+
+
+def get_release_fingerprint(github_info: Dict) -> Optional[list]:
+    """Returns the release count and latest release date of the probed metadata."""
+    if not github_info.releaseProbe:
+        return None
+    latest_release = Dict()
+    if github_info.releaseProbe.nodes:
+        latest_release = github_info.releaseProbe.nodes[0]
+    return [int(github_info.releaseProbe.totalCount or 0), latest_release.createdAt]
+
+
+@instrumentation.measured("github-graphql")
+def request_releases_from_github_api(
+    github_api_token: str, github_ids: List[str]
+) -> Optional[dict]:
+    """Requests the releases of multiple repositories with a single GraphQL query.
+
+    Args:
+        github_api_token (str): GitHub API token.
+        github_ids (List[str]): GitHub ids (`owner/repo`) of the repositories.
+
+    Returns:
+        Optional[dict]: The release nodes by GitHub id, or `None` if the request failed.
+    """
+    variable_definitions = []
+    repository_fields = []
+    variables = {}
+
+    for i, github_id in enumerate(github_ids):
+        variable_definitions.append(f"$owner{i}: String!, $repo{i}: String!")
+        repository_fields.append(
+            f"  repo{i}: repository(owner: $owner{i}, name: $repo{i}) {{\n"
+            "    ...releaseFields\n"
+            "  }\n"
+        )
+        variables[f"owner{i}"] = github_id.split("/")[0]
+        variables[f"repo{i}"] = github_id.split("/")[1]
+
+    query = (
+        "query("
+        + ", ".join(variable_definitions)
+        + ") {\n"
+        + "".join(repository_fields)
+        + "  rateLimit {\n    remaining\n    resetAt\n  }\n}\n"
+        + RELEASE_FIELDS_FRAGMENT
+    )
+    headers = {"Authorization": "token " + github_api_token}
+
+    try:
+        response = http_client.post(
+            GITHUB_GRAPHQL_API,
+            json={"query": query, "variables": variables},
+            headers=headers,
+            rate_limit_service=get_token_service(
+                GITHUB_GRAPHQL_SERVICE, github_api_token
+            ),
+        )
+
+        if response.status_code != 200:
+            log.info(
+                f"Unable to request releases of {len(github_ids)} GitHub repos via GitHub api ({response.status_code})"
+            )
+            return None
+        response_data = Dict(response.json())
+
+        if not response_data.data:
+            log.info("Request returned unexpected data: " + str(response_data))
+            return None
+
+        update_graphql_quota(response_data.data, github_api_token)
+        return {
+            github_id: list(response_data.data[f"repo{i}"].releases.nodes or [])
+            for i, github_id in enumerate(github_ids)
+            if response_data.data[f"repo{i}"]
+        }
+    except Exception as ex:
+        log.info(
+            f"Failed to request releases of {len(github_ids)} GitHub repos via GitHub api",
+            exc_info=ex,
+        )
+        return None
+
+
+def update_releases(github_infos: dict) -> None:
+    """Adds the releases to the probed metadata of multiple repositories.
+
+    The releases of a repository are only requested if its release count or latest
+    release changed since they were cached, or the download counts of the cached
+    releases are older than `GITHUB_RELEASES_CACHE_TTL`.
+
+    Args:
+        github_infos (dict): Probed metadata by GitHub id, updated in place.
+    """
+    changed_ids = []
+    for github_id, github_info in github_infos.items():
+        fingerprint = get_release_fingerprint(github_info) if github_info else None
+        if not fingerprint:
+            continue
+        if not fingerprint[0]:
+            # The repository has no releases
+            github_info.releases.nodes = []
+            continue
+        cached_releases = http_client.get_cached_value(
+            "github-releases:" + github_id.lower(),
+            GITHUB_RELEASES_CACHE_TTL,
+            host="api.github.com",
+        )
+        if cached_releases and cached_releases["fingerprint"] == fingerprint:
+            github_info.releases.nodes = [
+                Dict(release) for release in cached_releases["releases"]
+            ]
+        else:
+            changed_ids.append(github_id)
+
+    for i in range(0, len(changed_ids), GITHUB_RELEASES_BATCH_SIZE):
+        batch_ids = changed_ids[i : i + GITHUB_RELEASES_BATCH_SIZE]
+        github_api_token = select_github_api_token()
+        if not github_api_token:
+            return
+        releases = request_releases_from_github_api(github_api_token, batch_ids)
+        for github_id in batch_ids:
+            if releases and github_id in releases:
+                http_client.set_cached_value(
+                    "github-releases:" + github_id.lower(),
+                    {
+                        "fingerprint": get_release_fingerprint(github_infos[github_id]),
+                        "releases": releases[github_id],
+                    },
+                )
+                github_infos[github_id].releases.nodes = [
+                    Dict(release) for release in releases[github_id]
+                ]
+                continue
+
+            # Fall back to outdated releases if the request failed
+            cached_releases = http_client.get_cached_value(
+                "github-releases:" + github_id.lower(), float("inf")
+            )
+            if cached_releases:
+                github_infos[github_id].releases.nodes = [
+                    Dict(release) for release in cached_releases["releases"]
+                ]
+
+
+def prefetch_github_info(github_ids: List[str]) -> None:
+    """Fetches the metadata of all GitHub repos via batched GraphQL queries.
+
+    The number of repos per query is adapted to the cost of the previous query
+    and reduced if a query fails. The prefetched metadata is used by
+    `update_via_github_api` instead of requesting every repo on its own.
+
+    Args:
+        github_ids (List[str]): GitHub ids (`owner/repo`) of the repositories.
+    """
+    _prefetched_github_info.clear()
+
+    github_api_tokens = get_github_api_tokens()
+    if not github_api_tokens:
+        return
+
+    # Check activity since the latest 90 days
+    recent_activity_date = datetime.now() - timedelta(
+        days=default_config.RECENT_ACTIVITY_DAYS
+    )
+
+    pending_ids = list(
+        OrderedDict.fromkeys(
+            github_id for github_id in github_ids if github_id and "/" in github_id
+        )
+    )
+    batch_size = GITHUB_BATCH_INITIAL_SIZE
+    rate_limited_requests = 0
+
+    while pending_ids:
+        batch_ids = pending_ids[:batch_size]
+        github_api_token = select_github_api_token()
+        result = request_metadata_batch_from_github_api(
+            github_api_token, batch_ids, recent_activity_date
+        )
+
+        if result is None and is_token_rate_limited(
+            GITHUB_GRAPHQL_SERVICE, github_api_token
+        ):
+            rate_limited_requests += 1
+            if rate_limited_requests > 2 * len(github_api_tokens):
+                log.info("All GitHub API tokens are rate limited, stop prefetching.")
+                return
+            # Retry the same batch with the next available token
+            continue
+
+        if result is None:
+            if batch_size == 1:
+                # Remaining repos are requested individually during the collection
+                log.info("Batched GitHub requests failed, stop prefetching.")
+                return
+            # The query might be too expensive -> retry with smaller batches
+            batch_size = max(1, batch_size // 2)
+            continue
+
+        rate_limited_requests = 0
+        github_infos, query_cost = result
+        _prefetched_github_info.update(github_infos)
+        pending_ids = pending_ids[len(batch_ids) :]
+
+        if query_cost:
+            # Adapt the batch size to the cost per repository
+            batch_size = int(GITHUB_BATCH_TARGET_COST * len(batch_ids) / query_cost)
+            batch_size = max(1, min(GITHUB_BATCH_MAX_SIZE, batch_size))
+
+    update_releases(_prefetched_github_info)
+
+
+def get_prefetched_star_count(github_id: str) -> Optional[int]:
+    """Returns the star count of a prefetched repo, or `None` if it was not prefetched."""
+    github_info = _prefetched_github_info.get(github_id)
+    if not github_info:
+        return None
+    return int(Dict(github_info).stargazers.totalCount or 0)
+
+
+def update_via_github_api(
+    project_info: Dict, github_info: Dict = None, fresh_metrics: Dict = None
+) -> None:
     if not project_info.github_id:
         return
 
@@ -234,8 +795,8 @@ def update_via_github_api(project_info: Dict) -> None:
         log.info("The GitHub project id is not valid: " + project_info.github_id)
         return
 
-    github_api_token = os.getenv("GITHUB_API_KEY")
-    if not github_api_token:
+    github_api_tokens = get_github_api_tokens()
+    if not github_api_tokens:
         return None
 
     # Check activity since the latest 90 days
@@ -243,19 +804,31 @@ def update_via_github_api(project_info: Dict) -> None:
         days=default_config.RECENT_ACTIVITY_DAYS
     )
 
-    github_info = request_metadata_from_github_api(
-        github_api_token, project_info.github_id, recent_activity_date
-    )
-    if github_info is None:
-        log.info("Retrying failed github api call short wait time.")
-        time.sleep(150)
+    if github_info is None and project_info.github_id in _prefetched_github_info:
+        github_info = _prefetched_github_info[project_info.github_id]
+        if github_info is None:
+            log.info(
+                "Unable to find GitHub repo via GitHub api: " + project_info.github_id
+            )
+            return
+
+    # Failed requests are retried once, rate limited tokens are replaced by another one
+    attempts = len(github_api_tokens) + 1
+    for attempt in range(attempts):
+        if github_info is not None:
+            break
+        if attempt > 0:
+            log.info("Retrying failed github api call.")
         github_info = request_metadata_from_github_api(
-            github_api_token, project_info.github_id, recent_activity_date
+            select_github_api_token(), project_info.github_id, recent_activity_date
         )
 
     if github_info is None:
         return
 
+    if github_info.releaseProbe and not github_info.releases:
+        update_releases({project_info.github_id: github_info})
+
     if not project_info.github_url and github_info.url:
         project_info.github_url = github_info.url
 
@@ -458,8 +1031,21 @@ def update_via_github_api(project_info: Dict) -> None:
     ) and github_info.description:
         project_info.description = github_info.description
 
+    if not fresh_metrics:
+        fresh_metrics = Dict()
+
     # Get dependents count
-    dependent_project_count = get_repo_deps_via_github(project_info.github_id)
+    if "github_dependent_project_count_collected_at" in fresh_metrics:
+        # Dependents change slowly -> reuse the recently collected count
+        dependent_project_count = fresh_metrics.github_dependent_project_count or 0
+        project_info.github_dependent_project_count_collected_at = (
+            fresh_metrics.github_dependent_project_count_collected_at
+        )
+    else:
+        dependent_project_count = get_repo_deps_via_github(project_info.github_id)
+        if dependent_project_count:
+            project_info.github_dependent_project_count_collected_at = datetime.now()
+
     if dependent_project_count:
         if not project_info.dependent_project_count:
             project_info.dependent_project_count = 0
@@ -469,9 +1055,18 @@ def update_via_github_api(project_info: Dict) -> None:
         project_info.github_dependent_project_count = dependent_project_count
 
     # Get contributor count via GitHub api 3
-    contributor_count = get_contributors_via_github_api(
-        project_info.github_id, github_api_token
-    )
+    if "contributor_count_collected_at" in fresh_metrics:
+        contributor_count = fresh_metrics.contributor_count
+        project_info.contributor_count_collected_at = (
+            fresh_metrics.contributor_count_collected_at
+        )
+    else:
+        if project_info.github_id in _prefetched_contributor_counts:
+            contributor_count = _prefetched_contributor_counts[project_info.github_id]
+        else:
+            contributor_count = request_contributor_count(project_info.github_id)
+        if contributor_count:
+            project_info.contributor_count_collected_at = datetime.now()
     if contributor_count:
         if not project_info.contributor_count:
             project_info.contributor_count = contributor_count
@@ -482,11 +1077,13 @@ def update_via_github_api(project_info: Dict) -> None:
     # TODO: Get monthly statistics: https://github.com/ethereum/go-ethereum/pulse/monthly
 
 
-def update_via_github(project_info: Dict) -> None:
+def update_via_github(
+    project_info: Dict, github_info: Dict = None, fresh_metrics: Dict = None
+) -> None:
     if not project_info.github_id:
         return
 
-    update_via_github_api(project_info)
+    update_via_github_api(project_info, github_info, fresh_metrics)
 
     if not project_info.github_url or (
         project_info.star_count and project_info.star_count > 20
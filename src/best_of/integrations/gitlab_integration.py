@@ -1,12 +1,12 @@
 import logging
 from typing import Tuple
 
-import requests
 from addict import Dict
 from dateutil.parser import parse
 
 from best_of import utils
 from best_of.default_config import MIN_PROJECT_DESC_LENGTH
+from best_of.integrations import http_client
 from best_of.integrations.base_integration import BaseIntegration
 
 log = logging.getLogger(__name__)
@@ -89,7 +89,7 @@ class GitLabIntegration(BaseIntegration):
         api_url, project_id = self.get_api_url(project_info.gitlab_id)
         variables = {"fullPath": project_id}
         try:
-            request = requests.post(
+            request = http_client.post(
                 api_url,
                 json={"query": query, "variables": variables},
             )
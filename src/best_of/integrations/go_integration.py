@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 
 from addict import Dict
 
@@ -15,14 +16,24 @@ class GoIntegration(BaseIntegration):
         return "go"
 
     def update_project_info(self, project_info: Dict) -> None:
+        self.apply_project_info(project_info, self.fetch_project_info(project_info))
+
+    def fetch_project_info(self, project_info: Dict) -> Optional[Dict]:
+        if not project_info.go_id or not libio_integration.is_activated():
+            return None
+        return libio_integration.request_package_via_libio("go", project_info.go_id)
+
+    def apply_project_info(
+        self, project_info: Dict, package_info: Optional[Dict]
+    ) -> None:
         if not project_info.go_id:
             return
 
         if not project_info.go_url:
             project_info.go_url = "https://pkg.go.dev/" + project_info.go_id
 
-        if libio_integration.is_activated():
-            libio_integration.update_package_via_libio("go", project_info)
+        if package_info:
+            libio_integration.update_package_via_libio("go", project_info, package_info)
 
     def generate_md_details(self, project: Dict, configuration: Dict) -> str:
         go_id = project.go_id
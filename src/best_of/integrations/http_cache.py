@@ -0,0 +1,249 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+from addict import Dict
+
+log = logging.getLogger(__name__)
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# Time (in seconds) a cached response is used without revalidation.
+# Responses from other endpoints are always revalidated via conditional requests.
+ENDPOINT_TTLS: List[Tuple[str, int]] = [
+    (r"^https://api\.anaconda\.org/package/", DAY),
+    # npm download counts are only updated once per day
+    (r"^https://api\.npmjs\.org/downloads/", DAY),
+    (r"^https://hub\.docker\.com/v2/repositories/", 6 * HOUR),
+    (r"^https://crates\.io/api/v1/crates/", DAY),
+    (r"^https://api\.github\.com/repos/[^/]+/[^/]+/contributors", DAY),
+]
+DEFAULT_TTL = 0
+
+IGNORED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def get_ttl(url: str) -> int:
+    for url_pattern, ttl in ENDPOINT_TTLS:
+        if re.match(url_pattern, url):
+            return ttl
+    return DEFAULT_TTL
+
+
+class CachedResponse:
+    def __init__(self, metadata: Dict, content: bytes):
+        self.metadata = metadata
+        self.content = content
+
+    @property
+    def url(self) -> str:
+        return self.metadata.url
+
+    @property
+    def headers(self) -> dict:
+        return self.metadata.headers.to_dict()
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.metadata.headers.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.metadata.headers.get("last-modified")
+
+    def is_fresh(self) -> bool:
+        return time.time() - float(self.metadata.validated_at) < get_ttl(self.url)
+
+
+class ResponseCache:
+    """Persistent on-disk cache for HTTP responses.
+
+    Every response is stored as a metadata (`.json`) and a content (`.body`) file.
+    If the cache exceeds the maximum size, the least recently used responses
+    are removed.
+
+    Args:
+        cache_folder (str): Folder used to store the cached responses.
+        max_size (int): Maximum size of all cached responses in bytes.
+    """
+
+    def __init__(self, cache_folder: str, max_size: int):
+        self.cache_folder = cache_folder
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # Cache key -> (size in bytes, last used timestamp)
+        self._entries: dict = {}
+        self._total_size = 0
+
+        os.makedirs(self.cache_folder, exist_ok=True)
+        for entry in os.scandir(self.cache_folder):
+            if not entry.name.endswith(".body"):
+                continue
+            key = entry.name[: -len(".body")]
+            stat = entry.stat()
+            self._entries[key] = (stat.st_size, stat.st_mtime)
+            self._total_size += stat.st_size
+
+    def _get_path(self, key: str, extension: str) -> str:
+        return os.path.join(self.cache_folder, key + extension)
+
+    def _write_file(self, path: str, content: bytes) -> None:
+        # Write to a temporary file first, so that a crash never leaves a broken entry
+        temp_path = path + "." + str(threading.get_ident()) + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    def _remove(self, key: str) -> None:
+        for extension in [".json", ".body"]:
+            try:
+                os.remove(self._get_path(key, extension))
+            except OSError:
+                pass
+        size, _ = self._entries.pop(key, (0, 0))
+        self._total_size -= size
+
+    def _evict(self) -> None:
+        if self._total_size <= self.max_size:
+            return
+
+        # Remove least recently used responses until 90% of the max size is reached
+        for key, _ in sorted(self._entries.items(), key=lambda entry: entry[1][1]):
+            if self._total_size <= self.max_size * 0.9:
+                break
+            self._remove(key)
+
+    @staticmethod
+    def get_key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        key = self.get_key(url)
+        with self._lock:
+            if key not in self._entries:
+                return None
+
+            try:
+                with open(self._get_path(key, ".json"), "r") as f:
+                    metadata = Dict(json.load(f))
+                with open(self._get_path(key, ".body"), "rb") as f:
+                    content = f.read()
+            except Exception as ex:
+                log.info("Failed to read cached response for " + url, exc_info=ex)
+                self._remove(key)
+                return None
+
+            # Update last used timestamp
+            self._entries[key] = (len(content), time.time())
+            try:
+                os.utime(self._get_path(key, ".body"))
+            except OSError:
+                pass
+            return CachedResponse(metadata, content)
+
+    def set(self, url: str, headers: dict, content: bytes) -> None:
+        key = self.get_key(url)
+        metadata = {
+            "url": url,
+            "headers": {
+                name.lower(): value
+                for name, value in headers.items()
+                # The content is stored decoded
+                if name.lower() not in IGNORED_HEADERS
+            },
+            "validated_at": time.time(),
+        }
+        with self._lock:
+            try:
+                if key in self._entries:
+                    self._remove(key)
+                self._write_file(self._get_path(key, ".body"), content)
+                self._write_file(
+                    self._get_path(key, ".json"), json.dumps(metadata).encode("utf-8")
+                )
+                self._entries[key] = (len(content), time.time())
+                self._total_size += len(content)
+                self._evict()
+            except Exception as ex:
+                log.info("Failed to cache response for " + url, exc_info=ex)
+
+    def revalidate(self, cached_response: CachedResponse, headers: dict) -> None:
+        """Marks a cached response as validated (e.g. after a `304 Not Modified`).
+
+        Args:
+            cached_response (CachedResponse): The revalidated response.
+            headers (dict): Headers of the revalidation response.
+        """
+        key = self.get_key(cached_response.url)
+        cached_response.metadata.validated_at = time.time()
+        for name in ["etag", "last-modified"]:
+            if name in headers:
+                cached_response.metadata.headers[name] = headers[name]
+        with self._lock:
+            if key not in self._entries:
+                return
+            try:
+                self._write_file(
+                    self._get_path(key, ".json"),
+                    json.dumps(cached_response.metadata.to_dict()).encode("utf-8"),
+                )
+            except Exception as ex:
+                log.info(
+                    "Failed to revalidate cached response for " + cached_response.url,
+                    exc_info=ex,
+                )
+
+
+class ValueCache:
+    """Persistent on-disk cache for values derived from HTTP responses.
+
+    Used for slowly changing metrics that are extracted from large responses,
+    so that only the extracted value needs to be stored.
+
+    Args:
+        cache_folder (str): Folder used to store the cached values.
+    """
+
+    def __init__(self, cache_folder: str):
+        self.cache_folder = cache_folder
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_folder, exist_ok=True)
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(
+            self.cache_folder,
+            hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json",
+        )
+
+    def get(self, key: str, ttl: float) -> Optional[Any]:
+        """Returns a cached value if it was stored less than `ttl` seconds ago."""
+        path = self._get_path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as ex:
+            log.info("Failed to read cached value for " + key, exc_info=ex)
+            return None
+
+        if time.time() - float(entry["stored_at"]) >= ttl:
+            return None
+        return entry["value"]
+
+    def set(self, key: str, value: Any) -> None:
+        path = self._get_path(key)
+        temp_path = path + "." + str(threading.get_ident()) + ".tmp"
+        with self._lock:
+            try:
+                with open(temp_path, "w") as f:
+                    json.dump({"key": key, "value": value, "stored_at": time.time()}, f)
+                os.replace(temp_path, path)
+            except Exception as ex:
+                log.info("Failed to cache value for " + key, exc_info=ex)
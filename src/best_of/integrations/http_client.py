@@ -0,0 +1,417 @@
+import importlib.util
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from urllib.parse import urlparse
+
+import httpx
+from addict import Dict
+
+from best_of import instrumentation
+from best_of.integrations import circuit_breaker, rate_limit
+from best_of.integrations.circuit_breaker import CircuitOpenError
+from best_of.integrations.http_cache import CachedResponse, ResponseCache, ValueCache
+from best_of.integrations.http_replay import CassetteStore, ReplayServer
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 4
+DEFAULT_TIMEOUT = 30
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_MAX_RETRIES = 3
+# Status codes of temporary server errors that are retried
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+
+_max_connections_per_host = DEFAULT_MAX_CONNECTIONS_PER_HOST
+_host_semaphores: dict = {}
+_host_semaphores_lock = threading.Lock()
+
+_timeout: float = DEFAULT_TIMEOUT
+_connect_timeout: float = DEFAULT_CONNECT_TIMEOUT
+_max_retries = DEFAULT_MAX_RETRIES
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+_response_cache: Optional[ResponseCache] = None
+_value_cache: Optional[ValueCache] = None
+# Record or replay all requests, e.g. to run the generator offline
+_recorder: Optional[CassetteStore] = None
+_replay_server: Optional[ReplayServer] = None
+
+
+def configure(config: Dict) -> None:
+    """Configures the shared HTTP layer based on the best-of configuration.
+
+    Args:
+        config (Dict): Best-of configuration.
+    """
+    global _response_cache, _value_cache, _timeout, _connect_timeout, _max_retries
+    global _recorder, _replay_server
+
+    set_max_connections_per_host(config.max_connections_per_host)
+    circuit_breaker.configure(
+        config.circuit_breaker_threshold, config.circuit_breaker_cooldown
+    )
+
+    _timeout = float(config.http_timeout)
+    _connect_timeout = min(_timeout, float(config.http_connect_timeout))
+    _max_retries = int(config.http_max_retries)
+    # The client is created again with the new settings
+    close()
+
+    _recorder = None
+    if _replay_server:
+        _replay_server.stop()
+        _replay_server = None
+
+    if config.http_replay_folder:
+        _replay_server = ReplayServer(
+            CassetteStore(config.http_replay_folder),
+            latency=float(config.http_replay_latency),
+            error_rate=float(config.http_replay_error_rate),
+        )
+        _replay_server.start()
+    elif config.http_record_folder:
+        log.info("Recording all responses to " + config.http_record_folder)
+        _recorder = CassetteStore(config.http_record_folder)
+
+    _response_cache = None
+    _value_cache = None
+    if _replay_server or _recorder:
+        # Every request needs to reach the (recorded) service
+        log.info("The HTTP response cache is disabled while recording or replaying.")
+    elif config.http_cache_folder:
+        _response_cache = ResponseCache(
+            config.http_cache_folder, int(config.http_cache_max_size) * 1024 * 1024
+        )
+        _value_cache = ValueCache(os.path.join(config.http_cache_folder, "values"))
+
+
+def set_max_connections_per_host(max_connections: int) -> None:
+    """Sets the maximum number of concurrent requests that are sent to the same host.
+
+    Args:
+        max_connections (int): Maximum number of concurrent requests per host.
+    """
+    global _max_connections_per_host
+
+    with _host_semaphores_lock:
+        _max_connections_per_host = max(1, int(max_connections))
+        # Semaphores are created lazily with the new limit
+        _host_semaphores.clear()
+
+
+def get_client() -> httpx.Client:
+    """Returns the HTTP client that is shared by all integrations.
+
+    The client keeps connections alive for every host and uses HTTP/2 if the
+    `h2` package is installed.
+    """
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(
+                http2=importlib.util.find_spec("h2") is not None,
+                timeout=httpx.Timeout(_timeout, connect=_connect_timeout),
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=50),
+                follow_redirects=True,
+            )
+        return _client
+
+
+def close() -> None:
+    """Closes the shared HTTP client and all open connections."""
+    global _client
+
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def get_host(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+def _get_host_semaphore(host: str) -> threading.BoundedSemaphore:
+    with _host_semaphores_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(
+                _max_connections_per_host
+            )
+        return _host_semaphores[host]
+
+
+@contextmanager
+def limit_host(host: str) -> Iterator[None]:
+    """Blocks until a request slot for the given host is available.
+
+    Can be used to limit requests that are sent by third-party libraries.
+
+    Args:
+        host (str): Hostname of the requested service.
+    """
+    semaphore = _get_host_semaphore(host.lower())
+    with semaphore:
+        yield
+
+
+def get_request_url(url: str) -> str:
+    """Returns the URL a request is actually sent to (the replay server if enabled)."""
+    return _replay_server.get_url(url) if _replay_server else url
+
+
+def _to_response(cached_response: CachedResponse) -> httpx.Response:
+    return httpx.Response(
+        200,
+        headers=cached_response.headers,
+        content=cached_response.content,
+        request=httpx.Request("GET", cached_response.url),
+    )
+
+
+def _to_stale_response(cached_response: CachedResponse) -> httpx.Response:
+    log.info("Using a stale cached response for " + cached_response.url)
+    instrumentation.record(cache_hits=1)
+    return _to_response(cached_response)
+
+
+def _send(
+    method: str,
+    url: str,
+    rate_limit_service: Optional[str] = None,
+    retry_rate_limited: bool = True,
+    **kwargs: Any,
+) -> httpx.Response:
+    client = get_client()
+    host = get_host(url)
+    service = rate_limit_service or host
+    retry = 0
+    while True:
+        if circuit_breaker.is_open(host):
+            raise CircuitOpenError(f"The circuit breaker of {host} is open.")
+
+        try:
+            instrumentation.record(sleep_time=rate_limit.acquire(service))
+            http_request = client.build_request(method, get_request_url(url), **kwargs)
+            with limit_host(get_host(url)):
+                response = client.send(http_request)
+            instrumentation.record(requests=1, bytes=len(response.content))
+            if response.status_code in RETRY_STATUS_CODES:
+                circuit_breaker.record_failure(host)
+            else:
+                circuit_breaker.record_success(host)
+
+            if _recorder:
+                _recorder.record(
+                    method,
+                    str(http_request.url),
+                    http_request.content,
+                    response.status_code,
+                    response.headers,
+                    response.content,
+                )
+
+            rate_limited = rate_limit.update_from_headers(
+                service, response.status_code, response.headers
+            )
+            if rate_limited and not retry_rate_limited:
+                return response
+            if retry >= _max_retries or (
+                not rate_limited and response.status_code not in RETRY_STATUS_CODES
+            ):
+                return response
+
+            log.info(
+                f"Request to {url} failed with status {response.status_code}. Retrying."
+            )
+            instrumentation.record(retries=1)
+            if rate_limited or "retry-after" in response.headers:
+                # The rate limiter waits as long as requested by the server
+                retry += 1
+                continue
+        except httpx.TransportError as ex:
+            instrumentation.record(requests=1)
+            circuit_breaker.record_failure(host)
+            if retry >= _max_retries:
+                raise
+            log.info(f"Request to {url} failed ({ex!r}). Retrying.")
+            instrumentation.record(retries=1)
+        # wait for an increasing time
+        time.sleep(2**retry)
+        instrumentation.record(sleep_time=2**retry)
+        retry += 1
+
+
+def request(
+    method: str,
+    url: str,
+    rate_limit_service: Optional[str] = None,
+    retry_rate_limited: bool = True,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Sends a request via the shared HTTP client.
+
+    Rate limits reported by the server (`Retry-After`, `X-RateLimit-*`) are respected,
+    and responses are cached if the response cache is configured. If the host is
+    unavailable (open circuit breaker, network or server errors), a stale cached
+    response is returned if available.
+
+    Args:
+        method (str): HTTP method.
+        url (str): Requested URL.
+        rate_limit_service (str, optional): Name of the rate limit the request counts
+            against. Defaults to the host of the URL.
+        retry_rate_limited (bool, optional): If `False`, requests rejected because of
+            a rate limit are returned instead of retried, e.g. to switch to another
+            API token. Defaults to `True`.
+        **kwargs: Additional arguments passed to `httpx.Client.build_request`.
+
+    Raises:
+        httpx.TransportError: If the request failed and no cached response is
+            available, e.g. `CircuitOpenError` if the circuit breaker is open.
+        rate_limit.DeadlineExceededError: If the request cannot be sent before the
+            deadline and no cached response is available.
+
+    Returns:
+        httpx.Response: The response.
+    """
+    cached_response = None
+    if _response_cache and method.upper() == "GET" and not kwargs.get("params"):
+        cached_response = _response_cache.get(url)
+
+    if cached_response:
+        if cached_response.is_fresh():
+            instrumentation.record(cache_hits=1)
+            return _to_response(cached_response)
+
+        # Only download the response again if it has changed
+        headers = dict(kwargs.get("headers") or {})
+        if cached_response.etag:
+            headers["If-None-Match"] = cached_response.etag
+        if cached_response.last_modified:
+            headers["If-Modified-Since"] = cached_response.last_modified
+        kwargs["headers"] = headers
+
+    try:
+        response = _send(method, url, rate_limit_service, retry_rate_limited, **kwargs)
+    except (httpx.TransportError, rate_limit.DeadlineExceededError):
+        if not cached_response:
+            raise
+        return _to_stale_response(cached_response)
+
+    if cached_response and response.status_code in RETRY_STATUS_CODES:
+        return _to_stale_response(cached_response)
+
+    if _response_cache and cached_response and response.status_code == 304:
+        _response_cache.revalidate(cached_response, response.headers)
+        instrumentation.record(cache_hits=1)
+        return _to_response(cached_response)
+
+    if (
+        _response_cache
+        and method.upper() == "GET"
+        and not kwargs.get("params")
+        and response.status_code == 200
+    ):
+        _response_cache.set(url, response.headers, response.content)
+
+    return response
+
+
+@contextmanager
+def stream(
+    method: str, url: str, rate_limit_service: Optional[str] = None, **kwargs: Any
+) -> Iterator[httpx.Response]:
+    """Sends a request via the shared HTTP client without reading the response body.
+
+    Allows to stop downloading large responses once the required data is found.
+    Streamed responses are neither cached nor retried.
+
+    Args:
+        method (str): HTTP method.
+        url (str): Requested URL.
+        rate_limit_service (str, optional): Name of the rate limit the request counts
+            against. Defaults to the host of the URL.
+        **kwargs: Additional arguments passed to `httpx.Client.build_request`.
+
+    Yields:
+        httpx.Response: The response with an unread body.
+    """
+    client = get_client()
+    host = get_host(url)
+    service = rate_limit_service or host
+    if circuit_breaker.is_open(host):
+        raise CircuitOpenError(f"The circuit breaker of {host} is open.")
+
+    instrumentation.record(sleep_time=rate_limit.acquire(service))
+    http_request = client.build_request(method, get_request_url(url), **kwargs)
+    with limit_host(host):
+        try:
+            response = client.send(http_request, stream=True)
+        except httpx.TransportError:
+            circuit_breaker.record_failure(host)
+            raise
+        instrumentation.record(requests=1)
+        if response.status_code in RETRY_STATUS_CODES:
+            circuit_breaker.record_failure(host)
+        else:
+            circuit_breaker.record_success(host)
+        try:
+            rate_limit.update_from_headers(
+                service, response.status_code, response.headers
+            )
+            if _recorder:
+                # The complete response is required to replay it
+                response.read()
+                _recorder.record(
+                    method,
+                    str(http_request.url),
+                    http_request.content,
+                    response.status_code,
+                    response.headers,
+                    response.content,
+                )
+            yield response
+        finally:
+            response.close()
+            instrumentation.record(bytes=response.num_bytes_downloaded)
+
+
+def is_value_cache_enabled() -> bool:
+    """Returns `True` if values can be cached via `set_cached_value`."""
+    return _value_cache is not None
+
+
+def get_cached_value(key: str, ttl: float, host: Optional[str] = None) -> Optional[Any]:
+    """Returns a value cached via `set_cached_value` if it is not older than `ttl`.
+
+    Args:
+        key (str): Key of the value.
+        ttl (float): Maximum age (in seconds) of the cached value.
+        host (str, optional): Host the value is requested from. If its circuit
+            breaker is open, older values are returned as well.
+    """
+    if not _value_cache:
+        return None
+    if host and circuit_breaker.is_open(host):
+        ttl = float("inf")
+    return _value_cache.get(key, ttl)
+
+
+def set_cached_value(key: str, value: Any) -> None:
+    """Caches a JSON-serializable value, if the HTTP cache is configured."""
+    if _value_cache:
+        _value_cache.set(key, value)
+
+
+def get(url: str, **kwargs: Any) -> httpx.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> httpx.Response:
+    return request("POST", url, **kwargs)
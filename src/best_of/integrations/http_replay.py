@@ -0,0 +1,232 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from addict import Dict
+
+from best_of.integrations.http_cache import IGNORED_HEADERS
+
+log = logging.getLogger(__name__)
+
+# Request bodies contain the current date (e.g. the start of the recent activity
+# in GraphQL queries), timestamps are ignored to match requests of different runs.
+TIMESTAMP_PATTERN = re.compile(rb"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?")
+
+# Query parameters with credentials are not stored in the recorded requests
+REDACTED_PARAMETERS = {"api_key"}
+
+
+def redact_url(url: str) -> str:
+    parsed_url = urlparse(url)
+    if not parsed_url.query:
+        return url
+    query = [
+        (name, "<redacted>" if name in REDACTED_PARAMETERS else value)
+        for name, value in parse_qsl(parsed_url.query, keep_blank_values=True)
+    ]
+    return parsed_url._replace(query=urlencode(query)).geturl()
+
+
+def get_request_key(method: str, url: str, body: bytes = b"") -> str:
+    """Returns the key of a request that is used to find the recorded response."""
+    normalized_body = TIMESTAMP_PATTERN.sub(b"<timestamp>", body or b"")
+    request_hash = hashlib.sha256()
+    request_hash.update(
+        method.upper().encode("utf-8") + b" " + redact_url(url).encode("utf-8")
+    )
+    request_hash.update(b"\n" + normalized_body)
+    return request_hash.hexdigest()
+
+
+class CassetteStore:
+    """Stores recorded HTTP interactions, one JSON file per request.
+
+    Args:
+        cassette_folder (str): Folder used to store the recorded interactions.
+    """
+
+    def __init__(self, cassette_folder: str):
+        self.cassette_folder = cassette_folder
+        os.makedirs(self.cassette_folder, exist_ok=True)
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.cassette_folder, key + ".json")
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        body: bytes,
+        status_code: int,
+        headers: dict,
+        content: bytes,
+    ) -> None:
+        key = get_request_key(method, url, body)
+        interaction = {
+            "request": {
+                "method": method.upper(),
+                "url": redact_url(url),
+                "body": (body or b"").decode("utf-8", errors="replace"),
+            },
+            "response": {
+                "status_code": status_code,
+                "headers": {
+                    name.lower(): value
+                    for name, value in headers.items()
+                    # The content is stored decoded
+                    if name.lower() not in IGNORED_HEADERS
+                },
+                "content": base64.b64encode(content).decode("ascii"),
+            },
+        }
+
+        path = self._get_path(key)
+        temp_path = path + "." + str(threading.get_ident()) + ".tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(interaction, f, indent=2)
+            os.replace(temp_path, path)
+        except Exception as ex:
+            log.info("Failed to record response for " + redact_url(url), exc_info=ex)
+
+    def load(self, method: str, url: str, body: bytes = b"") -> Optional[Dict]:
+        """Returns the recorded response of a request, or `None` if not recorded."""
+        path = self._get_path(get_request_key(method, url, body))
+        if not os.path.isfile(path):
+            return None
+
+        try:
+            with open(path, "r") as f:
+                response = Dict(json.load(f)).response
+            response.content = base64.b64decode(response.content)
+            return response
+        except Exception as ex:
+            log.info("Failed to load recorded response for " + url, exc_info=ex)
+            return None
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    # http.server.ThreadingHTTPServer is only available on Python 3.7+
+    daemon_threads = True
+
+
+class ReplayServer:
+    """Local HTTP server that replays recorded responses instead of the real services.
+
+    Requests are sent to `http://<server>/<scheme>/<host>/<path>`, see `get_url`.
+
+    Args:
+        cassette_store (CassetteStore): Store with the recorded responses.
+        latency (float, optional): Delay (in seconds) added to every response.
+        error_rate (float, optional): Fraction of requests that fail with `error_status`.
+        error_status (int, optional): Status code of the injected errors.
+        seed (int, optional): Seed for the error injection to get reproducible runs.
+    """
+
+    def __init__(
+        self,
+        cassette_store: CassetteStore,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+    ):
+        self.cassette_store = cassette_store
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._server: Optional[HTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> str:
+        if not self._server:
+            raise RuntimeError("The replay server is not started.")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def get_url(self, url: str) -> str:
+        """Rewrites the URL of a service to the replay server."""
+        parsed_url = urlparse(url)
+        return (
+            f"{self.address}/{parsed_url.scheme}/{parsed_url.netloc}{parsed_url.path}"
+            + ("?" + parsed_url.query if parsed_url.query else "")
+        )
+
+    def _inject_error(self) -> bool:
+        if self.error_rate <= 0:
+            return False
+        with self._random_lock:
+            return self._random.random() < self.error_rate
+
+    def _create_handler(self) -> type:
+        replay_server = self
+
+        class ReplayRequestHandler(BaseHTTPRequestHandler):
+            def _send(self, status_code: int, headers: dict, content: bytes) -> None:
+                self.send_response(status_code)
+                for name, value in headers.items():
+                    if name.lower() not in {"connection", "date", "server"}:
+                        self.send_header(name, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(content)
+
+            def _replay(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                # Restore the original URL: /<scheme>/<host>/<path>
+                scheme, _, original_path = self.path.lstrip("/").partition("/")
+                url = scheme + "://" + original_path
+
+                if replay_server.latency > 0:
+                    time.sleep(replay_server.latency)
+
+                if replay_server._inject_error():
+                    self._send(replay_server.error_status, {}, b"Injected error")
+                    return
+
+                response = replay_server.cassette_store.load(self.command, url, body)
+                if response is None:
+                    log.info(
+                        f"No recorded response for {self.command} {redact_url(url)}"
+                    )
+                    self._send(404, {}, b"No recorded response")
+                    return
+                self._send(response.status_code, response.headers, response.content)
+
+            do_GET = _replay
+            do_HEAD = _replay
+            do_POST = _replay
+
+            def log_message(self, format: str, *args: object) -> None:
+                # Requests are not logged to keep the output of the generator readable
+                pass
+
+        return ReplayRequestHandler
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Starts the server in a background thread (on a free port by default)."""
+        self._server = _ThreadingHTTPServer((host, port), self._create_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        log.info("Replaying recorded responses via " + self.address)
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
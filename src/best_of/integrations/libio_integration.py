@@ -1,19 +1,179 @@
 import logging
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
 from urllib.parse import quote, urlparse
 
 from addict import Dict
 from dateutil.parser import parse
 
+from best_of import instrumentation
 from best_of.default_config import ENV_LIBRARIES_API_KEY, MIN_PROJECT_DESC_LENGTH
+from best_of.integrations import http_client
+from best_of.integrations.http_cache import DAY
 
 log = logging.getLogger(__name__)
 
+LIBRARIES_IO_API = "https://libraries.io/api"
+# Time (in seconds) responses from libraries.io are reused from the cache
+LIBRARIES_IO_CACHE_TTL = DAY
+
+
+class LibrariesIOClient:
+    """Client for the libraries.io API that is shared by all integrations.
+
+    Requests are paced by the rate limiter to the documented limit of 60 requests
+    per minute. Concurrent and repeated requests for the same resource are only
+    sent once, and responses are cached on disk if the HTTP cache is configured.
+
+    Args:
+        api_key (str): Libraries.io API key.
+    """
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        # API path -> future with the response data of this run
+        self._requests: dict = {}
+        self._requests_lock = threading.Lock()
+
+    def _request(self, path: str) -> Optional[Any]:
+        cache_key = "libraries.io:" + path
+        cached_response = http_client.get_cached_value(
+            cache_key,
+            LIBRARIES_IO_CACHE_TTL,
+            host=http_client.get_host(LIBRARIES_IO_API),
+        )
+        if cached_response is not None:
+            return cached_response["data"]
+
+        # The key is passed as parameter to not store it in recorded requests
+        response = http_client.get(
+            LIBRARIES_IO_API + path, params={"api_key": self.api_key}
+        )
+        if response.status_code == 404:
+            data = None
+        else:
+            response.raise_for_status()
+            data = response.json()
+
+        http_client.set_cached_value(cache_key, {"data": data})
+        return data
+
+    @instrumentation.measured("libio")
+    def get(self, path: str) -> Optional[Any]:
+        """Requests a resource from the libraries.io API.
+
+        Args:
+            path (str): Path of the resource, relative to the API url.
+
+        Returns:
+            Optional[Any]: The response data, or `None` if the resource does not exist.
+        """
+        with self._requests_lock:
+            future = self._requests.get(path)
+            is_requesting = future is None
+            if is_requesting:
+                future = Future()
+                self._requests[path] = future
+
+        if not is_requesting:
+            # Wait for the request that is already running for the same resource
+            return future.result()
+
+        try:
+            data = self._request(path)
+        except Exception as ex:
+            with self._requests_lock:
+                # Failed requests can be tried again
+                del self._requests[path]
+            future.set_exception(ex)
+            raise
+        future.set_result(data)
+        return data
+
+    def project(self, platform: str, name: str) -> Optional[Any]:
+        return self.get(f"/{platform}/{quote(name, safe='')}")
+
+    def repository(self, owner: str, repo: str) -> Optional[Any]:
+        return self.get(f"/github/{owner}/{repo}")
+
+    def repository_projects(self, owner: str, repo: str) -> Optional[Any]:
+        return self.get(f"/github/{owner}/{repo}/projects?per_page=100")
+
+    def bulk(
+        self,
+        lookup: Callable[[Any], Optional[Any]],
+        items: Iterable[Any],
+        max_workers: int = 4,
+    ) -> Iterator[Tuple[Any, Optional[Any], Optional[BaseException]]]:
+        """Runs a lookup (e.g. `repository_projects`) for multiple items concurrently.
+
+        Args:
+            lookup (Callable[[Any], Optional[Any]]): Requests the data of a single item.
+            items (Iterable[Any]): Items to look up, duplicates are only looked up once.
+            max_workers (int, optional): Maximum number of concurrent lookups.
+
+        Yields:
+            Tuple[Any, Optional[Any], Optional[BaseException]]: The item, the looked up
+                data, and the exception if the lookup failed. The results are yielded
+                as they arrive.
+        """
+        lookup = instrumentation.bind_scope(lookup)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(lookup, item): item for item in dict.fromkeys(items)
+            }
+            for future in as_completed(futures):
+                exception = future.exception()
+                yield (
+                    futures[future],
+                    None if exception else future.result(),
+                    exception,
+                )
+
+
+_client: Optional[LibrariesIOClient] = None
+_client_lock = threading.Lock()
+
 
 def is_activated() -> bool:
     return os.getenv(ENV_LIBRARIES_API_KEY) is not None
 
 
+def get_client() -> LibrariesIOClient:
+    """Returns the libraries.io client that is shared by all integrations."""
+    global _client
+
+    with _client_lock:
+        api_key = os.getenv(ENV_LIBRARIES_API_KEY, "")
+        if _client is None or _client.api_key != api_key:
+            _client = LibrariesIOClient(api_key)
+        return _client
+
+
+@instrumentation.measured("libio")
+def request_package_via_libio(package_manager: str, package_id: str) -> Optional[Dict]:
+    """Requests the metadata of a package, or `None` if it is not available."""
+    try:
+        package_info = get_client().project(package_manager, package_id)
+    except Exception as ex:
+        log.info(
+            "Unable to request "
+            + package_manager
+            + " info from libraries.io: "
+            + package_id,
+            exc_info=ex,
+        )
+        return None
+
+    if not package_info:
+        log.info("Unable to find " + package_manager + " package: " + package_id)
+        return None
+    return Dict(package_info)
+
+
+@instrumentation.measured("libio")
 def update_package_via_libio(
     package_manager: str, project_info: Dict, package_info: Dict = None
 ) -> None:
@@ -21,33 +181,10 @@ def update_package_via_libio(
         return
 
     if not package_info:
-        package_id = package_manager + "_id"
-        try:
-            from pybraries.search import Search
-
-            search = Search()
-            package_info = search.project(
-                platforms=package_manager, name=quote(project_info[package_id], safe="")
-            )
-
-            if not package_info:
-                log.info(
-                    "Unable to find "
-                    + package_manager
-                    + " package: "
-                    + project_info[package_id]
-                )
-                return
-
-            package_info = Dict(package_info)
-        except Exception as ex:
-            log.info(
-                "Unable to request "
-                + package_manager
-                + " info from libraries.io: "
-                + project_info[package_id],
-                exc_info=ex,
-            )
+        package_info = request_package_via_libio(
+            package_manager, project_info[package_manager + "_id"]
+        )
+        if not package_info:
             return
 
     if not project_info.homepage:
@@ -211,6 +348,7 @@ def update_package_via_libio(
         project_info.description = package_info.description
 
 
+@instrumentation.measured("libio")
 def update_repo_via_libio(project_info: Dict) -> None:
     if not project_info.github_id:
         return
@@ -227,10 +365,7 @@ def update_repo_via_libio(project_info: Dict) -> None:
     repo = project_info.github_id.split("/")[1]
 
     try:
-        from pybraries.search import Search
-
-        search = Search()
-        github_info = search.repository(host="github", owner=owner, repo=repo)
+        github_info = get_client().repository(owner, repo)
 
         if not github_info:
             log.info(
@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 
 from addict import Dict
 
@@ -15,6 +16,18 @@ class MavenIntegration(BaseIntegration):
         return "maven"
 
     def update_project_info(self, project_info: Dict) -> None:
+        self.apply_project_info(project_info, self.fetch_project_info(project_info))
+
+    def fetch_project_info(self, project_info: Dict) -> Optional[Dict]:
+        if not project_info.maven_id or not libio_integration.is_activated():
+            return None
+        return libio_integration.request_package_via_libio(
+            "maven", project_info.maven_id
+        )
+
+    def apply_project_info(
+        self, project_info: Dict, package_info: Optional[Dict]
+    ) -> None:
         if not project_info.maven_id:
             return
 
@@ -24,8 +37,10 @@ class MavenIntegration(BaseIntegration):
                 + project_info.maven_id.replace(":", "/")
             )
 
-        if libio_integration.is_activated():
-            libio_integration.update_package_via_libio("maven", project_info)
+        if package_info:
+            libio_integration.update_package_via_libio(
+                "maven", project_info, package_info
+            )
 
     def generate_md_details(self, project: Dict, configuration: Dict) -> str:
         maven_id = project.maven_id
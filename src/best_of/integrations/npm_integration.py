@@ -1,22 +1,193 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
 from urllib.parse import quote
 
-import requests
 from addict import Dict
 
-from best_of import utils
-from best_of.integrations import libio_integration
+from best_of import instrumentation, utils
+from best_of.integrations import http_client, libio_integration
 from best_of.integrations.base_integration import BaseIntegration
 
 log = logging.getLogger(__name__)
 
 
+# Maximum number of packages per bulk request, only supported for unscoped packages:
+# https://github.com/npm/registry/blob/master/docs/download-counts.md#bulk-queries
+NPM_BULK_SIZE = 128
+
+# Monthly downloads that were fetched in advance via bulk requests
+_prefetched_downloads: dict = {}
+
+# Marks packages that are known to not exist, as opposed to failed requests
+PACKAGE_MISSING = object()
+
+
+@instrumentation.measured("npm")
+def request_monthly_downloads(npm_id: str) -> Any:
+    """Requests the monthly downloads of a single package.
+
+    Returns:
+        Any: The monthly downloads, `PACKAGE_MISSING` if the package was not found,
+            or `None` if the request failed.
+    """
+    try:
+        request = http_client.get(
+            "https://api.npmjs.org/downloads/point/last-month/" + quote(npm_id, safe="")
+        )
+        if request.status_code == 404:
+            log.info("Unable to find package via npm api: " + npm_id)
+            return PACKAGE_MISSING
+        if request.status_code != 200:
+            log.info(
+                "Unable to request package via npm api: "
+                + npm_id
+                + " ("
+                + str(request.status_code)
+                + ")"
+            )
+            return None
+        npm_download_info = Dict(request.json())
+        return int(npm_download_info.downloads or 0)
+    except Exception as ex:
+        log.info("Failed to request package via npm api: " + npm_id, exc_info=ex)
+        return None
+
+
+@instrumentation.measured("npm")
+def request_bulk_monthly_downloads(npm_ids: List[str]) -> dict:
+    """Requests the monthly downloads of multiple unscoped packages at once.
+
+    Args:
+        npm_ids (List[str]): Names of the npm packages (at most `NPM_BULK_SIZE`).
+
+    Returns:
+        dict: The monthly downloads by package, `PACKAGE_MISSING` if the package was
+            not found. Packages are left out if the request failed.
+    """
+    if len(npm_ids) == 1:
+        # Single packages are returned in a different format
+        monthly_downloads = request_monthly_downloads(npm_ids[0])
+        return {} if monthly_downloads is None else {npm_ids[0]: monthly_downloads}
+
+    try:
+        request = http_client.get(
+            "https://api.npmjs.org/downloads/point/last-month/"
+            + ",".join(quote(npm_id, safe="") for npm_id in npm_ids)
+        )
+        if request.status_code != 200:
+            log.info(
+                f"Unable to request {len(npm_ids)} packages via npm api ({request.status_code})"
+            )
+            return {}
+        download_infos = request.json()
+        return {
+            npm_id: (
+                int(download_infos[npm_id].get("downloads") or 0)
+                if download_infos.get(npm_id)
+                else PACKAGE_MISSING
+            )
+            for npm_id in npm_ids
+        }
+    except Exception as ex:
+        log.info(f"Failed to request {len(npm_ids)} packages via npm api", exc_info=ex)
+        return {}
+
+
+def prefetch_monthly_downloads(npm_ids: List[str], max_workers: int) -> None:
+    """Requests the monthly downloads of all packages in advance.
+
+    Unscoped packages are requested via bulk requests, scoped packages
+    (`@scope/name`) are not supported by the bulk api and requested concurrently.
+
+    Args:
+        npm_ids (List[str]): Names of the npm packages.
+        max_workers (int): Maximum number of concurrent requests.
+    """
+    _prefetched_downloads.clear()
+
+    npm_ids = list(dict.fromkeys(npm_id for npm_id in npm_ids if npm_id))
+    if not npm_ids:
+        return
+
+    unscoped_ids = [npm_id for npm_id in npm_ids if not npm_id.startswith("@")]
+    scoped_ids = [npm_id for npm_id in npm_ids if npm_id.startswith("@")]
+
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as executor:
+        bulk_futures = [
+            executor.submit(
+                instrumentation.bind_scope(request_bulk_monthly_downloads),
+                unscoped_ids[i : i + NPM_BULK_SIZE],
+            )
+            for i in range(0, len(unscoped_ids), NPM_BULK_SIZE)
+        ]
+        single_futures = {
+            executor.submit(
+                instrumentation.bind_scope(request_monthly_downloads), npm_id
+            ): npm_id
+            for npm_id in scoped_ids
+        }
+
+        for bulk_future in bulk_futures:
+            _prefetched_downloads.update(bulk_future.result())
+        for single_future, npm_id in single_futures.items():
+            monthly_downloads = single_future.result()
+            if monthly_downloads is not None:
+                _prefetched_downloads[npm_id] = monthly_downloads
+
+
+def get_monthly_downloads(npm_id: str) -> Optional[int]:
+    """Returns the prefetched monthly downloads of a package or requests them."""
+    if npm_id in _prefetched_downloads:
+        monthly_downloads = _prefetched_downloads[npm_id]
+    else:
+        monthly_downloads = request_monthly_downloads(npm_id)
+    return None if monthly_downloads is PACKAGE_MISSING else monthly_downloads
+
+
+def package_exists(npm_id: str) -> Optional[bool]:
+    """Checks via the prefetched downloads if a package exists.
+
+    Returns:
+        Optional[bool]: If the package exists, or `None` if it was not prefetched
+            (e.g. because the request failed).
+    """
+    if npm_id not in _prefetched_downloads:
+        return None
+    return _prefetched_downloads[npm_id] is not PACKAGE_MISSING
+
+
 class NpmIntegration(BaseIntegration):
     @property
     def name(self) -> str:
         return "npm"
 
+    def prefetch_projects_info(self, projects: List[Dict], configuration: Dict) -> None:
+        prefetch_monthly_downloads(
+            [project.npm_id for project in projects if project.npm_id],
+            max_workers=int(configuration.max_connections_per_host),
+        )
+
     def update_project_info(self, project_info: Dict) -> None:
+        self.apply_project_info(project_info, self.fetch_project_info(project_info))
+
+    def fetch_project_info(self, project_info: Dict) -> Optional[Dict]:
+        if not project_info.npm_id:
+            return None
+
+        fetched_info = Dict()
+        if libio_integration.is_activated():
+            fetched_info.package_info = libio_integration.request_package_via_libio(
+                "npm", project_info.npm_id
+            )
+
+        # Get monthly downloads
+        fetched_info.monthly_downloads = get_monthly_downloads(project_info.npm_id)
+        return fetched_info
+
+    def apply_project_info(
+        self, project_info: Dict, fetched_info: Optional[Dict]
+    ) -> None:
         if not project_info.npm_id:
             return
 
@@ -25,40 +196,22 @@ class NpmIntegration(BaseIntegration):
                 "https://www.npmjs.com/package/" + project_info.npm_id
             )
 
-        if libio_integration.is_activated():
-            libio_integration.update_package_via_libio("npm", project_info)
+        if not fetched_info:
+            return
 
-        # Get monthly downloads
-        try:
-            request = requests.get(
-                "https://api.npmjs.org/downloads/point/last-month/"
-                + quote(project_info.npm_id, safe="")
+        if fetched_info.package_info:
+            libio_integration.update_package_via_libio(
+                "npm", project_info, fetched_info.package_info
             )
-            request.text
-            if request.status_code != 200:
-                log.info(
-                    "Unable to find package via npm api: "
-                    + project_info.npm_id
-                    + " ("
-                    + str(request.status_code)
-                    + ")"
-                )
-                return
-            npm_download_info = Dict(request.json())
-            if npm_download_info.downloads:
-                project_info.npm_monthly_downloads = int(npm_download_info.downloads)
-
-                if not project_info.monthly_downloads:
-                    project_info.monthly_downloads = 0
-
-                project_info.monthly_downloads += project_info.npm_monthly_downloads
-
-        except Exception as ex:
-            log.info(
-                "Failed to request package via npm api: " + project_info.npm_id,
-                exc_info=ex,
-            )
-            return
+
+        monthly_downloads = fetched_info.monthly_downloads
+        if monthly_downloads:
+            project_info.npm_monthly_downloads = monthly_downloads
+
+            if not project_info.monthly_downloads:
+                project_info.monthly_downloads = 0
+
+            project_info.monthly_downloads += project_info.npm_monthly_downloads
 
         # TODO use npms-api to get additional details:
         # https://api-docs.npms.io/#api-Package-GetMultiPackageInfo
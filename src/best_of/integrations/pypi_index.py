@@ -0,0 +1,131 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from best_of import instrumentation, utils
+from best_of.integrations import http_client
+from best_of.integrations.http_cache import DAY
+
+log = logging.getLogger(__name__)
+
+# The local index is downloaded again if it is older than a day
+PYPI_INDEX_MAX_AGE = DAY
+PYPI_SIMPLE_INDEX = "https://pypi.org/simple/"
+# JSON format of the simple index: https://peps.python.org/pep-0691/
+PYPI_SIMPLE_JSON = "application/vnd.pypi.simple.v1+json"
+
+_enabled = False
+_index_folder: Optional[str] = None
+_index: Optional[set] = None
+_index_loaded = False
+_index_lock = threading.Lock()
+
+
+def configure(enabled: bool, index_folder: Optional[str] = None) -> None:
+    """Configures the local index of all PyPI project names.
+
+    Args:
+        enabled (bool): If `True`, the existence of PyPI projects is checked via the
+            local index.
+        index_folder (str, optional): Folder used to store the index. If `None`, the
+            index is only kept in memory.
+    """
+    global _enabled, _index_folder, _index, _index_loaded
+
+    with _index_lock:
+        _enabled = enabled
+        _index_folder = index_folder
+        _index = None
+        _index_loaded = False
+
+
+def _get_index_path() -> Optional[str]:
+    if not _index_folder:
+        return None
+    return os.path.join(_index_folder, "pypi-index.txt")
+
+
+def _download_index() -> set:
+    with http_client.stream(
+        "GET", PYPI_SIMPLE_INDEX, headers={"Accept": PYPI_SIMPLE_JSON}
+    ) as response:
+        response.raise_for_status()
+        simple_index = json.loads(response.read())
+
+    # Names in the simple index are not normalized
+    return {
+        utils.normalize_pypi_name(project["name"])
+        for project in simple_index.get("projects", [])
+    }
+
+
+@instrumentation.measured("pypi")
+def _load_index(refresh: bool) -> Optional[set]:
+    index_path = _get_index_path()
+    if (
+        not refresh
+        and index_path
+        and os.path.isfile(index_path)
+        and time.time() - os.path.getmtime(index_path) < PYPI_INDEX_MAX_AGE
+    ):
+        try:
+            with open(index_path, "r") as f:
+                return set(f.read().splitlines())
+        except Exception as ex:
+            log.info("Failed to load PyPI index: " + index_path, exc_info=ex)
+
+    log.info("Downloading index of all PyPI projects.")
+    try:
+        index = _download_index()
+    except Exception as ex:
+        log.info("Failed to download the PyPI index.", exc_info=ex)
+        return None
+
+    if index_path:
+        try:
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            temp_path = index_path + "." + str(threading.get_ident()) + ".tmp"
+            with open(temp_path, "w") as f:
+                f.write("\n".join(sorted(index)))
+            os.replace(temp_path, index_path)
+        except Exception as ex:
+            log.info("Failed to store PyPI index: " + index_path, exc_info=ex)
+    return index
+
+
+def get_index(refresh: bool = False) -> Optional[set]:
+    """Returns the normalized names of all PyPI projects, or `None` if not enabled.
+
+    Args:
+        refresh (bool, optional): Download the index again, even if the local index
+            is up to date.
+    """
+    global _index, _index_loaded
+
+    if not _enabled:
+        return None
+
+    # The lock is held during the download, so that the index is only loaded once
+    with _index_lock:
+        if refresh or not _index_loaded:
+            _index = _load_index(refresh)
+            _index_loaded = True
+        return _index
+
+
+def package_exists(pypi_id: str) -> Optional[bool]:
+    """Checks via the local index if a PyPI project exists.
+
+    Args:
+        pypi_id (str): Name of the PyPI project (not necessarily normalized).
+
+    Returns:
+        Optional[bool]: If the project exists, or `None` if the index is not available.
+    """
+    index = get_index()
+    if index is None:
+        return None
+    return utils.normalize_pypi_name(pypi_id) in index
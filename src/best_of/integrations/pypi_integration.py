@@ -1,35 +1,87 @@
-import json
 import logging
-import time
+from typing import List, Optional
 
-import pypistats
 from addict import Dict
-from httpx import HTTPStatusError
-from requests.exceptions import HTTPError
 
 from best_of import utils
-from best_of.integrations import libio_integration
+from best_of.integrations import (
+    download_stats,
+    http_client,
+    libio_integration,
+    pypi_index,
+)
 from best_of.integrations.base_integration import BaseIntegration
 
 log = logging.getLogger(__name__)
 
 
+def package_exists(pypi_id: str) -> Optional[bool]:
+    """Checks if a package exists, via the local PyPI index if it is enabled.
+
+    Otherwise, the package is requested from the simple index of PyPI.
+
+    Returns:
+        Optional[bool]: If the package exists, or `None` if the request failed.
+    """
+    indexed = pypi_index.package_exists(pypi_id)
+    if indexed is not None:
+        return indexed
+
+    try:
+        response = http_client.request(
+            "HEAD", f"https://pypi.org/simple/{utils.normalize_pypi_name(pypi_id)}/"
+        )
+    except Exception as ex:
+        log.info("Failed to request package via pypi: " + pypi_id, exc_info=ex)
+        return None
+
+    if response.status_code == 404:
+        return False
+    if response.status_code != 200:
+        return None
+    return True
+
+
 class PypiIntegration(BaseIntegration):
     @property
     def name(self) -> str:
         return "pypi"
 
     def update_project_info(self, project_info: Dict) -> None:
+        self.apply_project_info(project_info, self.fetch_project_info(project_info))
+
+    def fetch_project_info(self, project_info: Dict) -> Optional[Dict]:
+        if not project_info.pypi_id:
+            return None
+
+        fetched_info = Dict()
+        if libio_integration.is_activated():
+            fetched_info.package_info = libio_integration.request_package_via_libio(
+                "pypi", project_info.pypi_id
+            )
+        fetched_info.monthly_downloads = download_stats.get_monthly_downloads(
+            project_info.pypi_id
+        )
+        return fetched_info
+
+    def apply_project_info(
+        self, project_info: Dict, fetched_info: Optional[Dict]
+    ) -> None:
         if not project_info.pypi_id:
             return
 
         if not project_info.pypi_url:
             project_info.pypi_url = "https://pypi.org/project/" + project_info.pypi_id
 
-        if libio_integration.is_activated():
-            libio_integration.update_package_via_libio("pypi", project_info)
+        if not fetched_info:
+            return
+
+        if fetched_info.package_info:
+            libio_integration.update_package_via_libio(
+                "pypi", project_info, fetched_info.package_info
+            )
 
-        self.update_via_pypistats(project_info)
+        self.update_download_stats(project_info, fetched_info.monthly_downloads)
 
     def generate_md_details(self, project: Dict, configuration: Dict) -> str:
         pypi_id = project.pypi_id
@@ -83,51 +135,21 @@ class PypiIntegration(BaseIntegration):
             details_md += "\t```\n\tpip install {pypi_id}\n\t```\n"
         return details_md.format(pypi_id=pypi_id)
 
-    def update_via_pypistats(self, project_info: Dict) -> None:
-        # pypi stats limit is 30 per minute: https://github.com/crflynn/pypistats.org/issues/28#issuecomment-598417650
-        # So, we try 10 times
-        MAX_TRIES = 10
-        for i in range(1, MAX_TRIES):
-            try:
-                # get download count from pypi stats
-                project_info.pypi_monthly_downloads = int(
-                    json.loads(
-                        pypistats.recent(project_info.pypi_id, "month", format="json")
-                    )["data"]["last_month"]
-                )
-
-                # TODO use pepy api as fallback: https://api.pepy.tech/api/projects/lazydocs
-
-                if not project_info.monthly_downloads:
-                    project_info.monthly_downloads = 0
-
-                project_info.monthly_downloads += int(
-                    project_info.pypi_monthly_downloads
-                )
-                return
-            except (HTTPError, HTTPStatusError) as ex:
-                if ex.response.status_code == 429:
-                    sleep_time = 2 * i
-                    log.info(
-                        f"Too many requests to pypistats (429). Sleep for {sleep_time} seconds and try again."
-                    )
-                    # wait for an increasing time
-                    time.sleep(sleep_time)
-                    continue
-                else:
-                    log.info(
-                        f"Unable to request statistics from pypi: {project_info.pypi_id} ({ex.response.status_code})"
-                    )
-                    return
-            except Exception as ex:
-                log.warning(
-                    "Unable to request statistics from pypi (unexpected exception): "
-                    + project_info.pypi_id,
-                    exc_info=ex,
-                )
-                return
-
-        log.warning(
-            f"Unable to request statistics from pypi after {MAX_TRIES} tries: "
-            + project_info.pypi_id
+    def prefetch_projects_info(self, projects: List[Dict], configuration: Dict) -> None:
+        download_stats.prefetch_monthly_downloads(
+            [project.pypi_id for project in projects if project.pypi_id],
+            max_workers=int(configuration.max_connections_per_host),
         )
+
+    def update_download_stats(
+        self, project_info: Dict, monthly_downloads: Optional[int]
+    ) -> None:
+        if monthly_downloads is None:
+            return
+
+        project_info.pypi_monthly_downloads = monthly_downloads
+
+        if not project_info.monthly_downloads:
+            project_info.monthly_downloads = 0
+
+        project_info.monthly_downloads += int(project_info.pypi_monthly_downloads)
@@ -0,0 +1,283 @@
+import logging
+import threading
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, List, Optional
+
+from dateutil.parser import isoparse
+
+log = logging.getLogger(__name__)
+
+# Documented request limits per service: (number of requests, period in seconds)
+DEFAULT_RATE_LIMITS = {
+    # https://github.com/crflynn/pypistats.org/issues/28#issuecomment-598417650
+    "pypistats.org": (30, 60),
+    # https://libraries.io/api#rate-limit
+    "libraries.io": (60, 60),
+}
+
+# Share of the documented limit that can be sent at once, the remaining requests
+# are paced evenly over the period
+BURST_SHARE = 0.1
+
+# Only log waiting times above this threshold (in seconds)
+LOG_WAIT_THRESHOLD = 5
+
+_rate_limits: dict = {}
+_rate_limits_lock = threading.Lock()
+# Monotonic time after which no more requests are sent (e.g. end of the time budget)
+_deadline: Optional[float] = None
+
+
+class DeadlineExceededError(Exception):
+    """Raised if a request cannot be sent before the deadline."""
+
+
+def set_deadline(deadline: Optional[float]) -> None:
+    """Sets the monotonic time after which requests are rejected instead of sent.
+
+    Args:
+        deadline (float, optional): Value of `time.monotonic()` at the deadline. If
+            `None`, the deadline is removed.
+    """
+    global _deadline
+    _deadline = deadline
+
+
+class TokenBucket:
+    """Paces requests to a fixed rate while allowing short bursts.
+
+    Args:
+        rate (float): Number of tokens that are added per second.
+        capacity (float): Maximum number of tokens (burst size).
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def get_wait_time(self) -> float:
+        """Returns the time (in seconds) until a token is available, without taking it."""
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def reserve(self) -> float:
+        """Takes a token from the bucket.
+
+        Returns:
+            float: The time (in seconds) to wait until the token is available.
+        """
+        self._refill()
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+    def drain(self) -> None:
+        """Removes all available tokens, e.g. after the server rejected a request."""
+        self.tokens = min(self.tokens, 0.0)
+        self.updated_at = time.monotonic()
+
+
+class RateLimit:
+    """Rate limit of a single service.
+
+    Combines an optional token bucket for documented limits with the quota
+    information reported by the server.
+    """
+
+    def __init__(self, requests: Optional[int] = None, period: float = 60):
+        self.bucket = None
+        if requests:
+            # The burst and the paced requests together stay within the limit in
+            # every period, including the first one
+            burst_size = max(1, int(requests * BURST_SHARE))
+            self.bucket = TokenBucket(
+                max(1, requests - burst_size) / period, burst_size
+            )
+        # Unix timestamp until no request should be sent to the service
+        self.blocked_until = 0.0
+        self.remaining: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Blocks until the next request can be sent to the service.
+
+        Returns:
+            float: The time (in seconds) that was waited.
+
+        Raises:
+            DeadlineExceededError: If the request cannot be sent before the deadline.
+        """
+        with self._lock:
+            wait_time = self.bucket.get_wait_time() if self.bucket else 0.0
+            wait_time = max(wait_time, self.blocked_until - time.time())
+
+            if _deadline is not None and time.monotonic() + wait_time > _deadline:
+                # Do not wait for the rate limit beyond the deadline, the token is
+                # left for requests that can still be sent
+                raise DeadlineExceededError(
+                    f"The request cannot be sent within the deadline (rate limit: {int(wait_time)} seconds)."
+                )
+
+            if self.bucket:
+                wait_time = max(wait_time, self.bucket.reserve())
+
+        if wait_time > 0:
+            if wait_time > LOG_WAIT_THRESHOLD:
+                log.info(f"Rate limit reached. Wait for {int(wait_time)} seconds.")
+            time.sleep(wait_time)
+            return wait_time
+        return 0.0
+
+    def block_until(self, timestamp: float) -> None:
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, timestamp)
+            if self.bucket:
+                self.bucket.drain()
+
+    def update_quota(self, remaining: int, reset_at: Optional[float]) -> None:
+        with self._lock:
+            self.remaining = remaining
+        if remaining <= 0 and reset_at:
+            self.block_until(reset_at)
+
+
+def get_rate_limit(service: str) -> RateLimit:
+    with _rate_limits_lock:
+        if service not in _rate_limits:
+            _rate_limits[service] = RateLimit(*DEFAULT_RATE_LIMITS.get(service, ()))
+        return _rate_limits[service]
+
+
+def acquire(service: str) -> float:
+    """Blocks until the next request can be sent to the given service.
+
+    Args:
+        service (str): Name of the service (e.g. the host).
+
+    Returns:
+        float: The time (in seconds) that was waited.
+    """
+    return get_rate_limit(service).acquire()
+
+
+def is_blocked(service: str) -> bool:
+    """Returns `True`, if no request can be sent to the service without waiting."""
+    return get_rate_limit(service).blocked_until > time.time()
+
+
+def select_service(services: List[str]) -> str:
+    """Selects the service with the most remaining quota.
+
+    Services that are blocked are only selected if all services are blocked. In this
+    case, the service that is available again first is returned.
+
+    Args:
+        services (List[str]): Names of interchangeable services (e.g. one per token).
+
+    Returns:
+        str: Name of the selected service.
+    """
+
+    def get_priority(service: str) -> tuple:
+        rate_limit = get_rate_limit(service)
+        if is_blocked(service):
+            return (1, rate_limit.blocked_until, 0)
+        # Services without quota information have not been used yet
+        remaining = rate_limit.remaining
+        return (0, 0, -remaining if remaining is not None else -float("inf"))
+
+    return min(services, key=get_priority)
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """Parses a reset time as unix timestamp, from epoch seconds or ISO 8601 dates."""
+    if value is None or value == "":
+        return None
+
+    try:
+        timestamp = float(value)
+        if timestamp < 1e9:
+            # Delta in seconds
+            timestamp += time.time()
+        return timestamp
+    except ValueError:
+        pass
+
+    try:
+        reset_at = isoparse(str(value))
+        if reset_at.tzinfo is None:
+            reset_at = reset_at.replace(tzinfo=timezone.utc)
+        return reset_at.timestamp()
+    except ValueError:
+        return None
+
+
+def get_retry_after(headers: Any) -> Optional[float]:
+    """Returns the `Retry-After` header as delay in seconds."""
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def update_from_headers(service: str, status_code: int, headers: Any) -> bool:
+    """Updates the quota of a service based on the rate limit headers of a response.
+
+    Args:
+        service (str): Name of the service (e.g. the host).
+        status_code (int): Status code of the response.
+        headers (Any): Headers of the response.
+
+    Returns:
+        bool: `True`, if the request was rejected because of a rate limit.
+    """
+    rate_limit = get_rate_limit(service)
+
+    remaining = headers.get("x-ratelimit-remaining")
+    if remaining is not None and str(remaining).isdigit():
+        rate_limit.update_quota(
+            int(remaining), parse_timestamp(headers.get("x-ratelimit-reset"))
+        )
+
+    retry_after = get_retry_after(headers)
+    rate_limited = status_code == 429 or (
+        status_code == 403 and (retry_after is not None or remaining == "0")
+    )
+
+    if retry_after is not None and (rate_limited or status_code == 503):
+        rate_limit.block_until(time.time() + retry_after)
+    elif rate_limited and rate_limit.blocked_until <= time.time():
+        # The server did not tell us how long to wait
+        rate_limit.block_until(time.time() + 1)
+
+    return rate_limited
+
+
+def update_quota(service: str, remaining: int, reset_at: Any) -> None:
+    """Updates the quota of a service based on quota information in a response body.
+
+    Args:
+        service (str): Name of the service.
+        remaining (int): Number of remaining requests or points.
+        reset_at (Any): Time the quota is reset (unix timestamp or ISO 8601 date).
+    """
+    get_rate_limit(service).update_quota(int(remaining), parse_timestamp(reset_at))
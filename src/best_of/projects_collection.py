@@ -1,17 +1,29 @@
+import glob
+import json
 import logging
 import math
+import os
 import re
+import threading
+import time
 from collections import OrderedDict
-from datetime import datetime
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Any, List, Optional, TextIO, Tuple
 
 import numpy as np
 import pandas as pd
 from addict import Dict
+from dateutil.parser import parse
 from tqdm import tqdm
 
-from best_of import default_config, integrations, utils
-from best_of.integrations import github_integration
+from best_of import default_config, instrumentation, integrations, utils
+from best_of.integrations import (
+    conda_index,
+    github_integration,
+    http_client,
+    rate_limit,
+)
 from best_of.license import get_license
 
 log = logging.getLogger(__name__)
@@ -21,9 +33,29 @@ SEMVER_VALIDATION = re.compile(
     r"^(?P<major>0|[1-9]\d*)\.(?P<minor>0|[1-9]\d*)\.(?P<patch>0|[1-9]\d*)(?:-(?P<prerelease>(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
 )
 
-
-def calc_projectrank(project_info: Dict) -> int:
+# Projects with a projectrank close to a placing threshold are collected early
+# in time-budgeted runs, since their placing is most likely to change
+PLACING_THRESHOLD_MARGIN = 2
+# Number of projects that are prefetched together in time-budgeted collections
+COLLECTION_CHUNK_SIZE = 50
+
+# Values that are calculated again for projects restored from the history. The
+# projectrank is kept, since it might be based on the rank from libraries.io.
+RECALCULATED_KEYS = {
+    "projectrank_placing",
+    "show",
+    "trending",
+    "new_addition",
+    "projects",
+}
+
+
+def calc_projectrank(
+    project_info: Dict, reference_date: Optional[datetime] = None
+) -> int:
     projectrank = 0
+    if not reference_date:
+        reference_date = datetime.now()
 
     if project_info.resource:
         return 0
@@ -66,7 +98,7 @@ def calc_projectrank(project_info: Dict) -> int:
     # Recent release? within 6 month
     if project_info.latest_stable_release_published_at:
         month_since_latest_release = utils.diff_month(
-            datetime.now(), project_info.latest_stable_release_published_at
+            reference_date, project_info.latest_stable_release_published_at
         )
         if month_since_latest_release < 6:
             projectrank += 1
@@ -74,14 +106,14 @@ def calc_projectrank(project_info: Dict) -> int:
     # Custom addition: Check if repo was updated within the last 3 month
     if project_info.updated_at:
         project_inactive_month = utils.diff_month(
-            datetime.now(), project_info.updated_at
+            reference_date, project_info.updated_at
         )
         if project_inactive_month < 3:
             projectrank += 1
 
     # Not brand new?
     if project_info.created_at:
-        project_age = utils.diff_month(datetime.now(), project_info.created_at)
+        project_age = utils.diff_month(reference_date, project_info.created_at)
         if project_age >= 6:
             projectrank += 1
 
@@ -144,7 +176,8 @@ def calc_projectrank(project_info: Dict) -> int:
     return projectrank
 
 
-def calc_projectrank_placing(projects: list) -> None:
+def get_placing_thresholds(projects: list) -> dict:
+    """Returns the minimal projectrank of the first and second placing per category."""
     projectrank_placing: dict = {}
     # Collet all projectranks
     for project in projects:
@@ -157,6 +190,19 @@ def calc_projectrank_placing(projects: list) -> None:
 
         projectrank_placing[project.category].append(int(project.projectrank))
 
+    placing_thresholds = {}
+    for category, projectranks in projectrank_placing.items():
+        sorted_projectranks = np.sort(np.array(projectranks))[::-1]
+        placing_thresholds[category] = (
+            np.percentile(sorted_projectranks, 90),
+            np.percentile(sorted_projectranks, 60),
+        )
+    return placing_thresholds
+
+
+def calc_projectrank_placing(projects: list) -> None:
+    placing_thresholds = get_placing_thresholds(projects)
+
     # Calculate projectrank placing
     for project in projects:
         if "resource" in project and project["resource"]:
@@ -169,13 +215,8 @@ def calc_projectrank_placing(projects: list) -> None:
             continue
 
         category = project["category"]
-        if category in projectrank_placing:
-            placing_1 = np.percentile(
-                np.sort(np.array(projectrank_placing[category]))[::-1], 90
-            )
-            placing_2 = np.percentile(
-                np.sort(np.array(projectrank_placing[category]))[::-1], 60
-            )
+        if category in placing_thresholds:
+            placing_1, placing_2 = placing_thresholds[category]
 
             if project["projectrank"] >= placing_1:
                 project["projectrank_placing"] = 1
@@ -261,6 +302,158 @@ def update_project_category(project_info: Dict, categories: OrderedDict) -> None
         project_info.category = default_config.DEFAULT_OTHERS_CATEGORY_ID
 
 
+def get_latest_history_file(
+    history_folder: str, before: Optional[str] = None
+) -> Optional[str]:
+    """Returns the most recent history file, optionally the one before the given file."""
+    history_files = glob.glob(os.path.join(history_folder, "*_projects.csv"))
+    if before:
+        history_files = [
+            history_file
+            for history_file in history_files
+            if os.path.basename(history_file) < os.path.basename(before)
+        ]
+    if not history_files:
+        return None
+    return sorted(history_files, reverse=True)[0]
+
+
+def get_history_file_date(history_file_path: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(
+            os.path.basename(history_file_path).split("_")[0], "%Y-%m-%d"
+        )
+    except ValueError:
+        return None
+
+
+def load_projects_history(history_file_path: str) -> dict:
+    """Loads the collected project metadata from a history file.
+
+    Args:
+        history_file_path (str): Path to a `<date>_projects.csv` history file.
+
+    Returns:
+        dict: Project metadata by (lowercase) project name.
+    """
+    projects_history_df = pd.read_csv(history_file_path, sep=",", index_col=0)
+    history_date = get_history_file_date(history_file_path)
+
+    projects_history = {}
+    for record in projects_history_df.to_dict("records"):
+        project = Dict()
+        for key, value in record.items():
+            if hasattr(value, "item"):
+                # Convert numpy types to python types
+                value = value.item()
+
+            if isinstance(value, float) and math.isnan(value):
+                # Value is not set
+                continue
+
+            if key.endswith("_at") and isinstance(value, str):
+                try:
+                    value = parse(value, ignoretz=True)
+                except Exception:
+                    log.info(f"Failed to parse timestamp of {key}: {value}")
+                    continue
+            elif isinstance(value, float) and value.is_integer():
+                value = int(value)
+            project[key] = value
+
+        if not project.name:
+            continue
+
+        if not project.collected_at and history_date:
+            # Older history files do not contain the collection date
+            project.collected_at = history_date
+        projects_history[str(project.name).lower()] = project
+    return projects_history
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def append_to_collection_journal(journal_file: TextIO, project_info: Dict) -> None:
+    """Appends a collected project to the journal (one JSON object per line)."""
+    journal_file.write(json.dumps(project_info.to_dict(), default=_to_json_value))
+    journal_file.write("\n")
+    # Every project is persisted immediately to survive a crash of the process
+    journal_file.flush()
+
+
+def load_collection_journal(journal_path: str) -> dict:
+    """Loads the projects collected by a previous run from the collection journal.
+
+    Args:
+        journal_path (str): Path to the journal file.
+
+    Returns:
+        dict: Collected project metadata by (lowercase) project name.
+    """
+    journaled_projects: dict = {}
+    if not os.path.isfile(journal_path):
+        return journaled_projects
+
+    with open(journal_path, "r") as f:
+        for line in f:
+            try:
+                project_info = Dict(json.loads(line))
+            except ValueError:
+                # The last line might be incomplete if the process was killed
+                log.info("Skipping invalid line in the collection journal.")
+                continue
+
+            for key, value in project_info.items():
+                if key.endswith("_at") and isinstance(value, str):
+                    try:
+                        project_info[key] = parse(value, ignoretz=True)
+                    except Exception:
+                        log.info(f"Failed to parse timestamp of {key}: {value}")
+
+            if project_info.name:
+                journaled_projects[str(project_info.name).lower()] = project_info
+    return journaled_projects
+
+
+def get_fresh_metrics(previous_info: Optional[Dict], config: Dict) -> Dict:
+    """Returns the previously collected metrics that do not need to be refreshed.
+
+    A metric is fresh if it was collected within the configured number of days
+    (`metrics_refresh_days`).
+
+    Args:
+        previous_info (Dict): Project metadata from the latest history file.
+        config (Dict): Best-of configuration.
+
+    Returns:
+        Dict: Fresh metrics with their `<metric>_collected_at` timestamps.
+    """
+    fresh_metrics = Dict()
+    if not previous_info or not config.metrics_refresh_days:
+        return fresh_metrics
+
+    for metric, refresh_days in config.metrics_refresh_days.items():
+        collected_at = previous_info.get(metric + "_collected_at")
+        if not collected_at:
+            if previous_info.get(metric) is None:
+                # Metric was not collected
+                continue
+            collected_at = previous_info.collected_at
+
+        if not collected_at or datetime.now() - collected_at >= timedelta(
+            days=float(refresh_days)
+        ):
+            continue
+
+        fresh_metrics[metric] = previous_info.get(metric)
+        fresh_metrics[metric + "_collected_at"] = collected_at
+    return fresh_metrics
+
+
 def get_projects_changes(
     projects: List[Dict], history_file_path: str
 ) -> Tuple[List[str], Dict]:
@@ -335,11 +528,12 @@ def apply_projects_changes(
             project_inactive_month = None
             if project.last_commit_pushed_at:
                 project_inactive_month = utils.diff_month(
-                    datetime.now(), project.last_commit_pushed_at
+                    utils.get_reference_date(configuration),
+                    project.last_commit_pushed_at,
                 )
             elif project.updated_at:
                 project_inactive_month = utils.diff_month(
-                    datetime.now(), project.updated_at
+                    utils.get_reference_date(configuration), project.updated_at
                 )
 
             if (
@@ -468,11 +662,11 @@ def apply_filters(project_info: Dict, configuration: Dict) -> None:
     project_inactive_month = None
     if project_info.last_commit_pushed_at:
         project_inactive_month = utils.diff_month(
-            datetime.now(), project_info.last_commit_pushed_at
+            utils.get_reference_date(configuration), project_info.last_commit_pushed_at
         )
     elif project_info.updated_at:
         project_inactive_month = utils.diff_month(
-            datetime.now(), project_info.updated_at
+            utils.get_reference_date(configuration), project_info.updated_at
         )
 
     if (
@@ -628,7 +822,9 @@ def calc_grouped_metrics(projects: list, config: Dict) -> None:
                     )
 
             # Update project rank
-            project_group.projectrank = calc_projectrank(project_group)
+            project_group.projectrank = calc_projectrank(
+                project_group, utils.get_reference_date(config)
+            )
             apply_filters(project_group, config)
 
             # TODO: project info is not shared in the actual dict
@@ -637,56 +833,422 @@ def calc_grouped_metrics(projects: list, config: Dict) -> None:
             log.info(f"Project group {project.group_id} does not exist.")
 
 
-def collect_projects_info(
-    projects: list, categories: OrderedDict, config: Dict
-) -> list:
-    projects_processed = []
-    unique_projects = set()
-    for project in tqdm(projects):
-        project_info = Dict(project)
+def update_via_package_managers(project_info: Dict, config: Dict) -> None:
+    """Updates the project metadata via all package manager integrations.
+
+    The information of all integrations is fetched concurrently, but applied in the
+    order of `AVAILABLE_PACKAGE_MANAGER`. Therefore, the merged metadata does not
+    depend on the order in which the requests finish.
+
+    Args:
+        project_info (Dict): Collected project metadata.
+        config (Dict): Best-of configuration.
+    """
+    package_managers = integrations.AVAILABLE_PACKAGE_MANAGER
+
+    def fetch_project_info(package_manager: Any) -> Any:
+        with instrumentation.measure(package_manager.name, project=project_info.name):
+            try:
+                return package_manager.fetch_project_info(project_info)
+            except Exception as ex:
+                log.warning(
+                    f"Failed to fetch {package_manager.name} info: {project_info.name}",
+                    exc_info=ex,
+                )
+                return None
+
+    if int(config.max_integration_workers) <= 1:
+        fetched_infos = [
+            fetch_project_info(package_manager) for package_manager in package_managers
+        ]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=int(config.max_integration_workers)
+        ) as executor:
+            fetched_infos = list(
+                executor.map(
+                    instrumentation.bind_scope(fetch_project_info), package_managers
+                )
+            )
 
-        if project_info.name.lower() in unique_projects:
-            log.info("Project " + project_info.name + " is duplicated.")
+    for package_manager, fetched_info in zip(package_managers, fetched_infos):
+        with instrumentation.measure(package_manager.name, project=project_info.name):
+            package_manager.apply_project_info(project_info, fetched_info)
+
+
+def collect_project_info(
+    project: dict,
+    categories: OrderedDict,
+    config: Dict,
+    previous_info: Optional[Dict] = None,
+) -> Dict:
+    project_info = Dict(project)
+    project_info.collected_at = datetime.now()
+
+    # Reuse slowly changing metrics from the previous collection
+    fresh_metrics = get_fresh_metrics(previous_info, config)
+
+    with instrumentation.measure("github", project=project_info.name):
+        github_integration.update_via_github(project_info, fresh_metrics=fresh_metrics)
+
+    update_via_package_managers(project_info, config)
+
+    return finalize_project_info(project_info, project, categories, config)
+
+
+def finalize_project_info(
+    project_info: Dict, project: dict, categories: OrderedDict, config: Dict
+) -> Dict:
+    """Calculates the derived values of a project after its metadata is collected."""
+    if not project_info.description:
+        project_info.description = ""
+
+    if not project_info.updated_at and project_info.created_at:
+        # set update at if created at is available
+        project_info.updated_at = project_info.created_at
+
+    # Calculate an improved project rank metric
+    adapted_projectrank = calc_projectrank(
+        project_info, utils.get_reference_date(config)
+    )
+    if not project_info.projectrank or project_info.projectrank < adapted_projectrank:
+        # Use the rank that is higher
+        project_info.projectrank = adapted_projectrank
+
+    # set the show flag for every project, if not shown it will be moved to the More section
+    apply_filters(project_info, config)
+
+    # make sure that all defined values (but not category) are guaranteed to be used
+    project_info.update(project)
+
+    if project_info.description:
+        # Process description
+        project_info.description = utils.process_description(
+            project_info.description, 120, ascii_only=config.ascii_description
+        )
+
+    # Check and update the project category
+    update_project_category(project_info, categories)
+
+    return project_info
+
+
+def restore_project_info(
+    project: dict,
+    categories: OrderedDict,
+    config: Dict,
+    previous_info: Optional[Dict] = None,
+) -> Dict:
+    """Merges the project definition with its metadata from the history.
+
+    Values defined in the projects yaml take precedence, all derived values (e.g.
+    `show`, category) are calculated again.
+
+    Args:
+        project (dict): Project as defined in the projects yaml.
+        categories (OrderedDict): Configured categories.
+        config (Dict): Best-of configuration.
+        previous_info (Dict, optional): Project metadata from a history file.
+
+    Returns:
+        Dict: The project metadata.
+    """
+    project_info = Dict(
+        {
+            key: value
+            for key, value in (previous_info or {}).items()
+            if key not in RECALCULATED_KEYS
+        }
+    )
+    return finalize_project_info(project_info, project, categories, config)
+
+
+def carry_over_project_info(
+    project: dict,
+    categories: OrderedDict,
+    config: Dict,
+    previous_info: Optional[Dict] = None,
+) -> Dict:
+    """Reuses the metadata of a project from the history instead of collecting it.
+
+    The project is marked with `carried_over`, its `collected_at` timestamp stays
+    the one of the original collection.
+
+    Args:
+        project (dict): Project as defined in the projects yaml.
+        categories (OrderedDict): Configured categories.
+        config (Dict): Best-of configuration.
+        previous_info (Dict, optional): Project metadata from the latest history file.
+
+    Returns:
+        Dict: The project metadata.
+    """
+    if Dict(project).group:
+        # The metrics of project groups are calculated from the grouped projects
+        return restore_project_info(project, categories, config)
+
+    if not previous_info:
+        log.info(
+            f"Project {Dict(project).name} was not collected within the time budget and is not part of the history."
+        )
+        return restore_project_info(project, categories, config)
+
+    project_info = restore_project_info(project, categories, config, previous_info)
+    project_info.carried_over = True
+    return project_info
+
+
+def get_collection_priority(
+    previous_info: Optional[Dict], placing_thresholds: dict
+) -> tuple:
+    """Returns the sort key of a project in time-budgeted collections.
+
+    Projects without history come first, followed by projects that were carried
+    over in the last run, projects close to a placing threshold of their category,
+    and all other projects. Within each group, the stalest projects come first.
+    """
+    if not previous_info:
+        return (0, datetime.min)
+
+    collected_at = previous_info.collected_at or datetime.min
+    if previous_info.carried_over:
+        return (1, collected_at)
+
+    thresholds = placing_thresholds.get(previous_info.category, ())
+    if previous_info.projectrank and any(
+        abs(previous_info.projectrank - threshold) <= PLACING_THRESHOLD_MARGIN
+        for threshold in thresholds
+    ):
+        return (2, collected_at)
+    return (3, collected_at)
+
+
+def get_unique_projects(projects: list) -> list:
+    unique_projects = set()
+    selected_projects = []
+    for project in projects:
+        project_name = Dict(project).name
+        if project_name.lower() in unique_projects:
+            log.info("Project " + project_name + " is duplicated.")
             continue
-        unique_projects.add(project_info.name.lower())
+        unique_projects.add(project_name.lower())
+        selected_projects.append(project)
+    return selected_projects
 
-        github_integration.update_via_github(project_info)
 
-        for package_manager in integrations.AVAILABLE_PACKAGE_MANAGER:
-            package_manager.update_project_info(project_info)
+def restore_projects_info(
+    projects: list, categories: OrderedDict, config: Dict, history_file: str
+) -> list:
+    """Restores the metadata of all projects from a history file without any requests.
 
-        if not project_info.description:
-            project_info.description = ""
+    The projects are merged with their current definition, and the projectrank,
+    filters, group metrics and placings are calculated again. This allows to update
+    the output (e.g. categories or labels) without collecting all projects again.
 
-        if not project_info.updated_at and project_info.created_at:
-            # set update at if created at is available
-            project_info.updated_at = project_info.created_at
+    Args:
+        projects (list): Projects as defined in the projects yaml.
+        categories (OrderedDict): Configured categories.
+        config (Dict): Best-of configuration.
+        history_file (str): Path to a `<date>_projects.csv` history file.
 
-        # Calculate an improved project rank metric
-        adapted_projectrank = calc_projectrank(project_info)
-        if (
-            not project_info.projectrank
-            or project_info.projectrank < adapted_projectrank
-        ):
-            # Use the rank that is higher
-            project_info.projectrank = adapted_projectrank
+    Returns:
+        list: The restored projects, sorted like after a collection.
+    """
+    projects_history = load_projects_history(history_file)
+
+    projects_processed = []
+    for project in get_unique_projects(projects):
+        previous_info = projects_history.get(Dict(project).name.lower())
+        if Dict(project).group:
+            # The metrics of project groups are calculated from the grouped projects
+            previous_info = None
+        elif not previous_info:
+            log.info(
+                f"Project {Dict(project).name} is not part of the history file: {history_file}"
+            )
+        projects_processed.append(
+            restore_project_info(project, categories, config, previous_info)
+        )
+
+    calc_grouped_metrics(projects_processed, config)
+    projects_processed = sort_projects(projects_processed, config)
+    calc_projectrank_placing(projects_processed)
+
+    return projects_processed
 
-        # set the show flag for every project, if not shown it will be moved to the More section
-        apply_filters(project_info, config)
 
-        # make sure that all defined values (but not category) are guaranteed to be used
-        project_info.update(project)
+def collect_projects_info(
+    projects: list, categories: OrderedDict, config: Dict, resume: bool = False
+) -> list:
+    selected_projects = get_unique_projects(projects)
+
+    start_time = time.monotonic()
+    http_client.configure(config)
+    # Configured once, so that the channel indices are downloaded once per run
+    conda_index.configure(
+        config.conda_channel_index,
+        (
+            os.path.join(config.http_cache_folder, "conda")
+            if config.http_cache_folder
+            else None
+        ),
+    )
+    instrumentation.reset()
+
+    def is_time_budget_exceeded() -> bool:
+        return bool(
+            config.time_budget
+            and time.monotonic() - start_time >= float(config.time_budget)
+        )
 
-        if project_info.description:
-            # Process description
-            project_info.description = utils.process_description(
-                project_info.description, 120, ascii_only=config.ascii_description
+    projects_history: dict = {}
+    if (
+        config.incremental_collection or config.time_budget
+    ) and config.projects_history_folder:
+        history_file = get_latest_history_file(config.projects_history_folder)
+        if history_file:
+            log.info("Using history file for the collection: " + history_file)
+            projects_history = load_projects_history(history_file)
+
+    def get_previous_info(project: dict) -> Optional[Dict]:
+        if not config.incremental_collection:
+            return None
+        return projects_history.get(Dict(project).name.lower())
+
+    journaled_projects: dict = {}
+    if config.checkpoint_file:
+        if resume:
+            journaled_projects = load_collection_journal(config.checkpoint_file)
+            log.info(
+                f"Resuming the collection, {len(journaled_projects)} projects are already collected."
+            )
+        elif os.path.isfile(config.checkpoint_file):
+            # Start a new journal
+            os.remove(config.checkpoint_file)
+
+    # Projects that are already collected are taken from the journal
+    projects_processed: List[Optional[Dict]] = [
+        journaled_projects.get(Dict(project).name.lower())
+        for project in selected_projects
+    ]
+    pending_projects = [
+        (i, project)
+        for i, project in enumerate(selected_projects)
+        if projects_processed[i] is None
+    ]
+
+    if config.time_budget:
+        # Collect the most important projects first, in case the budget runs out
+        placing_thresholds = get_placing_thresholds(list(projects_history.values()))
+        pending_projects.sort(
+            key=lambda pending_project: get_collection_priority(
+                projects_history.get(Dict(pending_project[1]).name.lower()),
+                placing_thresholds,
+            )
+        )
+
+    def prefetch_projects_info(chunk: list) -> None:
+        # Request GitHub metadata for all projects via batched queries
+        with instrumentation.measure("github"):
+            github_integration.prefetch_github_info(
+                [Dict(project).github_id for _, project in chunk]
             )
 
-        # Check and update the project category
-        update_project_category(project_info, categories)
+        # Request contributor counts concurrently, unless reused from the history
+        with instrumentation.measure("github"):
+            github_integration.prefetch_contributor_counts(
+                [
+                    Dict(project).github_id
+                    for _, project in chunk
+                    if "contributor_count_collected_at"
+                    not in get_fresh_metrics(get_previous_info(project), config)
+                ],
+                max_workers=int(config.max_connections_per_host),
+            )
 
-        projects_processed.append(project_info)
+        for package_manager in integrations.AVAILABLE_PACKAGE_MANAGER:
+            if is_time_budget_exceeded():
+                break
+            with instrumentation.measure(package_manager.name):
+                package_manager.prefetch_projects_info(
+                    [Dict(project) for _, project in chunk], config
+                )
+
+    journal_file = open(config.checkpoint_file, "a") if config.checkpoint_file else None
+    journal_lock = threading.Lock()
+
+    def collect_and_checkpoint(project: dict) -> Optional[Dict]:
+        if is_time_budget_exceeded():
+            # Filled from the history after the collection
+            return None
+
+        project_info = collect_project_info(
+            project, categories, config, get_previous_info(project)
+        )
+        if is_time_budget_exceeded() and Dict(project).name.lower() in projects_history:
+            # Requests might have been skipped at the deadline -> use the history
+            return None
+        if journal_file:
+            with journal_lock:
+                append_to_collection_journal(journal_file, project_info)
+        return project_info
+
+    # With a time budget, the projects are prefetched and collected in chunks, so
+    # that only projects that are collected within the budget are prefetched
+    chunk_size = (
+        COLLECTION_CHUNK_SIZE if config.time_budget else max(1, len(pending_projects))
+    )
+    if config.time_budget:
+        rate_limit.set_deadline(start_time + float(config.time_budget))
+
+    try:
+        with tqdm(total=len(pending_projects)) as progress_bar:
+            for chunk_start in range(0, len(pending_projects), chunk_size):
+                if is_time_budget_exceeded():
+                    break
+                chunk = pending_projects[chunk_start : chunk_start + chunk_size]
+                prefetch_projects_info(chunk)
+
+                if int(config.max_workers) <= 1:
+                    for i, project in chunk:
+                        projects_processed[i] = collect_and_checkpoint(project)
+                        progress_bar.update()
+                    continue
+
+                # Collect projects concurrently, the results are kept in the input order
+                with ThreadPoolExecutor(
+                    max_workers=int(config.max_workers)
+                ) as executor:
+                    futures = {
+                        executor.submit(
+                            instrumentation.bind_scope(collect_and_checkpoint), project
+                        ): i
+                        for i, project in chunk
+                    }
+                    for future in as_completed(futures):
+                        projects_processed[futures[future]] = future.result()
+                        progress_bar.update()
+    finally:
+        rate_limit.set_deadline(None)
+        if journal_file:
+            journal_file.close()
+
+    carried_over_projects = 0
+    for i, project in pending_projects:
+        if projects_processed[i] is None:
+            projects_processed[i] = carry_over_project_info(
+                project,
+                categories,
+                config,
+                projects_history.get(Dict(project).name.lower()),
+            )
+            if projects_processed[i].carried_over:
+                carried_over_projects += 1
+
+    if is_time_budget_exceeded():
+        log.warning(
+            f"The time budget was exceeded, {carried_over_projects} projects are carried over from the history."
+        )
 
     calc_grouped_metrics(projects_processed, config)
     projects_processed = sort_projects(projects_processed, config)
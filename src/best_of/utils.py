@@ -3,12 +3,26 @@ import re
 import sys
 import textwrap
 from datetime import datetime
+from typing import Any
 
 
 def simplify_str(text: str) -> str:
     return re.compile(r"[^a-zA-Z0-9]").sub("", text.strip()).lower()
 
 
+def normalize_pypi_name(name: str) -> str:
+    """Normalizes the name of a PyPI project as defined in PEP 503."""
+    return re.sub(r"[-_.]+", "-", name.strip()).lower()
+
+
+def get_reference_date(config: Any) -> datetime:
+    """Returns the date used for date-based metrics and filters.
+
+    This is the current date, or the date of the history file that is rendered.
+    """
+    return config.reference_date or datetime.now()
+
+
 def diff_month(date1: datetime, date2: datetime) -> int:
     return (date1.year - date2.year) * 12 + date1.month - date2.month
 
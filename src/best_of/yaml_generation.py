@@ -3,73 +3,120 @@ import logging
 import os
 import re
 import urllib.request
-from typing import List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Pattern, Tuple, Union
 
-import requests
 import requirements
 from addict import Dict
 from tqdm import tqdm
 
-from best_of import projects_collection, utils
+from best_of import instrumentation, projects_collection, utils
 from best_of.integrations import (
+    conda_index,
     conda_integration,
+    download_stats,
     github_integration,
+    http_client,
+    libio_integration,
     npm_integration,
+    pypi_index,
     pypi_integration,
 )
+from best_of.integrations.http_cache import DAY, ValueCache
 
 log = logging.getLogger(__name__)
 
+# Minimum usage of detected packages to prevent false positives
+MIN_PYPI_MONTHLY_DOWNLOADS = 250
+MIN_CONDA_TOTAL_DOWNLOADS = 2500
+MIN_NPM_MONTHLY_DOWNLOADS = 500
+# Packages that were not found are not probed again within this time
+PROBE_MISS_CACHE_TTL = 30 * DAY
+
 
 def get_projects_from_org(organization: str, min_stars: int = 30) -> List[str]:
+    """Returns the repos of a GitHub organization with more than `min_stars` stars.
+
+    The repos are requested page by page, ordered by their star count. Therefore,
+    no further pages are requested once a repo has too few stars.
+
+    Args:
+        organization (str): Login of the GitHub organization.
+        min_stars (int, optional): Repos need more stars to be returned.
+
+    Returns:
+        List[str]: GitHub ids (`owner/repo`) of the repos.
+    """
     query = """
-query($organization: String!) {
+query($organization: String!, $cursor: String) {
       organization(login: $organization) {
-        repositories(first: 100, orderBy: {field: STARGAZERS, direction: DESC}) {
+        repositories(first: 100, after: $cursor, orderBy: {field: STARGAZERS, direction: DESC}) {
           nodes {
             nameWithOwner
             stargazerCount
           }
+          pageInfo {
+            hasNextPage
+            endCursor
+          }
         }
       }
  }
     """
 
-    headers = {"Authorization": "token " + os.environ["GITHUB_API_KEY"]}
-    variables = {"organization": organization}
+    if not github_integration.select_github_api_token():
+        log.info("Unable to request GitHub org without a GitHub API token.")
+        return []
 
-    try:
-        response = requests.post(
-            "https://api.github.com/graphql",
-            json={"query": query, "variables": variables},
-            headers=headers,
-        )
-        if response.status_code != 200:
+    github_ids: List[str] = []
+    cursor = None
+    while True:
+        # Requests are distributed across all tokens
+        github_api_token = github_integration.select_github_api_token()
+        headers = {"Authorization": "token " + github_api_token}
+        variables = {"organization": organization, "cursor": cursor}
+
+        try:
+            response = http_client.post(
+                github_integration.GITHUB_GRAPHQL_API,
+                json={"query": query, "variables": variables},
+                headers=headers,
+                rate_limit_service=github_integration.get_token_service(
+                    github_integration.GITHUB_GRAPHQL_SERVICE, github_api_token
+                ),
+            )
+            if response.status_code != 200:
+                log.info(
+                    "Unable to find GitHub org via GitHub api: "
+                    + organization
+                    + " ("
+                    + str(response.status_code)
+                    + ")"
+                )
+                return github_ids
+            response_data = response.json()
+            if "data" not in response_data or not response_data["data"].get(
+                "organization"
+            ):
+                log.info(f"Failed to get Github org data for {organization}")
+                return github_ids
+            repositories = Dict(response_data["data"]["organization"]).repositories
+        except Exception as ex:
             log.info(
-                "Unable to find GitHub org via GitHub api: "
-                + organization
-                + " ("
-                + str(response.status_code)
-                + ")"
+                "Failed to request GitHub org via GitHub api: " + organization,
+                exc_info=ex,
             )
-            return []
-        response_data = response.json()
-        if "data" not in response_data:
-            log.info(f"Failed to get Github org data for {organization}", response_data)
-            return []
-        github_org_info = Dict(response_data["data"]["organization"])
-    except Exception as ex:
-        log.info(
-            "Failed to request GitHub org via GitHub api: " + organization,
-            exc_info=ex,
-        )
-        return []
+            return github_ids
 
-    return [
-        repo.nameWithOwner
-        for repo in github_org_info.repositories.nodes
-        if repo.stargazerCount > min_stars
-    ]
+        for repo in repositories.nodes:
+            if repo.stargazerCount <= min_stars:
+                # All remaining repos have even fewer stars
+                return github_ids
+            github_ids.append(repo.nameWithOwner)
+
+        if not repositories.pageInfo.hasNextPage:
+            return github_ids
+        cursor = repositories.pageInfo.endCursor
 
 
 def collect_github_projects(
@@ -77,7 +124,28 @@ def collect_github_projects(
     excluded_github_ids: Optional[List[str]] = None,
     existing_projects: Optional[List[Dict]] = None,
     group: Optional[str] = None,
+    min_stars: int = 0,
+    max_workers: int = http_client.DEFAULT_MAX_CONNECTIONS_PER_HOST,
 ) -> list:
+    """Collects the metadata of GitHub repos to add them as projects.
+
+    The basic metadata of all repos is requested via batched queries. Repos with
+    too few stars are skipped before the remaining metadata (e.g. contributors or
+    libraries.io) is requested concurrently.
+
+    Args:
+        repos (List[str]): GitHub ids (`owner/repo`) of the repos.
+        excluded_github_ids (List[str], optional): Repos that are not added.
+        existing_projects (List[Dict], optional): Projects that are already part of
+            the list and added to the returned projects.
+        group (str, optional): Group id of all added projects.
+        min_stars (int, optional): Repos need more stars to be added, like the repos
+            returned by `get_projects_from_org`.
+        max_workers (int, optional): Number of repos that are collected concurrently.
+
+    Returns:
+        list: The projects.
+    """
 
     projects: List = []
 
@@ -95,30 +163,65 @@ def collect_github_projects(
                 excluded_github_ids.append(project["github_id"])
 
     excluded_projects = set()
-    added_projects = set()
 
     if excluded_github_ids:
         for excluded_project in excluded_github_ids:
             excluded_projects.add(utils.simplify_str(excluded_project))
 
-    # extract github project urls
-    for github_id in tqdm(repos):
-        if utils.simplify_str(github_id) in added_projects:
-            # project already added
-            continue
-
-        if utils.simplify_str(github_id) in excluded_projects:
-            # skip excluded projects
+    candidate_ids: List[str] = []
+    candidate_keys = set()
+    for github_id in repos:
+        key = utils.simplify_str(github_id)
+        if key in candidate_keys or key in excluded_projects:
+            # skip duplicated and excluded projects
             continue
-
+        candidate_keys.add(key)
+        candidate_ids.append(github_id)
+
+    # Request the basic metadata of all repos via batched queries
+    github_integration.prefetch_github_info(candidate_ids)
+    if min_stars:
+        # Repos that were not prefetched are filtered after the collection
+        star_counts = {
+            github_id: github_integration.get_prefetched_star_count(github_id)
+            for github_id in candidate_ids
+        }
+        candidate_ids = [
+            github_id
+            for github_id in candidate_ids
+            if star_counts[github_id] is None or star_counts[github_id] > min_stars
+        ]
+    github_integration.prefetch_contributor_counts(candidate_ids, max_workers)
+
+    def collect_github_project(github_id: str) -> Dict:
         project = Dict()
         project.github_id = github_id
         github_integration.update_via_github(project)
+        return project
+
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as executor:
+        collected_projects = list(
+            tqdm(
+                executor.map(
+                    instrumentation.bind_scope(collect_github_project), candidate_ids
+                ),
+                total=len(candidate_ids),
+            )
+        )
+
+    added_projects = set()
+    for github_id, project in zip(candidate_ids, collected_projects):
+        if utils.simplify_str(github_id) in added_projects:
+            # project already added
+            continue
 
         if not project.github_url or not project.name:
             # did not fetch any data from github, do not add project
             continue
 
+        if min_stars and (project.star_count or 0) <= min_stars:
+            continue
+
         if project.updated_github_id:
             if utils.simplify_str(project.updated_github_id) in excluded_projects:
                 # project is added with updated id
@@ -137,80 +240,126 @@ def collect_github_projects(
     return projects
 
 
-def extract_github_projects(
-    input: Union[str, List[str]],
-    excluded_github_ids: Optional[List[str]] = None,
-    existing_projects: Optional[List[Dict]] = None,
-) -> list:
-
-    projects: List = []
-
-    if not excluded_github_ids:
-        excluded_github_ids = []
-
-    if existing_projects:
-        # Add projects to the overall project list
-        projects.extend(existing_projects)
-        for project in existing_projects:
-            if "github_id" in project and project["github_id"]:
-                # ignore all based on github_id
-                excluded_github_ids.append(project["github_id"])
-
-    # If input is a list, iterate instead and combine all input lists
-    if not isinstance(input, str):
-        for input_str in input:
-            extracted_projects = extract_github_projects(input_str, excluded_github_ids)
-            projects.extend(extracted_projects)
-            for project in extracted_projects:
-                if (
-                    "github_id" in project
-                    and project["github_id"] not in excluded_github_ids
-                ):
-                    excluded_github_ids.append(project["github_id"])
-                else:
-                    log.info("No github id found.")
-        return projects
-
-    excluded_projects = set()
-    added_projects = set()
+GITHUB_URL_PATTERN = re.compile(
+    r"(^|[^#])https:\/\/github\.com\/([a-zA-Z0-9-_.]*\/[a-zA-Z0-9-_.]*)"
+)
+PYPI_URL_PATTERN = re.compile(
+    r"(^|[^#])https:\/\/pypi\.org\/project\/([a-zA-Z0-9-_.]*)"
+)
 
-    if excluded_github_ids:
-        for excluded_project in excluded_github_ids:
-            excluded_projects.add(utils.simplify_str(excluded_project))
 
-    input_str = input
+def _read_input_lines(input: str) -> Iterator[str]:
+    """Yields the lines of a file, an URL or a string without reading all of it at once."""
     if os.path.isfile(input):
         # If input is a valid file path, read as file
         with open(input, "r") as f:
-            input_str = f.read()
+            yield from f
     elif utils.is_valid_url(input):
         # if input is a valid url, open and read from url
-        filedata = urllib.request.urlopen(input)
-        input_str = filedata.read().decode("utf-8")
+        with urllib.request.urlopen(input) as response:
+            for line in response:
+                yield line.decode("utf-8")
+    else:
+        yield from input.splitlines()
 
-    # extract github project urls
-    for github_match in tqdm(
-        re.findall(
-            r"(^|[^#])https:\/\/github\.com\/([a-zA-Z0-9-_.]*\/[a-zA-Z0-9-_.]*)",
-            input_str,
-            re.MULTILINE,
-        )
-    ):
-        if len(github_match) <= 1:
-            continue
 
-        github_id = github_match[1].strip().rstrip("/").rstrip(".")
-        if not github_id:
-            continue
+def _extract_new_ids(
+    inputs: List[str], pattern: Pattern, seen_ids: set
+) -> Iterator[str]:
+    """Yields all ids matched (second group) in the inputs that were not seen before.
 
-        if utils.simplify_str(github_id) in added_projects:
-            # project already added
+    Args:
+        inputs (List[str]): Files, URLs or strings that are scanned line by line.
+        pattern (Pattern): Pattern with the id as second group.
+        seen_ids (set): Simplified ids that are skipped, the yielded ids are added.
+    """
+    for input in inputs:
+        for line in _read_input_lines(input):
+            for match in pattern.finditer(line):
+                extracted_id = match.group(2).strip().rstrip("/").rstrip(".")
+                if not extracted_id:
+                    continue
+                if utils.simplify_str(extracted_id) in seen_ids:
+                    # skip duplicated and excluded projects
+                    continue
+                seen_ids.add(utils.simplify_str(extracted_id))
+                yield extracted_id
+
+
+def _join_continuation_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Joins lines that end with a backslash with the following line."""
+    continued_line = ""
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.endswith("\\"):
+            continued_line += line[:-1] + " "
             continue
+        yield continued_line + line
+        continued_line = ""
+    if continued_line:
+        yield continued_line
+
+
+def _extract_new_requirements(inputs: List[str], seen_ids: set) -> Iterator[str]:
+    """Yields the names of all requirements in the inputs that were not seen before."""
+    for input in inputs:
+        for line in _join_continuation_lines(_read_input_lines(input)):
+            for req in requirements.parse(line):
+                pypi_id = req.name.strip().lower()
+                if utils.simplify_str(pypi_id) in seen_ids:
+                    # skip duplicated and excluded projects
+                    continue
+                seen_ids.add(utils.simplify_str(pypi_id))
+                yield pypi_id
+
+
+def _get_excluded_projects(
+    id_field: str,
+    excluded_ids: Optional[List[str]],
+    existing_projects: Optional[List[Dict]],
+) -> set:
+    excluded_projects = set()
+    for excluded_id in excluded_ids or []:
+        excluded_projects.add(utils.simplify_str(excluded_id))
+
+    for project in existing_projects or []:
+        if id_field in project and project[id_field]:
+            # ignore all based on the id
+            excluded_projects.add(utils.simplify_str(project[id_field]))
+    return excluded_projects
 
-        if utils.simplify_str(github_id) in excluded_projects:
-            # skip excluded projects
-            continue
 
+def extract_github_projects(
+    input: Union[str, List[str]],
+    excluded_github_ids: Optional[List[str]] = None,
+    existing_projects: Optional[List[Dict]] = None,
+) -> list:
+    """Extracts GitHub repos from files, URLs or strings and adds them as projects.
+
+    The inputs are scanned line by line. Every repo is only requested once, repos
+    that are excluded or part of the existing projects are not requested at all.
+
+    Args:
+        input (Union[str, List[str]]): One or more files, URLs or strings.
+        excluded_github_ids (List[str], optional): Repos that are not added.
+        existing_projects (List[Dict], optional): Projects that are already part of
+            the list and added to the returned projects.
+
+    Returns:
+        list: The projects.
+    """
+    projects: List = list(existing_projects or [])
+    inputs = [input] if isinstance(input, str) else input
+
+    excluded_projects = _get_excluded_projects(
+        "github_id", excluded_github_ids, existing_projects
+    )
+    added_projects = set()
+
+    # extract github project urls
+    for github_id in tqdm(
+        _extract_new_ids(inputs, GITHUB_URL_PATTERN, set(excluded_projects))
+    ):
         project = Dict()
         project.github_id = github_id
         github_integration.update_via_github(project)
@@ -220,13 +369,14 @@ def extract_github_projects(
             continue
 
         if project.updated_github_id:
-            if utils.simplify_str(project.updated_github_id) in excluded_projects:
+            updated_key = utils.simplify_str(project.updated_github_id)
+            if updated_key in excluded_projects or updated_key in added_projects:
                 # project is added with updated id
                 continue
 
             # Apply updated github id:
             project.github_id = project.updated_github_id
-            added_projects.add(utils.simplify_str(project.updated_github_id))
+            added_projects.add(updated_key)
 
         project.projectrank = projects_collection.calc_projectrank(project)
 
@@ -236,74 +386,12 @@ def extract_github_projects(
     return projects
 
 
-def extract_pypi_projects(
-    input: Union[str, List[str]],
-    excluded_pypi_ids: Optional[List[str]] = None,
-    existing_projects: Optional[List[Dict]] = None,
-) -> list:
+def _collect_pypi_projects(pypi_ids: Iterator[str]) -> list:
     projects: List = []
-
-    if not excluded_pypi_ids:
-        excluded_pypi_ids = []
-
-    if existing_projects:
-        # Add projects to the overall project list
-        projects.extend(existing_projects)
-        for project in existing_projects:
-            if "pypi_id" in project and project["pypi_id"]:
-                # ignore all based on pypi_id
-                excluded_pypi_ids.append(project["pypi_id"])
-
-    # If input is a list, iterate instead and combine all input lists
-    if not isinstance(input, str):
-        for input_str in input:
-            extracted_projects = extract_pypi_projects(input_str, excluded_pypi_ids)
-            projects.extend(extracted_projects)
-            for project in extracted_projects:
-                if "pypi_id" in project and project["pypi_id"] not in excluded_pypi_ids:
-                    excluded_pypi_ids.append(project["pypi_id"])
-                else:
-                    log.info("No pypi_id found.")
-        return projects
-
-    excluded_projects = set()
-    added_projects = set()
-
-    if excluded_pypi_ids:
-        for excluded_project in excluded_pypi_ids:
-            excluded_projects.add(utils.simplify_str(excluded_project))
-
-    input_str = input
-    if os.path.isfile(input):
-        # If input is a valid file path, read as file
-        with open(input, "r") as f:
-            input_str = f.read()
-    elif utils.is_valid_url(input):
-        # if input is a valid url, open and read from url
-        filedata = urllib.request.urlopen(input)
-        input_str = filedata.read().decode("utf-8")
-
-    # extract pypi project urls
-    for pypi_match in tqdm(
-        re.findall(
-            r"(^|[^#])https:\/\/pypi\.org\/project\/([a-zA-Z0-9-_.]*)",
-            input_str,
-            re.MULTILINE,
-        )
-    ):
-        if len(pypi_match) <= 1:
-            continue
-
-        pypi_id = pypi_match[1].strip().rstrip("/").rstrip(".")
-        if not pypi_id:
-            continue
-
-        if utils.simplify_str(pypi_id) in added_projects:
-            # project already added
-            continue
-
-        if utils.simplify_str(pypi_id) in excluded_projects:
-            # skip excluded projects
+    for pypi_id in tqdm(pypi_ids):
+        if pypi_integration.package_exists(pypi_id) is False:
+            # Only existing packages are requested from the download statistics
+            log.info("Unable to find package on PyPI: " + pypi_id)
             continue
 
         project = Dict()
@@ -320,109 +408,92 @@ def extract_pypi_projects(
                 project.github_id = project.updated_github_id
 
         project.projectrank = projects_collection.calc_projectrank(project)
-        added_projects.add(utils.simplify_str(pypi_id))
         projects.append(project.to_dict())
 
     return projects
 
 
-def extract_pypi_projects_from_requirements(
+def extract_pypi_projects(
     input: Union[str, List[str]],
     excluded_pypi_ids: Optional[List[str]] = None,
     existing_projects: Optional[List[Dict]] = None,
 ) -> list:
-    projects = []
-    # libraries.io should be configured
+    """Extracts PyPI packages from files, URLs or strings and adds them as projects.
 
-    if not excluded_pypi_ids:
-        excluded_pypi_ids = []
+    The inputs are scanned line by line. Every package is only requested once,
+    packages that are excluded or part of the existing projects are not requested.
 
-    if existing_projects:
-        # Add projects to the overall project list
-        projects.extend(existing_projects)
-        for project in existing_projects:
-            if "pypi_id" in project and project["pypi_id"]:
-                # ignore all based on pypi_id
-                excluded_pypi_ids.append(project["pypi_id"])
-
-    # If input is a list, iterate instead and combine all input lists
-    if not isinstance(input, str):
-        for input_str in input:
-            extracted_projects = extract_pypi_projects_from_requirements(
-                input_str, excluded_pypi_ids
-            )
-            projects.extend(extracted_projects)
-            for project in extracted_projects:
-                if "pypi_id" in project and project["pypi_id"] not in excluded_pypi_ids:
-                    excluded_pypi_ids.append(project["pypi_id"])
-                else:
-                    log.info("No pypi_id found.")
-        return projects
-
-    excluded_projects = set()
-    added_projects = set()
-
-    if excluded_pypi_ids:
-        for excluded_project in excluded_pypi_ids:
-            excluded_projects.add(utils.simplify_str(excluded_project))
-
-    input_str = input
-    if os.path.isfile(input):
-        # If input is a valid file path, read as file
-        with open(input, "r") as f:
-            input_str = f.read()
-    elif utils.is_valid_url(input):
-        # if input is a valid url, open and read from url
-        filedata = urllib.request.urlopen(input)
-        input_str = filedata.read().decode("utf-8")
+    Args:
+        input (Union[str, List[str]]): One or more files, URLs or strings.
+        excluded_pypi_ids (List[str], optional): Packages that are not added.
+        existing_projects (List[Dict], optional): Projects that are already part of
+            the list and added to the returned projects.
 
-    for req in tqdm(requirements.parse(input_str)):
-        pypi_id = req.name.strip().lower()
-
-        if utils.simplify_str(pypi_id) in added_projects:
-            # project already added
-            continue
+    Returns:
+        list: The projects.
+    """
+    inputs = [input] if isinstance(input, str) else input
+    excluded_projects = _get_excluded_projects(
+        "pypi_id", excluded_pypi_ids, existing_projects
+    )
 
-        if utils.simplify_str(pypi_id) in excluded_projects:
-            # skip excluded projects
-            continue
+    # extract pypi project urls
+    return list(existing_projects or []) + _collect_pypi_projects(
+        _extract_new_ids(inputs, PYPI_URL_PATTERN, excluded_projects)
+    )
 
-        project = Dict()
-        project.pypi_id = pypi_id
-        pypi_integration.PypiIntegration().update_project_info(project)
 
-        if not project.monthly_downloads:
-            # did not fetch any data from github, do not add project
-            continue
-
-        if project.github_id:
-            # Update metadata again via twitter
-            github_integration.update_via_github(project)
-            if project.updated_github_id:
-                project.github_id = project.updated_github_id
+def extract_pypi_projects_from_requirements(
+    input: Union[str, List[str]],
+    excluded_pypi_ids: Optional[List[str]] = None,
+    existing_projects: Optional[List[Dict]] = None,
+) -> list:
+    """Extracts the requirements of requirement files as projects.
 
-        project.projectrank = projects_collection.calc_projectrank(project)
-        added_projects.add(utils.simplify_str(pypi_id))
-        projects.append(project.to_dict())
+    See `extract_pypi_projects` for the arguments.
+    """
+    # libraries.io should be configured
+    inputs = [input] if isinstance(input, str) else input
+    excluded_projects = _get_excluded_projects(
+        "pypi_id", excluded_pypi_ids, existing_projects
+    )
 
-    return projects
+    return list(existing_projects or []) + _collect_pypi_projects(
+        _extract_new_requirements(inputs, excluded_projects)
+    )
 
 
 def auto_extend_via_libio(
     projects: list, selected_package_manager: Optional[List[str]] = None
 ) -> list:
-    from pybraries.search import Search
+    libio_client = libio_integration.get_client()
+
+    # Related projects of all repos are requested concurrently, once per repo
+    github_ids = list(
+        dict.fromkeys(
+            project["github_id"] for project in projects if "github_id" in project
+        )
+    )
+    related_projects_by_github_id = {}
+    for github_id, related_projects, exception in tqdm(
+        libio_client.bulk(
+            lambda github_id: libio_client.repository_projects(*github_id.split("/")),
+            github_ids,
+        ),
+        total=len(github_ids),
+    ):
+        if exception:
+            log.info(
+                "Failed to request related projects from libraries.io: " + github_id,
+                exc_info=exception,
+            )
+        related_projects_by_github_id[github_id] = related_projects
 
     updated_projects = []
-    for project in tqdm(projects):
+    for project in projects:
         project = copy.deepcopy(project)
         if "github_id" in project:
-            search = Search()
-            related_projects = search.repository_projects(
-                host="github",
-                owner=project["github_id"].split("/")[0],
-                repo=project["github_id"].split("/")[1],
-            )
+            related_projects = related_projects_by_github_id.get(project["github_id"])
             selected_platform_dep_rank: dict = {}
             if related_projects is not None:
                 for related_project in related_projects:
@@ -497,78 +568,204 @@ def auto_extend_via_libio(
     return updated_projects
 
 
+def _probe_pypi_package(project: Dict, pypi_id: str) -> Tuple[Optional[Dict], bool]:
+    if pypi_integration.package_exists(pypi_id) is False:
+        return None, True
+
+    # Download statistics are checked before requesting all metadata
+    monthly_downloads = download_stats.get_monthly_downloads(pypi_id)
+    if monthly_downloads is None:
+        return None, False
+    if monthly_downloads <= MIN_PYPI_MONTHLY_DOWNLOADS:
+        return None, True
+
+    project_cloned = copy.deepcopy(project)
+    project_cloned.pypi_id = pypi_id
+    pypi_integration.PypiIntegration().update_project_info(project_cloned)
+    return project_cloned, False
+
+
+def _probe_conda_package(project: Dict, conda_id: str) -> Tuple[Optional[Dict], bool]:
+    package_exists = conda_index.package_exists(conda_id)
+    if package_exists is False:
+        return None, True
+
+    project_cloned = copy.deepcopy(project)
+    project_cloned.conda_id = conda_id
+    integration = conda_integration.CondaIntegration()
+    fetched_info = integration.fetch_project_info(project_cloned)
+    integration.apply_project_info(project_cloned, fetched_info)
+    if not project_cloned.conda_total_downloads:
+        # Only a miss if the package is known to be missing (not for failed requests)
+        return None, bool(fetched_info and fetched_info.conda_missing)
+    if project_cloned.conda_total_downloads <= MIN_CONDA_TOTAL_DOWNLOADS:
+        return None, True
+    return project_cloned, False
+
+
+def _probe_npm_package(project: Dict, npm_id: str) -> Tuple[Optional[Dict], bool]:
+    if npm_integration.package_exists(npm_id) is False:
+        return None, True
+
+    monthly_downloads = npm_integration.get_monthly_downloads(npm_id)
+    if monthly_downloads is None:
+        return None, False
+    if monthly_downloads <= MIN_NPM_MONTHLY_DOWNLOADS:
+        return None, True
+
+    project_cloned = copy.deepcopy(project)
+    project_cloned.npm_id = npm_id
+    npm_integration.NpmIntegration().update_project_info(project_cloned)
+    return project_cloned, False
+
+
+PACKAGE_PROBES = {
+    "pypi": _probe_pypi_package,
+    "conda": _probe_conda_package,
+    "npm": _probe_npm_package,
+}
+
+
+def probe_package(
+    project: Dict,
+    package_manager: str,
+    package_id: str,
+    probe_cache: Optional[ValueCache] = None,
+) -> Optional[Dict]:
+    """Checks if a project is published with the given id on a package manager.
+
+    Only packages with a minimum number of downloads are detected to prevent false
+    positives. Packages that do not exist (or are rarely used) are stored in the
+    probe cache and not probed again for `PROBE_MISS_CACHE_TTL`.
+
+    Args:
+        project (Dict): Project metadata.
+        package_manager (str): Package manager (`pypi`, `conda`, or `npm`).
+        package_id (str): Probed id of the package.
+        probe_cache (ValueCache, optional): Persistent cache of the missed probes.
+
+    Returns:
+        Optional[Dict]: A copy of the project updated with the package metadata, or
+            `None` if the package was not detected.
+    """
+    cache_key = f"probe-miss:{package_manager}:{package_id.lower()}"
+    if probe_cache and probe_cache.get(cache_key, PROBE_MISS_CACHE_TTL):
+        return None
+
+    detected_project, is_miss = PACKAGE_PROBES[package_manager](project, package_id)
+    if detected_project:
+        log.info(
+            f"Detected {package_manager} package: {package_id} for project {project.name}."
+        )
+    elif is_miss and probe_cache:
+        probe_cache.set(cache_key, True)
+    return detected_project
+
+
 def auto_extend_package_manager(
-    projects: list, pypi: bool = False, conda: bool = False, npm: bool = False
+    projects: list,
+    pypi: bool = False,
+    conda: bool = False,
+    npm: bool = False,
+    conda_channel_index: bool = False,
+    index_folder: Optional[str] = None,
+    pypi_name_index: bool = False,
+    cache_folder: Optional[str] = None,
+    max_workers: int = http_client.DEFAULT_MAX_CONNECTIONS_PER_HOST,
 ) -> list:
-    updated_projects = []
-    for project in tqdm(projects):
+    """Detects packages of the projects on PyPI, Conda (conda-forge), and npm.
+
+    Packages are probed via their project name, all projects are probed concurrently.
+
+    Args:
+        projects (list): Projects as defined in the projects yaml.
+        pypi (bool, optional): Probe PyPI packages.
+        conda (bool, optional): Probe conda-forge packages.
+        npm (bool, optional): Probe npm packages.
+        conda_channel_index (bool, optional): Check via a local index of conda-forge
+            if a package exists.
+        index_folder (str, optional): Folder used to store the package indices.
+        pypi_name_index (bool, optional): Check via a local index of all PyPI project
+            names if a package exists.
+        cache_folder (str, optional): Folder used to store packages that were not
+            found, so they are not probed again in the next runs.
+        max_workers (int, optional): Number of projects that are probed concurrently.
+
+    Returns:
+        list: The updated projects.
+    """
+    if conda and conda_channel_index:
+        # Probe conda-forge packages via a local index instead of the api
+        conda_index.configure(["conda-forge"], index_folder)
+
+    if pypi and pypi_name_index:
+        pypi_index.configure(True, index_folder)
+
+    probe_cache = (
+        ValueCache(os.path.join(cache_folder, "probes")) if cache_folder else None
+    )
+
+    if npm:
+        # Npm packages are probed via bulk requests
+        npm_integration.prefetch_monthly_downloads(
+            [
+                Dict(project).name.lower().strip().replace(" ", "-")
+                for project in projects
+                if Dict(project).name and not Dict(project).npm_id
+            ],
+            max_workers=max_workers,
+        )
+
+    def extend_project(project: dict) -> Optional[Dict]:
         project = Dict(project)
-        project_name = ""
         if not project.name:
             if project.pypi_id:
                 # fallback: use pypi_id as name
                 project.name = project.pypi_id
             else:
                 # skip project
-                continue
+                return None
 
         project_name = project.name.lower().strip().replace(" ", "-")
 
+        # The packages of a project are probed one after another, since the
+        # conda package is also probed via the detected pypi id
         if pypi and not project.pypi_id:
-            project_cloned = copy.deepcopy(project)
-            project_cloned.pypi_id = project_name
-            pypi_integration.PypiIntegration().update_project_info(project_cloned)
-            if (
-                project_cloned.pypi_monthly_downloads
-                and project_cloned.pypi_monthly_downloads > 250
-            ):
-                # only use this package if monthly downloads over X -> to prevent errors
-                log.info(
-                    f"Detected pypi package: {project_cloned.pypi_id} for project {project_cloned.name}."
-                )
-                project = project_cloned
+            project = (
+                probe_package(project, "pypi", project_name, probe_cache) or project
+            )
 
         if conda and not project.conda_id:
-            project_cloned = copy.deepcopy(project)
-            project_cloned.conda_id = "conda-forge/" + project_name
-            conda_integration.CondaIntegration().update_project_info(project_cloned)
+            detected_project = probe_package(
+                project, "conda", "conda-forge/" + project_name, probe_cache
+            )
             if (
-                project_cloned.conda_total_downloads
-                and project_cloned.conda_total_downloads > 2500
+                not detected_project
+                and project.pypi_id
+                and project.pypi_id.lower() != project_name
             ):
-                # only use this package if total downloads over X -> to prevent errors
-                log.info(
-                    f"Detected conda package: {project_cloned.conda_id} for project {project_cloned.name}."
-                )
-                project = project_cloned
-            elif not project_cloned.conda_total_downloads and project.pypi_id:
                 # Try again with pypi_id
-                project_cloned.conda_id = "conda-forge/" + project.pypi_id
-                conda_integration.CondaIntegration().update_project_info(project_cloned)
-                if (
-                    project_cloned.conda_total_downloads
-                    and project_cloned.conda_total_downloads > 2500
-                ):
-                    # only use this package if total downloads over X -> to prevent errors
-                    log.info(
-                        f"Detected conda package: {project_cloned.conda_id} for project {project_cloned.name}."
-                    )
-                    project = project_cloned
+                detected_project = probe_package(
+                    project, "conda", "conda-forge/" + project.pypi_id, probe_cache
+                )
+            project = detected_project or project
+
         if npm and not project.npm_id:
-            project_cloned = copy.deepcopy(project)
+            project = (
+                probe_package(project, "npm", project_name, probe_cache) or project
+            )
 
-            project_cloned.npm_id = project_name
-            npm_integration.NpmIntegration().update_project_info(project_cloned)
-            if (
-                project_cloned.npm_monthly_downloads
-                and project_cloned.npm_monthly_downloads > 500
-            ):
-                # only use this package if monthly downloads over X -> to prevent errors
-                log.info(
-                    f"Detected npm package: {project_cloned.npm_id} for project {project_cloned.name}."
-                )
-                project = project_cloned
         # recalculated projectrank
         project.projectrank = projects_collection.calc_projectrank(project)
-        updated_projects.append(project)
+        return project
+
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as executor:
+        updated_projects = [
+            project
+            for project in tqdm(
+                executor.map(instrumentation.bind_scope(extend_project), projects),
+                total=len(projects),
+            )
+            if project is not None
+        ]
     return [project.to_dict() for project in updated_projects]
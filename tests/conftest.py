@@ -0,0 +1,21 @@
+import httpx
+import pytest
+
+from best_of.integrations import http_client
+
+
+@pytest.fixture
+def mock_http(monkeypatch):
+    """Sends all requests of the shared HTTP client to a handler function."""
+
+    def install(handler):
+        monkeypatch.setattr(
+            http_client, "_client", httpx.Client(transport=httpx.MockTransport(handler))
+        )
+        monkeypatch.setattr(http_client, "_response_cache", None)
+        monkeypatch.setattr(http_client, "_value_cache", None)
+        monkeypatch.setattr(http_client, "_replay_server", None)
+        monkeypatch.setattr(http_client, "_recorder", None)
+        monkeypatch.setattr(http_client, "_max_retries", 0)
+
+    return install
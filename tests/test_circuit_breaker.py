@@ -0,0 +1,21 @@
+from best_of.integrations import circuit_breaker
+
+
+def test_circuit_breaker():
+    circuit_breaker.configure(failure_threshold=2, cooldown=60)
+    circuit_breaker.record_failure("example.org")
+    assert not circuit_breaker.is_open("example.org")
+
+    circuit_breaker.record_success("example.org")
+    circuit_breaker.record_failure("example.org")
+    assert not circuit_breaker.is_open("example.org")
+
+    circuit_breaker.record_failure("example.org")
+    assert circuit_breaker.is_open("example.org")
+    assert not circuit_breaker.is_open("other.org")
+
+    # Disabled circuit breaker
+    circuit_breaker.configure(failure_threshold=0, cooldown=60)
+    for _ in range(5):
+        circuit_breaker.record_failure("example.org")
+    assert not circuit_breaker.is_open("example.org")
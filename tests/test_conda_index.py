@@ -0,0 +1,21 @@
+import json
+
+from best_of.integrations import conda_index
+
+
+def test_package_exists(tmp_path):
+    with open(tmp_path / "conda-forge-index.json", "w") as f:
+        json.dump({"numpy": {"summary": "Array processing for numbers"}}, f)
+
+    conda_index.configure(["conda-forge"], str(tmp_path))
+    try:
+        assert conda_index.package_exists("conda-forge/NumPy")
+        assert conda_index.package_exists("conda-forge/not-a-package") is False
+        # Channels that are not indexed are unknown
+        assert conda_index.package_exists("anaconda/numpy") is None
+        assert (
+            conda_index.get_package_metadata("conda-forge/numpy").summary
+            == "Array processing for numbers"
+        )
+    finally:
+        conda_index.configure([], None)
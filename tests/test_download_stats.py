@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+import httpx
+
+from best_of.integrations import download_stats
+
+
+def test_monthly_downloads_fall_back_to_next_provider(mock_http, monkeypatch):
+    requested_hosts = []
+    today = datetime.now().strftime("%Y-%m-%d")
+    old_date = (datetime.now() - timedelta(days=60)).strftime("%Y-%m-%d")
+
+    def handler(request):
+        requested_hosts.append(request.url.host)
+        if request.url.host == "pypistats.org":
+            if "unavailable" in request.url.path:
+                raise httpx.ConnectError("unavailable", request=request)
+            if "missing" in request.url.path:
+                return httpx.Response(404)
+            return httpx.Response(200, json={"data": {"last_month": 100}})
+        # Only downloads of the last 30 days are counted
+        return httpx.Response(
+            200, json={"downloads": {today: {"1.0": 3, "2.0": 4}, old_date: {"1.0": 5}}}
+        )
+
+    mock_http(handler)
+    monkeypatch.setattr(download_stats, "_monthly_downloads", {})
+    monkeypatch.delenv(download_stats.ENV_PEPY_API_KEY, raising=False)
+
+    assert download_stats.get_monthly_downloads("numpy") == 100
+    # pepy is only used with an API key
+    assert download_stats.get_monthly_downloads("missing") is None
+    assert requested_hosts == ["pypistats.org", "pypistats.org"]
+
+    monkeypatch.setenv(download_stats.ENV_PEPY_API_KEY, "key")
+    assert download_stats.get_monthly_downloads("unavailable") == 7
+    assert download_stats.get_monthly_downloads("missing-too") == 7
+    assert requested_hosts[2:] == [
+        "pypistats.org",
+        "api.pepy.tech",
+        "pypistats.org",
+        "api.pepy.tech",
+    ]
+
+    # Statistics are only requested once per run
+    assert download_stats.get_monthly_downloads("unavailable") == 7
+    assert len(requested_hosts) == 6
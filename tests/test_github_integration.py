@@ -0,0 +1,238 @@
+import json
+import threading
+import time
+from datetime import datetime
+
+import httpx
+from addict import Dict
+
+from best_of.integrations import github_integration, http_client
+from best_of.integrations.github_integration import extract_dependents_counts
+from best_of.integrations.http_cache import ValueCache
+
+
+def test_extract_dependents_counts():
+    page = (
+        '<a href="?dependent_type=REPOSITORY">\n  <svg></svg>\n  12,345\n'
+        '  Repositories\n</a>\n<a href="?dependent_type=PACKAGE">\n  67\n'
+        "  Packages\n</a>\n" + "<div>1 Repositories</div>" * 100
+    )
+    # Counts are also found if they are split across chunks
+    chunks = [page[i : i + 7] for i in range(0, len(page), 7)]
+    counts = extract_dependents_counts(chunks)
+    assert counts.Repositories == 12345
+    assert counts.Packages == 67
+
+    assert not extract_dependents_counts(["<html>No dependents</html>"])
+
+
+def test_update_releases_requests_only_changed_releases(tmp_path, monkeypatch):
+    requested_ids = []
+
+    def request_releases(github_api_token, github_ids):
+        requested_ids.extend(github_ids)
+        return {
+            github_id: [{"tagName": "v1", "publishedAt": "2024-01-01"}]
+            for github_id in github_ids
+        }
+
+    monkeypatch.setattr(
+        github_integration, "request_releases_from_github_api", request_releases
+    )
+    monkeypatch.setattr(github_integration, "select_github_api_token", lambda: "key")
+    monkeypatch.setattr(http_client, "_value_cache", ValueCache(str(tmp_path)))
+
+    def probe(release_count, latest_release_date):
+        return Dict(
+            releaseProbe={
+                "totalCount": release_count,
+                "nodes": [{"createdAt": latest_release_date}],
+            }
+        )
+
+    github_infos = {"org/a": probe(1, "2024-01-01"), "org/b": probe(0, None)}
+    github_integration.update_releases(github_infos)
+    assert requested_ids == ["org/a"]
+    assert github_infos["org/a"].releases.nodes[0].tagName == "v1"
+    assert github_infos["org/b"].releases.nodes == []
+
+    # Unchanged releases are taken from the cache
+    github_infos = {"org/a": probe(1, "2024-01-01")}
+    github_integration.update_releases(github_infos)
+    assert requested_ids == ["org/a"]
+    assert github_infos["org/a"].releases.nodes[0].tagName == "v1"
+
+    github_integration.update_releases({"org/a": probe(2, "2024-02-01")})
+    assert requested_ids == ["org/a", "org/a"]
+
+    # Unchanged releases are reused for weekly runs as well
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 8 * 24 * 60 * 60)
+    github_infos = {"org/a": probe(2, "2024-02-01")}
+    github_integration.update_releases(github_infos)
+    assert requested_ids == ["org/a", "org/a"]
+    assert github_infos["org/a"].releases.nodes[0].tagName == "v1"
+
+
+def test_releases_are_only_probed_with_value_cache(tmp_path, monkeypatch):
+    queries = []
+
+    def post(url, json, **kwargs):
+        queries.append(json["query"])
+        return httpx.Response(200, json={"data": {"repo0": None}})
+
+    monkeypatch.setattr(http_client, "post", post)
+
+    monkeypatch.setattr(http_client, "_value_cache", None)
+    github_integration.request_metadata_batch_from_github_api(
+        "key", ["org/a"], datetime.now()
+    )
+    assert "...releaseFields" in queries[-1]
+    assert "releaseProbe" not in queries[-1]
+
+    monkeypatch.setattr(http_client, "_value_cache", ValueCache(str(tmp_path)))
+    github_integration.request_metadata_batch_from_github_api(
+        "key", ["org/a"], datetime.now()
+    )
+    assert "...releaseProbeFields" in queries[-1]
+    assert "releaseAssets" not in queries[-1]
+
+
+def get_graphql_repo_ids(request):
+    variables = json.loads(request.content)["variables"]
+    return [
+        variables[f"owner{i}"] + "/" + variables[f"repo{i}"]
+        for i in range(len([key for key in variables if key.startswith("owner")]))
+    ]
+
+
+def test_request_metadata_batch_maps_aliases(mock_http):
+    def handler(request):
+        assert get_graphql_repo_ids(request) == ["org/a", "org/missing", "org/b"]
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    "repo0": {"nameWithOwner": "org/a"},
+                    "repo1": None,
+                    "repo2": {"nameWithOwner": "org/b"},
+                    "rateLimit": {"cost": 3, "remaining": 100, "resetAt": None},
+                },
+                "errors": [{"type": "NOT_FOUND", "path": ["repo1"]}],
+            },
+        )
+
+    mock_http(handler)
+    github_infos, cost = github_integration.request_metadata_batch_from_github_api(
+        "key", ["org/a", "org/missing", "org/b"], datetime.now()
+    )
+    assert cost == 3
+    assert github_infos["org/a"].nameWithOwner == "org/a"
+    assert github_infos["org/b"].nameWithOwner == "org/b"
+    # Missing repos are returned as None
+    assert "org/missing" in github_infos and github_infos["org/missing"] is None
+
+
+def test_request_metadata_batch_skips_failed_repos(mock_http):
+    def handler(request):
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    "repo0": {"nameWithOwner": "org/a"},
+                    "repo1": None,
+                    "rateLimit": {"cost": 2, "remaining": 100, "resetAt": None},
+                },
+                "errors": [{"type": "SERVICE_UNAVAILABLE", "path": ["repo1"]}],
+            },
+        )
+
+    mock_http(handler)
+    github_infos, _ = github_integration.request_metadata_batch_from_github_api(
+        "key", ["org/a", "org/b"], datetime.now()
+    )
+    # Repos that failed for other reasons are requested again later
+    assert list(github_infos) == ["org/a"]
+
+
+def test_prefetch_github_info_adapts_batch_size(mock_http, monkeypatch):
+    batch_sizes = []
+
+    def handler(request):
+        github_ids = get_graphql_repo_ids(request)
+        batch_sizes.append(len(github_ids))
+        if len(github_ids) > 4:
+            # Too expensive queries fail
+            return httpx.Response(502)
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    **{
+                        f"repo{i}": {"nameWithOwner": github_id}
+                        for i, github_id in enumerate(github_ids)
+                    },
+                    # Every repo costs 20 points -> 2 repos per batch
+                    "rateLimit": {
+                        "cost": 20 * len(github_ids),
+                        "remaining": 1000,
+                        "resetAt": None,
+                    },
+                }
+            },
+        )
+
+    monkeypatch.setenv("GITHUB_API_KEY", "key")
+    mock_http(handler)
+    github_ids = [f"org/repo-{i}" for i in range(9)]
+    github_integration.prefetch_github_info(github_ids)
+
+    # 9 -> failed, 5 -> failed, 2 (adapted to the cost), 2, 2, 2, 1
+    assert batch_sizes == [9, 5, 2, 2, 2, 2, 1]
+    assert list(github_integration._prefetched_github_info) == github_ids
+
+
+def test_prefetch_contributor_counts_falls_back_to_memoized_counts(
+    tmp_path, mock_http, monkeypatch
+):
+    status_codes = {}
+    requested_ids = []
+    lock = threading.Lock()
+
+    def handler(request):
+        github_id = request.url.path.split("/repos/")[1].split("/contributors")[0]
+        with lock:
+            requested_ids.append(github_id)
+        if status_codes[github_id] != 200:
+            return httpx.Response(status_codes[github_id])
+        return httpx.Response(
+            200,
+            headers={
+                "Link": f'<https://api.github.com/repos/{github_id}/contributors?page=12>; rel="last"'
+            },
+            json=[],
+        )
+
+    monkeypatch.setenv("GITHUB_API_KEY", "key")
+    mock_http(handler)
+    monkeypatch.setattr(http_client, "_value_cache", ValueCache(str(tmp_path)))
+
+    status_codes.update({"org/a": 200, "org/b": 202})
+    github_integration.prefetch_contributor_counts(
+        ["org/a", "org/b", "org/a"], max_workers=2
+    )
+    assert sorted(requested_ids) == ["org/a", "org/b"]
+    assert github_integration._prefetched_contributor_counts == {
+        "org/a": 12,
+        # GitHub is still computing the contributors and there is no previous count
+        "org/b": None,
+    }
+
+    # The count of the previous call is used while the contributors are computed
+    status_codes.update({"org/a": 202, "org/b": 503})
+    github_integration.prefetch_contributor_counts(["org/a", "org/b"], max_workers=2)
+    assert sorted(requested_ids) == ["org/a", "org/a", "org/b", "org/b"]
+    assert github_integration._prefetched_contributor_counts == {
+        "org/a": 12,
+        "org/b": None,
+    }
@@ -0,0 +1,35 @@
+from best_of.integrations.http_cache import ResponseCache, ValueCache
+
+
+def test_response_cache(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_size=1024)
+    cache.set("https://example.org/a", {"ETag": '"v1"'}, b"content")
+
+    cached_response = cache.get("https://example.org/a")
+    assert cached_response.content == b"content"
+    assert cached_response.etag == '"v1"'
+    assert cache.get("https://example.org/b") is None
+
+    # Cached responses are loaded again after a restart
+    assert ResponseCache(str(tmp_path), max_size=1024).get("https://example.org/a")
+
+
+def test_response_cache_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_size=1000)
+    cache.set("https://example.org/a", {}, b"a" * 400)
+    cache.set("https://example.org/b", {}, b"b" * 400)
+    # Use a, so that b is the least recently used response
+    cache.get("https://example.org/a")
+    cache.set("https://example.org/c", {}, b"c" * 400)
+
+    assert cache.get("https://example.org/a")
+    assert cache.get("https://example.org/b") is None
+    assert cache.get("https://example.org/c")
+
+
+def test_value_cache(tmp_path):
+    cache = ValueCache(str(tmp_path))
+    cache.set("key", {"count": 1})
+    assert cache.get("key", ttl=60) == {"count": 1}
+    assert cache.get("key", ttl=0) is None
+    assert cache.get("other-key", ttl=60) is None
@@ -0,0 +1,51 @@
+import httpx
+
+from best_of.integrations.http_replay import CassetteStore, ReplayServer, redact_url
+
+
+def test_replay_server(tmp_path):
+    cassette_store = CassetteStore(str(tmp_path))
+    cassette_store.record(
+        "POST",
+        "https://api.github.com/graphql",
+        b'{"since": "2021-01-01T10:00:00.123"}',
+        200,
+        {"Content-Type": "application/json"},
+        b'{"data": {}}',
+    )
+    cassette_store.record("HEAD", "https://pypi.org/simple/numpy/", b"", 200, {}, b"")
+
+    replay_server = ReplayServer(cassette_store)
+    replay_server.start()
+    try:
+        # Timestamps in the request body are ignored
+        response = httpx.post(
+            replay_server.get_url("https://api.github.com/graphql"),
+            content=b'{"since": "2022-02-02T12:00:00.456"}',
+        )
+        assert response.status_code == 200
+        assert response.json() == {"data": {}}
+        assert response.headers["content-type"] == "application/json"
+
+        response = httpx.get(replay_server.get_url("https://pypi.org/pypi/x/json"))
+        assert response.status_code == 404
+
+        response = httpx.head(replay_server.get_url("https://pypi.org/simple/numpy/"))
+        assert response.status_code == 200
+
+        replay_server.error_rate = 1.0
+        response = httpx.post(
+            replay_server.get_url("https://api.github.com/graphql"),
+            content=b'{"since": "2021-01-01T10:00:00.123"}',
+        )
+        assert response.status_code == 503
+    finally:
+        replay_server.stop()
+
+
+def test_redact_url():
+    assert (
+        redact_url("https://libraries.io/api/pypi/numpy?api_key=secret&page=2")
+        == "https://libraries.io/api/pypi/numpy?api_key=%3Credacted%3E&page=2"
+    )
+    assert redact_url("https://pypi.org/pypi/x/json") == "https://pypi.org/pypi/x/json"
@@ -0,0 +1,66 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from best_of import instrumentation
+from best_of.integrations import http_client
+
+
+def test_measure(tmp_path):
+    instrumentation.reset()
+    with instrumentation.measure("pypi", project="numpy"):
+        instrumentation.record(requests=1, bytes=100)
+        with instrumentation.measure("libio"):
+            instrumentation.record(requests=2)
+        # The same scope is not measured twice
+        with instrumentation.measure("pypi"):
+            instrumentation.record(retries=1)
+
+    report = {
+        (entry["project"], entry["integration"]): entry
+        for entry in instrumentation.get_report()
+    }
+    assert report[("numpy", "pypi")]["requests"] == 1
+    assert report[("numpy", "pypi")]["bytes"] == 100
+    assert report[("numpy", "pypi")]["retries"] == 1
+    assert report[("numpy", "libio")]["requests"] == 2
+    assert (
+        report[("numpy", "pypi")]["wall_time"]
+        >= report[("numpy", "libio")]["wall_time"]
+    )
+
+    instrumentation.write_report(str(tmp_path), "2021-01-01")
+    with open(tmp_path / "2021-01-01_run-report.json") as f:
+        assert len(json.load(f)) == 2
+    with open(tmp_path / "2021-01-01_run-report.prom") as f:
+        assert 'best_of_integration_requests_total{integration="libio"} 2' in f.read()
+
+
+def test_bind_scope_records_requests_of_worker_threads(mock_http):
+    mock_http(lambda request: httpx.Response(200, content=b"data"))
+    instrumentation.reset()
+
+    @instrumentation.measured("libio")
+    def request_libio(url):
+        return http_client.get(url)
+
+    with instrumentation.measure("pypi", project="numpy"):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(
+                executor.map(
+                    instrumentation.bind_scope(http_client.get),
+                    ["https://pypi.org/a", "https://pypi.org/b"],
+                )
+            )
+            executor.submit(
+                instrumentation.bind_scope(request_libio), "https://libraries.io/a"
+            ).result()
+
+    report = {
+        (entry["project"], entry["integration"]): entry
+        for entry in instrumentation.get_report()
+    }
+    assert report[("numpy", "pypi")]["requests"] == 2
+    assert report[("numpy", "libio")]["requests"] == 1
+    assert ("", instrumentation.UNMEASURED_INTEGRATION) not in report
@@ -0,0 +1,73 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from best_of.integrations.libio_integration import LibrariesIOClient
+
+
+def test_concurrent_requests_are_coalesced(mock_http):
+    requested_paths = []
+    lock = threading.Lock()
+
+    def handler(request):
+        with lock:
+            requested_paths.append(request.url.path)
+        time.sleep(0.1)
+        if request.url.path == "/api/pypi/missing":
+            return httpx.Response(404)
+        return httpx.Response(200, json={"name": "numpy"})
+
+    mock_http(handler)
+    client = LibrariesIOClient("key")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(client.get, ["/pypi/numpy"] * 8))
+
+    assert results == [{"name": "numpy"}] * 8
+    assert requested_paths == ["/api/pypi/numpy"]
+
+    # Repeated and missing resources are also only requested once
+    assert client.get("/pypi/numpy") == {"name": "numpy"}
+    assert client.get("/pypi/missing") is None
+    assert client.get("/pypi/missing") is None
+    assert requested_paths == ["/api/pypi/numpy", "/api/pypi/missing"]
+
+
+def test_failed_requests_are_retried(mock_http):
+    status_codes = [400, 200]
+
+    def handler(request):
+        return httpx.Response(status_codes.pop(0), json={"name": "numpy"})
+
+    mock_http(handler)
+    client = LibrariesIOClient("key")
+    with pytest.raises(httpx.HTTPStatusError):
+        client.get("/pypi/numpy")
+    assert client.get("/pypi/numpy") == {"name": "numpy"}
+    assert not status_codes
+
+
+def test_bulk_looks_up_every_item_once():
+    looked_up_items = []
+
+    def lookup(item):
+        looked_up_items.append(item)
+        if item == "failing":
+            raise ValueError(item)
+        return item.upper()
+
+    client = LibrariesIOClient("key")
+    results = {
+        item: (data, exception)
+        for item, data, exception in client.bulk(
+            lookup, ["a", "b", "a", "failing"], max_workers=2
+        )
+    }
+
+    assert sorted(looked_up_items) == ["a", "b", "failing"]
+    assert results["a"] == ("A", None)
+    assert results["b"] == ("B", None)
+    assert results["failing"][0] is None
+    assert isinstance(results["failing"][1], ValueError)
@@ -0,0 +1,54 @@
+import threading
+from urllib.parse import unquote
+
+import httpx
+
+from best_of.integrations import npm_integration
+
+
+def test_prefetch_monthly_downloads(mock_http):
+    requested_packages = []
+    lock = threading.Lock()
+
+    def handler(request):
+        npm_ids = [
+            unquote(npm_id)
+            for npm_id in request.url.raw_path.decode()
+            .split("/last-month/")[1]
+            .split(",")
+        ]
+        with lock:
+            requested_packages.append(npm_ids)
+        if len(npm_ids) == 1:
+            return httpx.Response(200, json={"downloads": 5, "package": npm_ids[0]})
+        return httpx.Response(
+            200,
+            json={
+                npm_id: (
+                    None
+                    if npm_id == "missing"
+                    else {"downloads": len(npm_id), "package": npm_id}
+                )
+                for npm_id in npm_ids
+            },
+        )
+
+    mock_http(handler)
+    unscoped_ids = [f"package-{i}" for i in range(130)] + ["missing"]
+    npm_integration.prefetch_monthly_downloads(
+        unscoped_ids + ["@scope/a", "@scope/b", "package-0"], max_workers=4
+    )
+
+    # Unscoped packages are requested in bulks, scoped packages one by one
+    bulk_requests = [npm_ids for npm_ids in requested_packages if len(npm_ids) > 1]
+    assert sorted(len(npm_ids) for npm_ids in bulk_requests) == [3, 128]
+    assert sorted(npm_ids for npm_ids in requested_packages if len(npm_ids) == 1) == [
+        ["@scope/a"],
+        ["@scope/b"],
+    ]
+
+    assert npm_integration.get_monthly_downloads("package-10") == len("package-10")
+    assert npm_integration.get_monthly_downloads("@scope/a") == 5
+    assert npm_integration.package_exists("missing") is False
+    assert npm_integration.package_exists("package-129")
+    assert len(requested_packages) == 4
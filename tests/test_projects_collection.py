@@ -0,0 +1,292 @@
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+from addict import Dict
+
+from best_of import default_config, integrations, projects_collection
+from best_of.integrations.base_integration import BaseIntegration
+from best_of.integrations.conda_integration import CondaIntegration
+
+
+def test_get_fresh_metrics():
+    config = default_config.prepare_configuration(
+        {"metrics_refresh_days": {"contributor_count": 7, "star_count": 1}}
+    )
+    previous_info = Dict(
+        {
+            "contributor_count": 10,
+            "star_count": 100,
+            "collected_at": datetime.now() - timedelta(days=2),
+        }
+    )
+
+    fresh_metrics = projects_collection.get_fresh_metrics(previous_info, config)
+    assert fresh_metrics.contributor_count == 10
+    assert "star_count" not in fresh_metrics
+    assert not projects_collection.get_fresh_metrics(None, config)
+
+
+def test_collection_journal(tmp_path):
+    journal_path = str(tmp_path / "checkpoint.jsonl")
+    updated_at = datetime(2021, 3, 1, 12, 30)
+    with open(journal_path, "a") as f:
+        projects_collection.append_to_collection_journal(
+            f, Dict({"name": "Best-Of", "star_count": 5, "updated_at": updated_at})
+        )
+        # Incomplete line of an interrupted run
+        f.write('{"name": "other", "sta')
+
+    journaled_projects = projects_collection.load_collection_journal(journal_path)
+    assert list(journaled_projects) == ["best-of"]
+    assert journaled_projects["best-of"].star_count == 5
+    assert journaled_projects["best-of"].updated_at == updated_at
+
+
+def test_get_collection_priority():
+    placing_thresholds = {"ml": (20, 10)}
+    collected_at = datetime(2021, 3, 1)
+
+    def get_priority(**previous_info):
+        return projects_collection.get_collection_priority(
+            Dict(previous_info, collected_at=collected_at), placing_thresholds
+        )[0]
+
+    assert projects_collection.get_collection_priority(None, placing_thresholds)[0] == 0
+    assert get_priority(carried_over=True, category="ml", projectrank=30) == 1
+    assert get_priority(category="ml", projectrank=11) == 2
+    assert get_priority(category="ml", projectrank=30) == 3
+
+
+def test_update_via_package_managers(monkeypatch):
+    class TestIntegration(BaseIntegration):
+        def __init__(self, name, delay):
+            self._name = name
+            self.delay = delay
+
+        @property
+        def name(self):
+            return self._name
+
+        def update_project_info(self, project_info):
+            self.apply_project_info(project_info, self.fetch_project_info(project_info))
+
+        def fetch_project_info(self, project_info):
+            time.sleep(self.delay)
+            return self.name
+
+        def apply_project_info(self, project_info, fetched_info):
+            if not project_info.description:
+                project_info.description = fetched_info
+            project_info.applied.append(fetched_info)
+
+        def generate_md_details(self, project, configuration):
+            return ""
+
+    monkeypatch.setattr(
+        integrations,
+        "AVAILABLE_PACKAGE_MANAGER",
+        [TestIntegration("first", 0.05), TestIntegration("second", 0)],
+    )
+    config = default_config.prepare_configuration({"max_integration_workers": 2})
+    project_info = Dict({"name": "test", "applied": []})
+
+    projects_collection.update_via_package_managers(project_info, config)
+    # Applied in the order of the integrations, regardless of the fetch duration
+    assert project_info.applied == ["first", "second"]
+    assert project_info.description == "first"
+
+
+def test_restore_projects_info(tmp_path):
+    history_file = str(tmp_path / "2021-03-01_projects.csv")
+    pd.DataFrame(
+        [
+            {
+                "name": "Best-Of",
+                "category": "old",
+                "star_count": 100,
+                "projectrank": 12,
+                "trending": 2,
+            }
+        ]
+    ).to_csv(history_file)
+
+    config = default_config.prepare_configuration({})
+    categories = default_config.prepare_categories([{"category": "ml"}])
+    projects = projects_collection.restore_projects_info(
+        [{"name": "Best-Of", "category": "ml"}, {"name": "new"}],
+        categories,
+        config,
+        history_file,
+    )
+
+    assert projects[0].name == "Best-Of"
+    assert projects[0].star_count == 100
+    # Values of the projects yaml take precedence
+    assert projects[0].category == "ml"
+    assert "trending" not in projects[0]
+    assert projects[1].name == "new"
+
+
+def test_carry_over_project_info_recalculates_groups():
+    projects_history = {
+        "group": Dict(name="group", group=True, group_id="g", star_count=150),
+        "member": Dict(name="member", group_id="g", star_count=150),
+    }
+    config = default_config.prepare_configuration({})
+    categories = default_config.prepare_categories([])
+    projects = [
+        projects_collection.carry_over_project_info(
+            project, categories, config, projects_history.get(project["name"])
+        )
+        for project in [
+            {"name": "group", "group": True, "group_id": "g"},
+            {"name": "member", "group_id": "g"},
+        ]
+    ]
+    projects_collection.calc_grouped_metrics(projects, config)
+
+    assert projects[1].carried_over
+    assert not projects[0].carried_over
+    # The group metrics are not added to the carried over metrics of the group
+    assert projects[0].star_count == 150
+
+
+def test_apply_filters_uses_reference_date():
+    config = default_config.prepare_configuration({"require_license": False})
+    project_info = Dict(
+        {
+            "name": "Best-Of",
+            "homepage": "https://github.com/best-of-lists/best-of",
+            "description": "A ranked list of awesome projects.",
+            "last_commit_pushed_at": datetime(2021, 1, 1),
+        }
+    )
+
+    projects_collection.apply_filters(project_info, config)
+    assert not project_info.show
+
+    # Old history files are rendered as of their collection date
+    config.reference_date = projects_collection.get_history_file_date(
+        "2021-03-01_projects.csv"
+    )
+    projects_collection.apply_filters(project_info, config)
+    assert project_info.show
+
+
+def test_collect_projects_info_only_prefetches_within_time_budget(monkeypatch):
+    clock = [0.0]
+    prefetched_ids = []
+
+    def collect_project_info(project, categories, config, previous_info=None):
+        # Every collection takes 6 seconds
+        clock[0] += 6
+        return projects_collection.restore_project_info(project, categories, config)
+
+    monkeypatch.setattr(projects_collection.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(projects_collection, "COLLECTION_CHUNK_SIZE", 2)
+    monkeypatch.setattr(
+        projects_collection, "collect_project_info", collect_project_info
+    )
+    monkeypatch.setattr(integrations, "AVAILABLE_PACKAGE_MANAGER", [])
+    monkeypatch.setattr(
+        projects_collection.github_integration,
+        "prefetch_github_info",
+        prefetched_ids.extend,
+    )
+    monkeypatch.setattr(
+        projects_collection.github_integration,
+        "prefetch_contributor_counts",
+        lambda github_ids, max_workers: None,
+    )
+
+    config = default_config.prepare_configuration({"time_budget": 10})
+    projects = [
+        {"name": f"project-{i}", "github_id": f"org/project-{i}"} for i in range(5)
+    ]
+    projects_info = projects_collection.collect_projects_info(
+        projects, default_config.prepare_categories([]), config
+    )
+
+    # The budget is exceeded after the first chunk
+    assert prefetched_ids == ["org/project-0", "org/project-1"]
+    assert len(projects_info) == 5
+
+
+def test_collect_projects_info_configures_conda_index_once(monkeypatch):
+    configured_channels = []
+
+    monkeypatch.setattr(projects_collection, "COLLECTION_CHUNK_SIZE", 2)
+    monkeypatch.setattr(
+        projects_collection,
+        "collect_project_info",
+        lambda project, categories, config, previous_info=None: (
+            projects_collection.restore_project_info(project, categories, config)
+        ),
+    )
+    monkeypatch.setattr(
+        projects_collection.conda_index,
+        "configure",
+        lambda channels, index_folder: configured_channels.append(channels),
+    )
+    monkeypatch.setattr(integrations, "AVAILABLE_PACKAGE_MANAGER", [CondaIntegration()])
+    monkeypatch.setattr(
+        projects_collection.github_integration,
+        "prefetch_github_info",
+        lambda github_ids: None,
+    )
+    monkeypatch.setattr(
+        projects_collection.github_integration,
+        "prefetch_contributor_counts",
+        lambda github_ids, max_workers: None,
+    )
+
+    config = default_config.prepare_configuration(
+        {"time_budget": 1000, "conda_channel_index": ["conda-forge"]}
+    )
+    projects = [{"name": f"project-{i}", "conda_id": f"project-{i}"} for i in range(5)]
+    projects_collection.collect_projects_info(
+        projects, default_config.prepare_categories([]), config
+    )
+
+    # The channel indices are not discarded between the collected chunks
+    assert configured_channels == [["conda-forge"]]
+
+
+def test_collect_projects_info_concurrently_matches_sequential(monkeypatch):
+    def collect_project_info(project, categories, config, previous_info=None):
+        # Later projects finish first
+        time.sleep(0.01 * (10 - int(project["name"].split("-")[1])))
+        project_info = projects_collection.restore_project_info(
+            project, categories, config
+        )
+        project_info.star_count = int(project["name"].split("-")[1]) % 3
+        return project_info
+
+    monkeypatch.setattr(
+        projects_collection, "collect_project_info", collect_project_info
+    )
+    monkeypatch.setattr(integrations, "AVAILABLE_PACKAGE_MANAGER", [])
+    monkeypatch.setattr(
+        projects_collection.github_integration,
+        "prefetch_github_info",
+        lambda github_ids: None,
+    )
+    monkeypatch.setattr(
+        projects_collection.github_integration,
+        "prefetch_contributor_counts",
+        lambda github_ids, max_workers: None,
+    )
+
+    projects = [{"name": f"project-{i}"} for i in range(10)]
+    categories = default_config.prepare_categories([])
+    sequential_projects = projects_collection.collect_projects_info(
+        projects, categories, default_config.prepare_configuration({"max_workers": 1})
+    )
+    concurrent_projects = projects_collection.collect_projects_info(
+        projects, categories, default_config.prepare_configuration({"max_workers": 4})
+    )
+
+    assert [project.to_dict() for project in concurrent_projects] == [
+        project.to_dict() for project in sequential_projects
+    ]
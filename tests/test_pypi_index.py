@@ -0,0 +1,15 @@
+from best_of.integrations import pypi_index
+
+
+def test_package_exists(tmp_path):
+    with open(tmp_path / "pypi-index.txt", "w") as f:
+        f.write("best-of\nnumpy")
+
+    pypi_index.configure(True, str(tmp_path))
+    try:
+        assert pypi_index.package_exists("Best_Of")
+        assert pypi_index.package_exists("not-a-package") is False
+    finally:
+        pypi_index.configure(False)
+    # The index is not used if disabled
+    assert pypi_index.package_exists("numpy") is None
@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from best_of.integrations import rate_limit
+
+
+def test_token_bucket():
+    bucket = rate_limit.TokenBucket(rate=1, capacity=2)
+    # Burst until the capacity is reached
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.9 < bucket.reserve() <= 1
+
+
+def test_rate_limit_stays_within_limit_in_first_period(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: clock[0])
+    limit = rate_limit.RateLimit(30, 60)
+
+    # Times at which the reserved requests can be sent
+    send_times = [clock[0] + limit.bucket.reserve() for _ in range(60)]
+    assert len([t for t in send_times if t < clock[0] + 60]) <= 30
+    assert send_times[0] == clock[0]
+
+
+def test_update_from_headers():
+    assert rate_limit.update_from_headers("test-service", 429, {"retry-after": "2"})
+    blocked_until = rate_limit.get_rate_limit("test-service").blocked_until
+    assert 1 < blocked_until - time.time() <= 2
+
+    assert not rate_limit.update_from_headers("test-service-2", 200, {})
+    assert rate_limit.get_rate_limit("test-service-2").blocked_until == 0
+
+
+def test_parse_timestamp():
+    assert rate_limit.parse_timestamp("1700000000") == 1700000000
+    assert rate_limit.parse_timestamp("2023-11-14T22:13:20Z") == 1700000000
+    assert rate_limit.parse_timestamp(None) is None
+
+
+def test_select_service():
+    rate_limit.update_quota("token-a", 10, None)
+    rate_limit.update_quota("token-b", 100, None)
+    assert rate_limit.select_service(["token-a", "token-b"]) == "token-b"
+
+    # Exhausted services are skipped
+    rate_limit.update_quota("token-b", 0, time.time() + 60)
+    assert rate_limit.select_service(["token-a", "token-b"]) == "token-a"
+
+    # If all services are blocked, the service that is available first is used
+    rate_limit.update_quota("token-a", 0, time.time() + 120)
+    assert rate_limit.select_service(["token-a", "token-b"]) == "token-b"
+
+
+def test_acquire_respects_deadline():
+    rate_limit.get_rate_limit("deadline-service").block_until(time.time() + 60)
+    rate_limit.set_deadline(time.monotonic() + 5)
+    try:
+        start_time = time.monotonic()
+        with pytest.raises(rate_limit.DeadlineExceededError):
+            rate_limit.acquire("deadline-service")
+        # The request is rejected instead of waiting for the rate limit
+        assert time.monotonic() - start_time < 1
+        assert rate_limit.acquire("other-service") == 0
+
+        # Rejected requests do not take a token
+        limit = rate_limit.RateLimit(10, 60)
+        limit.bucket.tokens = 0.0
+        with pytest.raises(rate_limit.DeadlineExceededError):
+            limit.acquire()
+        assert limit.bucket.tokens >= 0
+    finally:
+        rate_limit.set_deadline(None)
@@ -3,3 +3,9 @@ from best_of import utils
 
 def test_clean_whitespaces():
     assert utils.clean_whitespaces("test  foo") == "test foo"
+
+
+def test_normalize_pypi_name():
+    assert utils.normalize_pypi_name("Best_Of.Generator") == "best-of-generator"
+    assert utils.normalize_pypi_name("zope..interface") == "zope-interface"
+    assert utils.normalize_pypi_name(" NumPy ") == "numpy"
@@ -0,0 +1,208 @@
+from urllib.parse import unquote
+
+import httpx
+from addict import Dict
+
+from best_of import yaml_generation
+from best_of.integrations.http_cache import ValueCache
+
+
+def test_probe_package_caches_misses(tmp_path, monkeypatch):
+    probes = []
+
+    def probe_pypi_package(project, pypi_id):
+        probes.append(pypi_id)
+        if pypi_id == "found":
+            return Dict(project, pypi_id=pypi_id), False
+        return None, pypi_id == "missing"
+
+    monkeypatch.setitem(yaml_generation.PACKAGE_PROBES, "pypi", probe_pypi_package)
+    probe_cache = ValueCache(str(tmp_path))
+    project = Dict({"name": "test"})
+
+    for _ in range(2):
+        assert not yaml_generation.probe_package(
+            project, "pypi", "missing", probe_cache
+        )
+        # Failed probes are not cached
+        assert not yaml_generation.probe_package(
+            project, "pypi", "unknown", probe_cache
+        )
+    assert yaml_generation.probe_package(project, "pypi", "found", probe_cache)
+    assert probes == ["missing", "unknown", "unknown", "found"]
+
+
+def test_get_projects_from_org_stops_below_min_stars(monkeypatch):
+    pages = [
+        ([("org/a", 50), ("org/b", 40)], True),
+        ([("org/c", 31), ("org/d", 30)], True),
+        ([("org/e", 10)], False),
+    ]
+    cursors = []
+
+    def post(url, json, **kwargs):
+        cursor = json["variables"]["cursor"]
+        cursors.append(cursor)
+        nodes, has_next_page = pages[len(cursors) - 1]
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    "organization": {
+                        "repositories": {
+                            "nodes": [
+                                {"nameWithOwner": name, "stargazerCount": stars}
+                                for name, stars in nodes
+                            ],
+                            "pageInfo": {
+                                "hasNextPage": has_next_page,
+                                "endCursor": "page" + str(len(cursors)),
+                            },
+                        }
+                    }
+                }
+            },
+        )
+
+    monkeypatch.setattr(
+        yaml_generation.github_integration, "select_github_api_token", lambda: "key"
+    )
+    monkeypatch.setattr(yaml_generation.http_client, "post", post)
+
+    assert yaml_generation.get_projects_from_org("org", min_stars=30) == [
+        "org/a",
+        "org/b",
+        "org/c",
+    ]
+    # The last page is not requested
+    assert cursors == [None, "page1"]
+
+
+def test_collect_github_projects_uses_min_stars_of_org_discovery(monkeypatch):
+    star_counts = {"org/a": 31, "org/b": 30, "org/c": 31}
+    collected_ids = []
+
+    def update_via_github(project):
+        collected_ids.append(project.github_id)
+        project.github_url = "https://github.com/" + project.github_id
+        project.name = project.github_id.split("/")[1]
+        # The star count changed since the prefetch
+        project.star_count = 30 if project.github_id == "org/c" else 31
+
+    github_integration = yaml_generation.github_integration
+    monkeypatch.setattr(github_integration, "prefetch_github_info", lambda ids: None)
+    monkeypatch.setattr(
+        github_integration, "get_prefetched_star_count", star_counts.get
+    )
+    monkeypatch.setattr(
+        github_integration, "prefetch_contributor_counts", lambda ids, workers: None
+    )
+    monkeypatch.setattr(github_integration, "update_via_github", update_via_github)
+
+    projects = yaml_generation.collect_github_projects(list(star_counts), min_stars=30)
+
+    # Repos with exactly `min_stars` stars are skipped, like in get_projects_from_org
+    assert sorted(collected_ids) == ["org/a", "org/c"]
+    assert [project["github_id"] for project in projects] == ["org/a"]
+
+
+def test_extract_github_projects_requests_new_repos_once(tmp_path, monkeypatch):
+    requested_ids = []
+
+    def update_via_github(project):
+        requested_ids.append(project.github_id)
+        project.name = project.github_id.split("/")[1]
+        project.github_url = "https://github.com/" + project.github_id
+
+    monkeypatch.setattr(
+        yaml_generation.github_integration, "update_via_github", update_via_github
+    )
+    monkeypatch.setattr(
+        yaml_generation.projects_collection, "calc_projectrank", lambda project: 1
+    )
+    input_file = tmp_path / "awesome-list.md"
+    input_file.write_text(
+        "- https://github.com/org/a\n"
+        "- https://github.com/org/b and https://github.com/Org/A/\n"
+        "- https://github.com/org/existing\n"
+        "- https://github.com/org/excluded\n"
+    )
+
+    projects = yaml_generation.extract_github_projects(
+        [str(input_file), "https://github.com/org/b https://github.com/org/c"],
+        excluded_github_ids=["org/excluded"],
+        existing_projects=[{"name": "existing", "github_id": "org/existing"}],
+    )
+
+    assert requested_ids == ["org/a", "org/b", "org/c"]
+    assert [project["name"] for project in projects] == ["existing", "a", "b", "c"]
+
+
+def test_extract_new_requirements_joins_continuation_lines(tmp_path):
+    requirements_file = tmp_path / "requirements.txt"
+    requirements_file.write_text(
+        "numpy==1.0 \\\n"
+        "    --hash=sha256:abc \\\n"
+        "    --hash=sha256:def\n"
+        "# comment\n"
+        "requests[socks] \\\n"
+        "    >=2.0\n"
+        "NumPy\n"
+    )
+    assert list(
+        yaml_generation._extract_new_requirements([str(requirements_file)], set())
+    ) == ["numpy", "requests"]
+
+
+def test_probe_conda_package_only_misses_missing_packages(monkeypatch):
+    status_codes = {"conda-forge/missing": 404, "conda-forge/unavailable": 503}
+
+    def get(url, **kwargs):
+        return httpx.Response(status_codes[url.split("/package/")[1]])
+
+    monkeypatch.setattr(yaml_generation.conda_integration.http_client, "get", get)
+    monkeypatch.setattr(
+        yaml_generation.conda_integration.libio_integration,
+        "is_activated",
+        lambda: False,
+    )
+    project = Dict({"name": "test"})
+
+    assert yaml_generation._probe_conda_package(project, "conda-forge/missing") == (
+        None,
+        True,
+    )
+    assert yaml_generation._probe_conda_package(project, "conda-forge/unavailable") == (
+        None,
+        False,
+    )
+
+
+def test_probe_npm_package_only_caches_missing_packages(tmp_path, mock_http):
+    status_codes = {"@scope/missing": 404, "@scope/unavailable": 500}
+    requested_packages = []
+
+    def handler(request):
+        npm_id = unquote(request.url.raw_path.decode().split("/last-month/")[1])
+        requested_packages.append(npm_id)
+        return httpx.Response(status_codes[npm_id])
+
+    mock_http(handler)
+    yaml_generation.npm_integration.prefetch_monthly_downloads(
+        list(status_codes), max_workers=2
+    )
+    assert yaml_generation.npm_integration.package_exists("@scope/missing") is False
+    assert yaml_generation.npm_integration.package_exists("@scope/unavailable") is None
+
+    probe_cache = ValueCache(str(tmp_path))
+    project = Dict({"name": "test"})
+    for npm_id in status_codes:
+        assert not yaml_generation.probe_package(project, "npm", npm_id, probe_cache)
+    assert probe_cache.get("probe-miss:npm:@scope/missing", float("inf"))
+    # A failed request is not cached as a miss
+    assert not probe_cache.get("probe-miss:npm:@scope/unavailable", float("inf"))
+    assert sorted(requested_packages) == [
+        "@scope/missing",
+        "@scope/unavailable",
+        "@scope/unavailable",
+    ]